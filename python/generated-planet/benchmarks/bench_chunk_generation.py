@@ -0,0 +1,69 @@
+"""
+Chunk generation benchmark - reference per-block path vs NumPy path
+Run from the project root: python benchmarks/bench_chunk_generation.py
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.planet import Planet
+from src.utils.constants import CHUNK_SIZE
+
+def chunk_origins(count: int, offset: int = 1000):
+    """Chunk origins well away from the initial terrain"""
+    side = int(count ** 0.5) + 1
+    origins = []
+    for i in range(count):
+        origins.append((offset + (i // side) * CHUNK_SIZE, offset + (i % side) * CHUNK_SIZE))
+    return origins
+
+def generate(vectorized: bool, origins, seed: int) -> Planet:
+    """Generate all origins on a fresh planet"""
+    planet = Planet(seed=seed, vectorized=vectorized)
+    for chunk_x, chunk_z in origins:
+        planet.generate_chunk(chunk_x, chunk_z)
+    return planet
+
+def time_generation(vectorized: bool, origins, seed: int) -> float:
+    """Chunks per second for one pass over origins"""
+    planet = Planet(seed=seed, vectorized=vectorized)
+    start = time.perf_counter()
+    for chunk_x, chunk_z in origins:
+        planet.generate_chunk(chunk_x, chunk_z)
+    return len(origins) / (time.perf_counter() - start)
+
+def check_identical(origins, seed: int) -> bool:
+    """Both paths must produce the same blocks and surface"""
+    scalar = generate(False, origins, seed)
+    fast = generate(True, origins, seed)
+
+    for chunk in scalar.chunks:
+        other = fast.chunks.get(*chunk.key)
+        if other is None or (chunk.blocks != other.blocks).any():
+            return False
+        if chunk.surface != other.surface:
+            return False
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=100, help="chunks generated per run")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    origins = chunk_origins(args.chunks)
+    before = time_generation(False, origins, args.seed)
+    after = time_generation(True, origins, args.seed)
+
+    print(f"chunks:      {args.chunks}")
+    print(f"before:      {before:8.1f} chunks/s (per-block)")
+    print(f"after:       {after:8.1f} chunks/s (NumPy)")
+    print(f"speedup:     {after / before:8.2f}x")
+    print(f"identical:   {check_identical(origins, args.seed)}")
+
+if __name__ == "__main__":
+    main()
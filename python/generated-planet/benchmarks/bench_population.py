@@ -0,0 +1,67 @@
+"""
+Population bookkeeping benchmark - per-object updates vs PopulationStore columns
+Run from the project root: python benchmarks/bench_population.py
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.animal import Animal
+from src.core.population import PopulationStore
+from src.engine.behaviors import ReproductionEngine
+from src.utils.vectors import Vector3
+from src.utils.constants import (
+    ANIMAL_CONFIGS, ANIMAL_ENERGY_DRAIN, BREEDING_ENERGY_THRESHOLD, BREEDING_AGE_MIN, BREEDING_COOLDOWN
+)
+
+def make_animals(count: int, seed: int):
+    rng = random.Random(seed)
+    types = list(ANIMAL_CONFIGS)
+    return [Animal(rng.choice(types), Vector3(rng.uniform(-50, 50), 5, rng.uniform(-50, 50)))
+            for _ in range(count)]
+
+def time_objects(animals, ticks: int) -> float:
+    """Milliseconds per tick updating each Animal in turn"""
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for animal in animals:
+            animal.age += 1
+            animal.energy -= animal.speed * ANIMAL_ENERGY_DRAIN
+            animal.breeding_cooldown = max(0, animal.breeding_cooldown - 1)
+        [ReproductionEngine.can_breed(a, BREEDING_ENERGY_THRESHOLD, BREEDING_AGE_MIN, BREEDING_COOLDOWN)
+         for a in animals]
+        [a for a in animals if a.is_alive()]
+    return (time.perf_counter() - start) * 1000 / ticks
+
+def time_store(store: PopulationStore, ticks: int) -> float:
+    """Milliseconds per tick updating every row at once"""
+    start = time.perf_counter()
+    for _ in range(ticks):
+        store.tick(ANIMAL_ENERGY_DRAIN)
+        ReproductionEngine.can_breed_many(store, BREEDING_ENERGY_THRESHOLD, BREEDING_AGE_MIN, BREEDING_COOLDOWN)
+        store.alive_mask()
+    return (time.perf_counter() - start) * 1000 / ticks
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--animals", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    for count in args.animals:
+        before = time_objects(make_animals(count, args.seed), args.ticks)
+        store = PopulationStore()
+        for animal in make_animals(count, args.seed):
+            store.add(animal)
+        after = time_store(store, args.ticks)
+        print(f"animals {count:6d}:  objects {before:8.3f} ms/tick   store {after:8.3f} ms/tick   "
+              f"speedup {before / after:7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Benchmark suite - hot paths at several population and world sizes, with baseline comparison
+Run from the project root: python benchmarks/bench_suite.py --save results.json
+Compare a change against it: python benchmarks/bench_suite.py --baseline results.json
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.animal import Animal
+from src.core.ecosystem import Ecosystem
+from src.core.health import Disease, HealthSystem
+from src.core.navigation import FOOD
+from src.core.planet import Planet
+from src.core.pool import AnimalPool
+from src.core.population import PopulationStore
+from src.engine.behaviors import BehaviorEngine, ReproductionEngine
+from src.engine.flocking import steer
+from src.engine.fixed_step import WorldSnapshot
+from src.rendering.camera import Camera
+from src.utils.vectors import Vector3
+from src.utils.constants import ANIMAL_CONFIGS, CHUNK_SIZE
+
+RESULTS_VERSION = 1
+
+def measure(run: Callable[[], None], repeat: int, setup: Optional[Callable[[], None]] = None) -> List[float]:
+    """Milliseconds of each of repeat calls to run, setup excluded"""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+def scatter_animals(count: int, rng: random.Random, density: float = 0.01) -> List[Animal]:
+    """count animals of every type at a fixed density (animals per square block) around the origin"""
+    half = max(25.0, math.sqrt(count / density) / 2)
+    types = list(ANIMAL_CONFIGS)
+    return [Animal(rng.choice(types), Vector3(rng.uniform(-half, half), 10, rng.uniform(-half, half)))
+            for _ in range(count)]
+
+def bench_ecosystem_update(count: int, seed: int, focus: Optional[Vector3] = None):
+    random.seed(seed)
+    ecosystem = Ecosystem(seed=seed, chunk_workers=0, region_dir=None, populate=False)
+    if focus is not None:
+        ecosystem.set_focus(focus)
+    for animal in scatter_animals(count, random.Random(seed)):
+        ecosystem.add_animal(animal)
+    behavior_engine = BehaviorEngine()
+    reproduction_engine = ReproductionEngine()
+    step = lambda: ecosystem.update(behavior_engine, reproduction_engine)
+    for _ in range(2):  # generate the terrain under the animals outside the timing
+        step()
+    repeat = max(3, min(30, 3000 // count))
+    return measure(step, repeat)
+
+def bench_generate_chunk(seed: int):
+    planet = Planet(seed=seed)
+    origins = iter([(5000 + i * CHUNK_SIZE, 5000) for i in range(10000)])
+    return measure(lambda: planet.generate_chunk(*next(origins)), 50)
+
+def loaded_planet(chunks: int, seed: int) -> Planet:
+    """Planet with about chunks generated chunks in a square around the origin"""
+    planet = Planet(seed=seed)
+    side = math.ceil(math.sqrt(chunks))
+    for i in range(side):
+        for j in range(side):
+            planet.generate_chunk((i - side // 2) * CHUNK_SIZE, (j - side // 2) * CHUNK_SIZE)
+    return planet
+
+def bench_visible_blocks(chunks: int, seed: int):
+    planet = loaded_planet(chunks, seed)
+    camera = Camera()
+    return measure(lambda: planet.get_visible_blocks(camera.position), 20)
+
+def bench_flow_field(seed: int):
+    """Building one chunk's food field from scratch"""
+    fields = loaded_planet(25, seed).flow_fields
+    return measure(lambda: fields.field((0, 0), FOOD), 20, fields.cache.clear)
+
+def bench_projection(points: int, seed: int):
+    rng = random.Random(seed)
+    camera = Camera()
+    positions = [Vector3(rng.uniform(-80, 80), rng.uniform(0, 16), rng.uniform(-80, 80)) for _ in range(points)]
+    project = camera.project_3d_to_2d
+    return measure(lambda: [project(p) for p in positions], 10)
+
+def bench_render_scene(chunks: int, animals: int, seed: int):
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    import pygame
+    from src.rendering.renderer import Renderer
+    from src.utils.constants import WINDOW_WIDTH, WINDOW_HEIGHT
+
+    random.seed(seed)
+    ecosystem = Ecosystem(seed=seed, chunk_workers=0, region_dir=None, populate=False)
+    ecosystem.planet = loaded_planet(chunks, seed)
+    for animal in scatter_animals(animals, random.Random(seed)):
+        ecosystem.add_animal(animal)
+    renderer = Renderer(pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)), Camera())
+    frames = WorldSnapshot.capture(ecosystem).animals
+    blocks = ecosystem.planet.get_visible_blocks(renderer.camera.position)
+    return measure(lambda: renderer.render_scene(blocks, frames), 5)
+
+def bench_disease_spread(count: int, seed: int):
+    """One spread pass with a tenth of a dense population infected, same start every run"""
+    rng = random.Random(seed)
+    animals = scatter_animals(count, rng, density=0.5)
+    random.seed(seed)
+    disease = Disease("benchmark")
+
+    def reset():
+        for animal in animals:
+            animal.disease = None
+        for animal in animals[::10]:
+            disease.infect(animal)
+        random.seed(seed)
+
+    return measure(lambda: disease.spread(animals), 10, reset)
+
+def bench_health_update(count: int, seed: int):
+    """One HealthSystem.update in the middle of an outbreak that has reached half of a dense population"""
+    animals = scatter_animals(count, random.Random(seed), density=0.5)
+    health = HealthSystem()
+
+    def reset():
+        random.seed(seed)
+        for animal in animals:
+            animal.disease = None
+            animal.energy = animal.max_energy
+        health.active_diseases = []
+        health.create_outbreak(animals, animals[0])
+        for animal in animals[1::2]:
+            health.active_diseases[0].infect(animal)
+
+    return measure(lambda: health.update(animals), 10, reset)
+
+def bench_breed_many(count: int, seed: int, pooled: bool = False):
+    """A boom tick - every animal of a population store breeds at once, offspring built but not added
+
+    pooled refills an AnimalPool with count dead animals before each run, as after a crash.
+    """
+    store = PopulationStore()
+    for animal in scatter_animals(count, random.Random(seed)):
+        store.add(animal)
+    mask = np.ones(count, dtype=bool)
+    dead = scatter_animals(count, random.Random(seed + 1))
+    pool = AnimalPool(limit=count if pooled else 0)
+    random.seed(seed)
+    return measure(lambda: ReproductionEngine.breed_many(store, mask, 0.0, 0, pool), 10,
+                   lambda: pool.release(dead))
+
+def bench_steer(count: int, seed: int):
+    """Flocking headings for count birds a few blocks apart, as in a large flock"""
+    rng = np.random.default_rng(seed)
+    half = math.sqrt(count) * 2.5
+    points = np.zeros((count, 3))
+    points[:, 0] = rng.uniform(-half, half, count)
+    points[:, 2] = rng.uniform(-half, half, count)
+    headings = rng.standard_normal((count, 2))
+    groups = np.zeros(count, dtype=np.int16)
+    return measure(lambda: steer(points, headings, groups, rng), 20)
+
+def cases(quick: bool) -> Dict[str, Callable[[int], List[float]]]:
+    """Benchmark name -> function of the seed"""
+    populations = [10, 100, 1000] if quick else [10, 100, 1000, 10000]
+    worlds = [25, 100] if quick else [25, 100, 400]
+    suite = {}
+    for count in populations:
+        suite[f"ecosystem.update[{count} animals]"] = lambda seed, n=count: bench_ecosystem_update(n, seed)
+    suite[f"ecosystem.update[{populations[-1]} animals, lod]"] = \
+        lambda seed: bench_ecosystem_update(populations[-1], seed, focus=Vector3(0, 0, 0))
+    suite["planet.generate_chunk"] = bench_generate_chunk
+    for chunks in worlds:
+        suite[f"planet.get_visible_blocks[{chunks} chunks]"] = lambda seed, n=chunks: bench_visible_blocks(n, seed)
+    suite["flow_fields.field[food, new]"] = bench_flow_field
+    suite["camera.project_3d_to_2d[10000 points]"] = lambda seed: bench_projection(10000, seed)
+    suite["renderer.render_scene[100 chunks, 200 animals]"] = lambda seed: bench_render_scene(100, 200, seed)
+    suite["disease.spread[1000 animals]"] = lambda seed: bench_disease_spread(1000, seed)
+    suite["health.update[5000 animals, outbreak]"] = lambda seed: bench_health_update(5000, seed)
+    suite["reproduction.breed_many[5000 births]"] = lambda seed: bench_breed_many(5000, seed)
+    suite["flocking.steer[2000 birds]"] = lambda seed: bench_steer(2000, seed)
+    suite["reproduction.breed_many[5000 births, pooled]"] = lambda seed: bench_breed_many(5000, seed, pooled=True)
+    return suite
+
+def summarize(times: List[float]) -> Dict[str, float]:
+    return {"median_ms": statistics.median(times), "min_ms": min(times), "runs": len(times)}
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float,
+            metric: str = "median_ms") -> List[str]:
+    """Print each benchmark against the baseline, returns the names slower by more than threshold"""
+    regressions = []
+    print(f"\n{'benchmark':<50} {'baseline':>10} {'now':>10} {'change':>8}")
+    for name, stats in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<50} {'-':>10} {stats[metric]:10.3f}      new")
+            continue
+        change = stats[metric] / before[metric] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{name:<50} {before[metric]:10.3f} {stats[metric]:10.3f} {change:+8.1%}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", metavar="TEXT", help="run benchmarks whose name contains TEXT, e.g. 'planet.'")
+    parser.add_argument("--quick", action="store_true", help="skip the largest sizes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save", metavar="PATH", help="write results as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against results saved earlier")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="slowdown that counts as a regression (default 0.10 = 10%%)")
+    parser.add_argument("--metric", choices=["median", "min"], default="median",
+                        help="statistic compared against the baseline; min is steadier on a busy machine")
+    args = parser.parse_args()
+
+    results = {}
+    for name, run in cases(args.quick).items():
+        if args.only and args.only not in name:
+            continue
+        stats = summarize(run(args.seed))
+        results[name] = stats
+        print(f"{name:<50} {stats['median_ms']:10.3f} ms  (min {stats['min_ms']:.3f}, {stats['runs']} runs)",
+              flush=True)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "version": RESULTS_VERSION,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "machine": platform.platform(),
+                "seed": args.seed,
+                "results": results,
+            }, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("version") != RESULTS_VERSION:
+            parser.error(f"{args.baseline} was written by a different version of this suite")
+        regressions = compare(results, baseline["results"], args.threshold, f"{args.metric}_ms")
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
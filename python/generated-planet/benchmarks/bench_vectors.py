@@ -0,0 +1,84 @@
+"""
+Vector kernel benchmark - allocating operator form vs in-place / squared-distance API
+Run from the project root: python benchmarks/bench_vectors.py
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.vectors import Vector3
+
+def make_points(count: int, seed: int):
+    rng = random.Random(seed)
+    return [Vector3(rng.uniform(-50, 50), rng.uniform(0, 20), rng.uniform(-50, 50)) for _ in range(count)]
+
+def distance_allocating(points, origin, radius):
+    return sum(1 for p in points if (origin - p).length() < radius)
+
+def distance_sq(points, origin, radius):
+    radius_sq = radius * radius
+    return sum(1 for p in points if origin.distance_sq_to(p) < radius_sq)
+
+def movement_allocating(points, target, step):
+    for i, p in enumerate(points):
+        points[i] = p + (target - p).normalize() * step
+
+def movement_in_place(points, target, step):
+    for p in points:
+        p.step_towards(target, step)
+
+def count_allocations(kernel, points, arg, scalar) -> int:
+    """Vector3 instances created by one pass, counted by wrapping __init__"""
+    original = Vector3.__init__
+    created = [0]
+
+    def counting_init(self, *a, **kw):
+        created[0] += 1
+        original(self, *a, **kw)
+
+    Vector3.__init__ = counting_init
+    try:
+        kernel(points, arg, scalar)
+    finally:
+        Vector3.__init__ = original
+    return created[0]
+
+def measure(kernel, points, arg, scalar, repeats: int):
+    """(milliseconds per pass, gen-0 collections per pass, Vector3 allocations per pass)"""
+    allocations = count_allocations(kernel, list(points), arg, scalar)
+    gc.collect()
+    collections = gc.get_stats()[0]["collections"]
+    start = time.perf_counter()
+    for _ in range(repeats):
+        kernel(points, arg, scalar)
+    elapsed = (time.perf_counter() - start) * 1000 / repeats
+    return elapsed, (gc.get_stats()[0]["collections"] - collections) / repeats, allocations
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    target = Vector3(0, 10, 0)
+    rows = [
+        ("distance", distance_allocating, distance_sq, 30.0),
+        ("movement", movement_allocating, movement_in_place, 0.5),
+    ]
+    print(f"points: {args.points}, repeats: {args.repeats}")
+    for name, before_kernel, after_kernel, scalar in rows:
+        before = measure(before_kernel, make_points(args.points, args.seed), target, scalar, args.repeats)
+        after = measure(after_kernel, make_points(args.points, args.seed), target, scalar, args.repeats)
+        print(f"{name:9s} allocating {before[0]:7.2f} ms, {before[2]:6d} vectors, {before[1]:5.2f} gen0 GCs   "
+              f"in-place {after[0]:7.2f} ms, {after[2]:6d} vectors, {after[1]:5.2f} gen0 GCs   "
+              f"speedup {before[0] / after[0]:5.2f}x")
+
+if __name__ == "__main__":
+    main()
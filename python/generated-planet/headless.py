@@ -0,0 +1,9 @@
+"""
+3D Planet Simulation - headless entry point
+Runs the ecosystem without a window: python headless.py --ticks 5000
+"""
+
+from src.runner import main
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,12 @@
 Main package initialization
 """
 
-from .simulation import PlanetSimulation
-
 __all__ = ['PlanetSimulation']
 __version__ = '1.0.0'
+
+def __getattr__(name):
+    # Imported on first use so headless code (src.runner, src.core) never loads pygame
+    if name == 'PlanetSimulation':
+        from .simulation import PlanetSimulation
+        return PlanetSimulation
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,19 +7,81 @@ from ..utils.constants import (
     AnimalTypes, ANIMAL_CONFIGS, BlockType, 
     BREEDING_ENERGY_THRESHOLD, BREEDING_ENERGY_COST, BREEDING_AGE_MIN, BREEDING_COOLDOWN,
     STARVATION_DAMAGE, CRITICAL_HUNGER_THRESHOLD, CRITICAL_HUNGER_THRESHOLD,
-    NEST_CONSTRUCTION_FRAMES, NEST_RETURN_DISTANCE, MIGRATION_DISTANCE
+    NEST_CONSTRUCTION_FRAMES, NEST_RETURN_DISTANCE, MIGRATION_DISTANCE,
+    ANIMAL_MAX_AGE, ANIMAL_ENERGY_DRAIN, TARGET_REPLAN_INTERVAL, EAT_REACH, WATER_ANIMALS
 )
 from .genetics import Genetics
+from .population import StoreColumn, PopulationStore, COLUMNS
 
 if TYPE_CHECKING:
     from .planet import Planet
+    from .spatial_hash import SpatialHash
+    from .registry import EntityRegistry
+    from .pool import AnimalPool
+
+# Slots that only mean something inside the simulation the animal lives in
+_UNPICKLED = ("entity_id", "pack", "disease", "planned", "target_id", "target_pos")
+
+_PROFILES = {}
+
+def _species_profile(animal_type: str) -> tuple:
+    """(is_herbivore, is_carnivore, is_bird, is_water, prey_types), shared by every animal of a species"""
+    profile = _PROFILES.get(animal_type)
+    if profile is None:
+        is_herbivore = animal_type in [AnimalTypes.RABBIT, AnimalTypes.DEER, AnimalTypes.MOUSE, AnimalTypes.DUCK, AnimalTypes.TURTLE]
+        is_carnivore = animal_type in [AnimalTypes.WOLF, AnimalTypes.FOX, AnimalTypes.EAGLE]
+        is_bird = animal_type in [AnimalTypes.BIRD, AnimalTypes.EAGLE, AnimalTypes.DUCK]
+        is_water = animal_type in WATER_ANIMALS
+        if is_carnivore:
+            prey_types = (AnimalTypes.RABBIT, AnimalTypes.MOUSE, AnimalTypes.DUCK)
+            if animal_type == AnimalTypes.EAGLE:
+                prey_types += (AnimalTypes.BIRD,)
+        elif is_water and not is_herbivore:
+            prey_types = (AnimalTypes.FISH, AnimalTypes.DUCK)
+        else:
+            prey_types = ()
+        profile = _PROFILES[animal_type] = (is_herbivore, is_carnivore, is_bird, is_water, prey_types)
+    return profile
 
 class Animal:
     """Base animal class with advanced features"""
     
-    def __init__(self, animal_type: str, position: Vector3, parent=None):
-        self.animal_type = animal_type
+    __slots__ = (
+        "animal_type", "position", "genetics", "color", "vision_range",
+        "is_herbivore", "is_carnivore", "is_bird", "is_water",
+        "pack", "disease", "disease_timer", "disease_severity", "health",
+        "nest_position", "nest_construction", "home_range", "aggression", "hunger_level",
+        "prey_types", "entity_id", "_store", "_row",
+        "replan_interval", "planned", "target_id", "target_pos",
+        # Backing slots for the StoreColumn attributes below
+        "_energy", "_max_energy", "_age", "_speed", "_breeding_cooldown", "_is_breeding",
+        "_heading_x", "_heading_z",
+    )
+    
+    is_ghost = False  # see domains.GhostAnimal
+    
+    # Per-tick state lives in a PopulationStore row while the animal belongs to one
+    energy = StoreColumn("energy")
+    max_energy = StoreColumn("max_energy")
+    age = StoreColumn("age")
+    speed = StoreColumn("speed")
+    breeding_cooldown = StoreColumn("breeding_cooldown")
+    is_breeding = StoreColumn("is_breeding")
+    heading_x = StoreColumn("heading_x")
+    heading_z = StoreColumn("heading_z")
+    
+    def __init__(self, animal_type: str, position: Vector3, parent=None,
+                 genetics: Optional[Genetics] = None):
+        self._store: Optional[PopulationStore] = None
+        self._row = -1
         self.position = position
+        self.home_range = position.copy() if hasattr(position, 'copy') else position
+        self.reset(animal_type, parent, genetics)
+    
+    def reset(self, animal_type: str, parent=None, genetics: Optional[Genetics] = None):
+        """Initialise everything but position and home_range, also used to reuse a dead animal (AnimalPool)"""
+        self.entity_id = -1  # assigned by EntityRegistry.add
+        self.animal_type = animal_type
         self.age = 0
         self.breeding_cooldown = 0
         self.is_breeding = False
@@ -30,9 +92,11 @@ class Animal:
         base_vision = config.get("vision", 30)
         self.max_energy = config.get("energy", 100)
         
-        # Genetics system
-        self.genetics = Genetics(base_speed, base_color, base_vision, 
-                                 parent.genetics if parent else None)
+        # Genetics system, drawn here unless already drawn for a whole brood (GenePool.offspring)
+        if genetics is None:
+            genetics = Genetics(base_speed, base_color, base_vision,
+                                parent.genetics if parent else None)
+        self.genetics = genetics
         self.speed = self.genetics.speed
         self.color = self.genetics.color
         self.vision_range = self.genetics.vision
@@ -43,24 +107,32 @@ class Animal:
         else:
             self.energy = self.max_energy
         
-        # Type classification
-        self.is_herbivore = animal_type in [AnimalTypes.RABBIT, AnimalTypes.DEER, AnimalTypes.MOUSE, AnimalTypes.DUCK, AnimalTypes.TURTLE]
-        self.is_carnivore = animal_type in [AnimalTypes.WOLF, AnimalTypes.FOX, AnimalTypes.EAGLE]
-        self.is_bird = animal_type in [AnimalTypes.BIRD, AnimalTypes.EAGLE, AnimalTypes.DUCK]
-        self.is_water = animal_type in [AnimalTypes.FISH, AnimalTypes.TURTLE, AnimalTypes.DUCK]
+        # Type classification, and what this animal hunts - never includes itself, see eat()
+        (self.is_herbivore, self.is_carnivore, self.is_bird, self.is_water,
+         self.prey_types) = _species_profile(animal_type)
+        
+        # Cached target, see BehaviorEngine.current_target
+        self.replan_interval = config.get("replan", TARGET_REPLAN_INTERVAL)
+        self.planned = False
+        self.target_id = -1  # entity id of the prey being chased
+        self.target_pos: Optional[Vector3] = None  # food block being walked to
+        self.heading_x = 0.0  # flocking direction, zero without flockmates
+        self.heading_z = 0.0
         
         # New systems
         self.pack = None
         self.disease = None
         self.disease_timer = 0
         self.disease_severity = 0
+        if hasattr(self, "health"):
+            del self.health  # unset until first infected, see Disease.infect
         self.nest_position = None
         self.nest_construction = 0
-        self.home_range = position.copy() if hasattr(position, 'copy') else position
         self.aggression = 0.2
         self.hunger_level = 0  # 0-1, 0 = full, 1 = starving
     
-    def update(self, planet: 'Planet', animals: List['Animal']) -> Optional['Animal']:
+    def update(self, planet: 'Planet', animals: List['Animal'], grid: Optional['SpatialHash'] = None,
+               registry: Optional['EntityRegistry'] = None) -> Optional['Animal']:
         """Update animal state"""
         self.age += 1
         
@@ -71,17 +143,17 @@ class Animal:
         if self.hunger_level > CRITICAL_HUNGER_THRESHOLD:
             self.energy -= STARVATION_DAMAGE * self.energy
         
-        self.energy -= self.speed * 0.2
+        self.energy -= self.speed * ANIMAL_ENERGY_DRAIN
         self.breeding_cooldown = max(0, self.breeding_cooldown - 1)
         
         # Keep animals on ground or in water
         self.constrain_position(planet)
         
-        target = self.find_target(planet, animals)
+        target = self.find_target(planet, animals, grid)
         
         if target:
             self.move_towards(target)
-            self.eat(planet, animals, target)
+            self.eat(planet, animals, target, grid, registry)
         else:
             self.random_walk()
         
@@ -99,80 +171,67 @@ class Animal:
         """Keep animals on ground or in water"""
         x, z = int(self.position.x), int(self.position.z)
         
-        if self.is_water:
+        if self.is_water or self.animal_type in WATER_ANIMALS:
             # Find water level
-            for y in range(15, -1, -1):
-                if planet.get_block_at(x, y, z) == BlockType.WATER:
-                    self.position.y = y + 1
-                    return
+            water_y = planet.get_water_level(x, z)
+            if water_y >= 0:
+                self.is_water = True  # back in the water if it was stranded
+                self.position.y = water_y + 1
+                return
             # If no water, fall to ground
             self.is_water = False
         
         # Find ground level
-        for y in range(15, -1, -1):
-            block = planet.get_block_at(x, y, z)
-            if block != BlockType.AIR and block != BlockType.WATER:
-                self.position.y = y + 1
-                return
-        
-        self.position.y = 1
+        ground_y = planet.get_surface_height(x, z)
+        self.position.y = ground_y + 1 if ground_y >= 0 else 1
     
-    def find_target(self, planet: 'Planet', animals: List['Animal']) -> Optional[Vector3]:
+    def find_target(self, planet: 'Planet', animals: List['Animal'],
+                    grid: Optional['SpatialHash'] = None) -> Optional[Vector3]:
         """Find food or prey"""
         best_target = None
-        best_distance = float('inf')
         
         if self.is_herbivore:
             # Look for grass/leaves nearby
-            nearby = planet.get_nearby_blocks(self.position, self.vision_range)
-            for (x, y, z), block_type in nearby:
-                if block_type in [BlockType.GRASS, BlockType.LEAVES]:
-                    target_pos = Vector3(x, y, z)
-                    distance = self.position.distance_to(target_pos)
-                    if distance < best_distance:
-                        best_distance = distance
-                        best_target = target_pos
-        
-        elif self.is_carnivore or self.is_water:
+            best_target = planet.find_nearest_edible(self.position, self.vision_range)
+        
+        elif self.prey_types:
             # Look for prey
-            prey_types = []
-            if self.is_carnivore:
-                prey_types = [AnimalTypes.RABBIT, AnimalTypes.MOUSE, AnimalTypes.DUCK]
-                if self.animal_type == AnimalTypes.EAGLE:
-                    prey_types += [AnimalTypes.BIRD]
-            else:  # Water animals
-                prey_types = [AnimalTypes.FISH, AnimalTypes.DUCK]
+            if grid is not None:
+                prey = grid.nearest(self.position, self.vision_range, self.prey_types, exclude=self)
+                return prey.position if prey else None
             
+            best_distance = self.vision_range * self.vision_range
             for animal in animals:
-                if animal.animal_type in prey_types:
-                    distance = self.position.distance_to(animal.position)
-                    if distance < self.vision_range and distance < best_distance:
-                        best_distance = distance
+                if animal is not self and animal.animal_type in self.prey_types:
+                    distance_sq = self.position.distance_sq_to(animal.position)
+                    if distance_sq < best_distance:
+                        best_distance = distance_sq
                         best_target = animal.position
         
         return best_target
     
     def move_towards(self, target: Vector3):
         """Move towards target"""
-        direction = (target - self.position).normalize()
-        self.position = self.position + direction * self.speed
+        self.position.step_towards(target, self.speed)
     
     def random_walk(self):
         """Move randomly"""
-        direction = Vector3(
-            random.uniform(-1, 1),
-            random.uniform(-0.3, 0.3) if not self.is_bird else random.uniform(-0.5, 0.5),
-            random.uniform(-1, 1)
-        ).normalize()
-        self.position = self.position + direction * self.speed
+        dx = random.uniform(-1, 1)
+        dy = random.uniform(-0.3, 0.3) if not self.is_bird else random.uniform(-0.5, 0.5)
+        dz = random.uniform(-1, 1)
+        length = math.sqrt(dx * dx + dy * dy + dz * dz)
+        pos = self.position
+        if length != 0:
+            pos.iadd_scaled(dx, dy, dz, self.speed / length)
         
         # Bound checking
-        self.position.x = max(-50, min(50, self.position.x))
-        self.position.y = max(0, min(20, self.position.y))
-        self.position.z = max(-50, min(50, self.position.z))
+        pos.x = max(-50, min(50, pos.x))
+        pos.y = max(0, min(20, pos.y))
+        pos.z = max(-50, min(50, pos.z))
     
-    def eat(self, planet: 'Planet', animals: List['Animal'], target: Vector3):
-        """Eat food or prey"""
+    def eat(self, planet: 'Planet', animals: List['Animal'], target: Vector3,
+            grid: Optional['SpatialHash'] = None, registry: Optional['EntityRegistry'] = None):
+        """Eat food or prey - with a registry the kill is only claimed, see resolve_kills"""
         if self.is_herbivore:
             x, y, z = int(target.x), int(target.y), int(target.z)
             block = planet.get_block_at(x, y, z)
@@ -180,25 +239,50 @@ class Animal:
                 planet.set_block_at(x, y, z, BlockType.DIRT if block == BlockType.GRASS else BlockType.AIR)
                 self.energy += 25
         else:
-            for animal in animals[:]:
-                if self.position.distance_to(animal.position) < 2:
+            candidates = grid.query_radius(self.position, EAT_REACH, self.prey_types) if grid is not None else animals
+            for animal in candidates:
+                if animal is self or animal.animal_type not in self.prey_types:
+                    continue
+                if self.position.distance_sq_to(animal.position) < EAT_REACH * EAT_REACH:
+                    if registry is not None:
+                        if registry.claim_kill(self, animal):
+                            break
+                        continue
                     self.energy += animal.max_energy
                     animals.remove(animal)
+                    if grid is not None:
+                        grid.remove(animal)
                     break
     
-    def reproduce(self) -> 'Animal':
-        """Create offspring"""
-        offset = Vector3(
-            random.uniform(-5, 5),
-            0,
-            random.uniform(-5, 5)
-        )
-        offspring = Animal(self.animal_type, self.position + offset, parent=self)
-        # Inherit some traits from parent
-        offspring.genetics = Genetics(self.genetics.speed, self.genetics.color, 
-                                     self.genetics.vision, self.genetics)
-        return offspring
+    def reproduce(self, pool: Optional['AnimalPool'] = None) -> 'Animal':
+        """Create offspring, reusing a dead animal from pool when there is one"""
+        pos = self.position
+        x = pos.x + random.uniform(-5, 5)
+        z = pos.z + random.uniform(-5, 5)
+        if pool is not None:
+            return pool.acquire(self.animal_type, x, pos.y, z, parent=self)
+        return Animal(self.animal_type, Vector3(x, pos.y, z), parent=self)
     
     def is_alive(self) -> bool:
         """Check if still alive"""
-        return self.energy > 0 and self.age < 3000
+        return self.energy > 0 and self.age < ANIMAL_MAX_AGE
+    
+    def __getstate__(self) -> dict:
+        """Attribute values for pickling, without store, registry, pack, disease or target links"""
+        state = {name: getattr(self, name) for name in COLUMNS}
+        for name in self.__slots__:
+            if not name.startswith("_") and name not in _UNPICKLED and hasattr(self, name):
+                state[name] = getattr(self, name)
+        return state
+    
+    def __setstate__(self, state: dict):
+        self._store = None
+        self._row = -1
+        self.entity_id = -1
+        self.pack = None
+        self.disease = None
+        self.planned = False
+        self.target_id = -1
+        self.target_pos = None
+        for name, value in state.items():
+            setattr(self, name, value)
@@ -0,0 +1,337 @@
+"""Checkpoints - the whole ecosystem in one versioned binary stream
+
+A checkpoint is a header followed by tagged sections, each (tag, length,
+payload), so it can be written and read sequentially and readers skip tags
+they do not know. Chunks and animals are NumPy record arrays; the rest of the
+state is a small JSON section.
+"""
+
+import json
+import math
+import os
+import random
+import struct
+import threading
+import zlib
+from operator import attrgetter
+from typing import BinaryIO, Dict, List, Optional, TYPE_CHECKING
+import numpy as np
+from ..utils.vectors import Vector3
+from ..utils.constants import CHUNK_SIZE, WORLD_HEIGHT
+from .animal import Animal
+from .chunks import Chunk
+from .genetics import Genetics, TRAIT_BOUNDS
+from .health import Disease
+from .population import SPECIES, SPECIES_IDS
+from .region import SLOT_GENERATED, pack_blocks, unpack_blocks
+
+if TYPE_CHECKING:
+    from .ecosystem import Ecosystem
+
+CHECKPOINT_MAGIC = b"PCKP"
+CHECKPOINT_FORMAT_VERSION = 4
+FLAG_COMPRESSED = 1  # every section payload is zlib compressed
+
+_HEADER = struct.Struct("<4sHH")  # magic, format version, flags
+_SECTION = struct.Struct("<4sQ")  # tag, payload bytes
+_PACKED_BYTES = CHUNK_SIZE * WORLD_HEIGHT * CHUNK_SIZE // 2
+
+CHUNK_RECORD = np.dtype([
+    ("chunk_x", "<i4"), ("chunk_z", "<i4"), ("generated", "u1"), ("blocks", "u1", (_PACKED_BYTES,)),
+])
+
+ANIMAL_RECORD = np.dtype([
+    ("species", "u1"), ("entity_id", "<i8"), ("row", "<i4"),
+    ("is_water", "u1"),  # cleared while a water animal is stranded on land
+    ("position", "<f8", (3,)), ("home_range", "<f8", (3,)),
+    ("has_nest", "u1"), ("nest_position", "<f8", (3,)), ("nest_construction", "<i4"),
+    ("energy", "<f8"), ("max_energy", "<f8"), ("age", "<i8"), ("speed", "<f8"),
+    ("breeding_cooldown", "<i8"), ("is_breeding", "u1"),
+    ("color", "u1", (3,)), ("vision_range", "<f8"), ("aggression", "<f8"), ("hunger_level", "<f8"),
+    ("health", "<f8"),  # NaN until the animal was first infected
+    ("disease", "<i2"), ("disease_timer", "<i4"), ("disease_severity", "<f8"),
+    ("gene_speed", "<f8"), ("gene_color", "u1", (3,)), ("gene_vision", "<f8"),
+    ("gene_stamina", "<f8"), ("gene_intelligence", "<f8"),
+    ("planned", "u1"), ("target_id", "<i8"),  # cached target, see BehaviorEngine.current_target
+    ("has_target_pos", "u1"), ("target_pos", "<f8", (3,)),
+    ("heading", "<f8", (2,)),  # flocking direction
+])
+
+class CheckpointState:
+    """Copy of everything a checkpoint holds, taken between ticks and safe to serialize on another thread"""
+
+    def __init__(self, meta: Dict, rng: np.ndarray, chunks: List[Chunk], chunk_blocks: np.ndarray,
+                 paged_chunks: np.ndarray, animals: np.ndarray):
+        self.meta = meta
+        self.rng = rng
+        self.chunk_keys = [(chunk.chunk_x, chunk.chunk_z, chunk.generated) for chunk in chunks]
+        self.chunk_blocks = chunk_blocks  # (n, CHUNK_SIZE, WORLD_HEIGHT, CHUNK_SIZE), unpacked copies
+        self.paged_chunks = paged_chunks  # CHUNK_RECORDs already packed by the region files
+        self.animals = animals
+
+    def chunk_records(self) -> np.ndarray:
+        records = np.empty(len(self.chunk_keys), dtype=CHUNK_RECORD)
+        if len(records):
+            records["chunk_x"], records["chunk_z"], records["generated"] = zip(*self.chunk_keys)
+            records["blocks"] = pack_blocks(self.chunk_blocks).reshape(len(records), _PACKED_BYTES)
+        return np.concatenate([records, self.paged_chunks])
+
+# Per-animal state also kept in PopulationStore columns, copied from there when every animal has a row
+_STORE_FIELDS = ("energy", "max_energy", "age", "speed", "breeding_cooldown", "is_breeding")
+
+def _values(animals: List[Animal], name: str) -> list:
+    return list(map(attrgetter(name), animals))
+
+def _vectors(vectors) -> list:
+    return [(v.x, v.y, v.z) for v in vectors]
+
+def _animal_records(ecosystem: 'Ecosystem') -> np.ndarray:
+    """One ANIMAL_RECORD per live animal in registry order, filled a field at a time"""
+    animals = ecosystem.registry.live()
+    records = np.zeros(len(animals), dtype=ANIMAL_RECORD)
+    if not animals:
+        return records
+
+    population = ecosystem.population
+    if population is not None and all(a._store is population for a in animals):
+        rows = np.fromiter(map(attrgetter("_row"), animals), dtype=np.int64, count=len(animals))
+        columns = population.columns
+        genes = population.genes
+        records["row"] = rows
+        records["species"] = population.species[rows]
+        records["position"] = population.positions[rows]
+        for name in _STORE_FIELDS:
+            records[name] = columns[name][rows]
+        records["heading"] = np.stack((columns["heading_x"][rows], columns["heading_z"][rows]), axis=1)
+        for trait in TRAIT_BOUNDS:
+            records["gene_" + trait] = genes.traits[trait][rows]
+        records["gene_color"] = genes.color[rows]
+    else:
+        records["row"] = [a._row if a._store is not None else -1 for a in animals]
+        records["species"] = [SPECIES_IDS[a.animal_type] for a in animals]
+        records["position"] = _vectors(map(attrgetter("position"), animals))
+        for name in _STORE_FIELDS:
+            records[name] = _values(animals, name)
+        records["heading"] = [(a.heading_x, a.heading_z) for a in animals]
+        genetics = _values(animals, "genetics")
+        for trait in TRAIT_BOUNDS:
+            records["gene_" + trait] = _values(genetics, trait)
+        records["gene_color"] = _values(genetics, "color")
+
+    # The rest only lives on the animals
+    for name in ("entity_id", "is_water", "nest_construction", "color", "vision_range", "aggression",
+                 "hunger_level", "disease_timer", "disease_severity", "planned", "target_id"):
+        records[name] = _values(animals, name)
+    records["home_range"] = _vectors(map(attrgetter("home_range"), animals))
+    records["health"] = [getattr(a, "health", math.nan) for a in animals]
+    diseases = {id(disease): i for i, disease in enumerate(ecosystem.health_system.active_diseases)}
+    records["disease"] = [diseases.get(id(a.disease), -1) if a.disease is not None else -1 for a in animals]
+    for flag, field, name in (("has_nest", "nest_position", "nest_position"),
+                              ("has_target_pos", "target_pos", "target_pos")):
+        vectors = _values(animals, name)
+        present = np.array([v is not None for v in vectors])
+        if present.any():
+            records[flag] = present
+            records[field][present] = _vectors(v for v in vectors if v is not None)
+    return records
+
+def capture(ecosystem: 'Ecosystem') -> CheckpointState:
+    """Snapshot the ecosystem; call between ticks, on the thread that runs them"""
+    planet = ecosystem.planet
+    version, internal, gauss_next = random.getstate()
+    weather = ecosystem.weather
+    meta = {
+        "seed": ecosystem.seed,
+        "frame_count": ecosystem.frame_count,
+        "planet_clock": planet.clock,
+        "pending_chunks": [[chunk_x, chunk_z, due] for (chunk_x, chunk_z), due in planet.pending.items()],
+        "next_id": ecosystem.registry.next_id,
+        "rng_version": version,
+        "rng_gauss_next": gauss_next,
+        "weather": {name: value for name, value in vars(weather).items()},
+        "diseases": [{"name": d.name, "severity": d.severity}
+                     for d in ecosystem.health_system.active_diseases],
+        "species": SPECIES,
+    }
+
+    chunks = list(planet.chunks)
+    if chunks:
+        chunk_blocks = np.stack([chunk.blocks for chunk in chunks])
+    else:
+        chunk_blocks = np.zeros((0, CHUNK_SIZE, WORLD_HEIGHT, CHUNK_SIZE), dtype=np.uint8)
+
+    # Chunks paged out to region files are copied packed, as they are on disk
+    paged = []
+    if planet.chunks.pager is not None:
+        loaded = {chunk.key for chunk in chunks}
+        for chunk_x, chunk_z, state, packed in planet.chunks.pager.saved_chunks():
+            if (chunk_x, chunk_z) not in loaded:
+                paged.append((chunk_x, chunk_z, state == SLOT_GENERATED, packed))
+    paged_chunks = np.array(paged, dtype=CHUNK_RECORD)
+
+    return CheckpointState(meta, np.array(internal, dtype=np.uint32), chunks, chunk_blocks,
+                           paged_chunks, _animal_records(ecosystem))
+
+def write_state(state: CheckpointState, stream: BinaryIO, compress: bool = True):
+    """Serialize a captured state as header and sections"""
+    stream.write(_HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_FORMAT_VERSION,
+                              FLAG_COMPRESSED if compress else 0))
+
+    def section(tag: bytes, payload: bytes):
+        if compress:
+            payload = zlib.compress(payload, 1)
+        stream.write(_SECTION.pack(tag, len(payload)))
+        stream.write(payload)
+
+    section(b"META", json.dumps(state.meta).encode("utf-8"))
+    section(b"RAND", state.rng.tobytes())
+    section(b"CHNK", state.chunk_records().tobytes())
+    section(b"ANML", state.animals.tobytes())
+    stream.write(_SECTION.pack(b"END ", 0))
+
+def read_sections(stream: BinaryIO) -> Dict[str, bytes]:
+    """Section payloads by tag, decompressed; raises ValueError for other formats or versions"""
+    header = stream.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError("Truncated checkpoint")
+    magic, version, flags = _HEADER.unpack(header)
+    if magic != CHECKPOINT_MAGIC or version != CHECKPOINT_FORMAT_VERSION:
+        raise ValueError(f"Incompatible checkpoint: {magic!r} version {version}")
+
+    sections = {}
+    while True:
+        raw = stream.read(_SECTION.size)
+        if len(raw) < _SECTION.size:
+            raise ValueError("Truncated checkpoint")
+        tag, length = _SECTION.unpack(raw)
+        if tag == b"END ":
+            return sections
+        payload = stream.read(length)
+        if len(payload) < length:
+            raise ValueError("Truncated checkpoint")
+        if flags & FLAG_COMPRESSED:
+            payload = zlib.decompress(payload)
+        sections[tag.decode("ascii")] = payload
+
+class CheckpointWrite:
+    """Handle on a checkpoint being written in the background"""
+
+    def __init__(self, path: str, state: CheckpointState, compress: bool):
+        self.path = path
+        self.error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._write, args=(state, compress),
+                                        name="checkpoint", daemon=True)
+        self._thread.start()
+
+    def _write(self, state: CheckpointState, compress: bool):
+        # Written beside the target and renamed, so a crash never leaves half a checkpoint
+        partial = self.path + ".partial"
+        try:
+            with open(partial, "wb") as f:
+                write_state(state, f, compress)
+            os.replace(partial, self.path)
+        except BaseException as error:
+            self.error = error
+
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+
+    def wait(self):
+        """Block until written, re-raising any error from the writer"""
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+
+def save(ecosystem: 'Ecosystem', path: str, background: bool = True, compress: bool = True) -> CheckpointWrite:
+    """Capture now, serialize on a writer thread; call wait() on the result to block"""
+    state = capture(ecosystem)
+    write = CheckpointWrite(path, state, compress)
+    if not background:
+        write.wait()
+    return write
+
+def _restore_chunks(planet, records: np.ndarray):
+    planet.chunks.chunks.clear()
+    planet.edible.cells.clear()
+    for record in records:
+        chunk = Chunk(int(record["chunk_x"]), int(record["chunk_z"]))
+        chunk.blocks = unpack_blocks(record["blocks"])
+        chunk.generated = bool(record["generated"])
+        chunk.update_heightmap()
+        chunk.rebuild_surface()
+        planet.chunks.chunks[chunk.key] = chunk
+        planet.edible.rebuild_chunk(chunk)
+
+def _restore_animal(record, diseases) -> Animal:
+    species = SPECIES[record["species"]]
+    genetics = Genetics.from_traits(float(record["gene_speed"]), tuple(record["gene_color"].tolist()),
+                                    float(record["gene_vision"]), float(record["gene_stamina"]),
+                                    float(record["gene_intelligence"]))
+    animal = Animal(species, Vector3(*record["position"].tolist()), genetics=genetics)
+    animal.is_water = bool(record["is_water"])
+    animal.home_range = Vector3(*record["home_range"].tolist())
+    animal.nest_position = Vector3(*record["nest_position"].tolist()) if record["has_nest"] else None
+    animal.nest_construction = int(record["nest_construction"])
+    animal.energy = float(record["energy"])
+    animal.max_energy = float(record["max_energy"])
+    animal.age = int(record["age"])
+    animal.speed = float(record["speed"])
+    animal.breeding_cooldown = int(record["breeding_cooldown"])
+    animal.is_breeding = bool(record["is_breeding"])
+    animal.color = tuple(record["color"].tolist())
+    animal.vision_range = float(record["vision_range"])
+    animal.aggression = float(record["aggression"])
+    animal.hunger_level = float(record["hunger_level"])
+    if not math.isnan(record["health"]):
+        animal.health = float(record["health"])
+    if record["disease"] >= 0:
+        diseases[record["disease"]].infect(animal)
+    animal.disease_timer = int(record["disease_timer"])
+    animal.disease_severity = float(record["disease_severity"])
+    animal.planned = bool(record["planned"])
+    animal.target_id = int(record["target_id"])
+    animal.target_pos = Vector3(*record["target_pos"].tolist()) if record["has_target_pos"] else None
+    animal.heading_x, animal.heading_z = record["heading"].tolist()
+    return animal
+
+def read_meta(sections: Dict[str, bytes]) -> Dict:
+    return json.loads(sections["META"])
+
+def restore(ecosystem: 'Ecosystem', sections: Dict[str, bytes]):
+    """Replace the state of a freshly built, unpopulated ecosystem with read_sections() output"""
+    meta = read_meta(sections)
+    if meta["species"] != SPECIES:
+        raise ValueError("Checkpoint was written with a different set of species")
+
+    planet = ecosystem.planet
+    _restore_chunks(planet, np.frombuffer(sections["CHNK"], dtype=CHUNK_RECORD))
+    planet.clock = meta["planet_clock"]
+    for chunk_x, chunk_z, due in meta["pending_chunks"]:
+        planet.request_chunk(chunk_x, chunk_z, due)
+
+    for name, value in meta["weather"].items():
+        setattr(ecosystem.weather, name, value)
+
+    diseases = []
+    for saved in meta["diseases"]:
+        disease = Disease(saved["name"])
+        disease.severity = saved["severity"]
+        diseases.append(disease)
+    ecosystem.health_system.active_diseases = diseases
+
+    # Registry order drives the behaviour loop and store row order drives breeding,
+    # so both are rebuilt exactly as they were
+    records = np.frombuffer(sections["ANML"], dtype=ANIMAL_RECORD)
+    animals = [_restore_animal(record, diseases) for record in records]
+    for animal, record in zip(animals, records):
+        ecosystem.registry.add(animal, int(record["entity_id"]))
+    ecosystem.registry.next_id = meta["next_id"]
+    if ecosystem.population is not None:
+        for i in np.argsort(records["row"], kind="stable"):
+            ecosystem.population.add(animals[i])
+        ecosystem.population.sync_positions()
+
+    ecosystem.frame_count = meta["frame_count"]
+    # Last, since rebuilding animals and diseases above draws from the global stream
+    internal = tuple(np.frombuffer(sections["RAND"], dtype=np.uint32).tolist())
+    random.setstate((meta["rng_version"], internal, meta["rng_gauss_next"]))
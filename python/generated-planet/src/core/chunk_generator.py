@@ -0,0 +1,45 @@
+"""Background chunk generation on a thread or process pool"""
+
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+from .terrain import ChunkData, generate_chunk_data
+
+class ChunkGenerator:
+    """Generates chunks off the main thread and hands finished ChunkData back on request
+
+    Results only depend on (seed, chunk coordinate), so the order in which
+    workers finish never changes the terrain.
+    """
+
+    def __init__(self, seed: int, workers: int = 2, use_processes: bool = False, vectorized: bool = True):
+        self.seed = seed
+        self.vectorized = vectorized
+        executor_type = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self.executor = executor_type(max_workers=workers)
+        self.in_flight: Dict[Tuple[int, int], Future] = {}
+
+    def request(self, chunk_x: int, chunk_z: int) -> bool:
+        """Queue a chunk coordinate, returns False if it is already in flight"""
+        key = (chunk_x, chunk_z)
+        if key in self.in_flight:
+            return False
+        self.in_flight[key] = self.executor.submit(
+            generate_chunk_data, self.seed, chunk_x, chunk_z, self.vectorized)
+        return True
+
+    def is_in_flight(self, chunk_x: int, chunk_z: int) -> bool:
+        return (chunk_x, chunk_z) in self.in_flight
+
+    def wait(self, chunk_x: int, chunk_z: int) -> Optional[ChunkData]:
+        """Block until an in-flight chunk is done, None if it was never requested"""
+        future = self.in_flight.pop((chunk_x, chunk_z), None)
+        if future is None:
+            return None
+        return future.result()
+
+    def shutdown(self):
+        """Stop workers, dropping chunks that have not started"""
+        for future in self.in_flight.values():
+            future.cancel()
+        self.in_flight.clear()
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,210 @@
+"""Chunk storage - dense per-chunk block arrays keyed by chunk coordinate"""
+
+import heapq
+import itertools
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+import numpy as np
+from ..utils.constants import BlockType, CHUNK_SIZE, WORLD_HEIGHT
+from .region import RegionStore, SLOT_GENERATED
+
+# Shared by every chunk, so a chunk paged back in never repeats a revision of the one it replaces
+_revisions = itertools.count()
+
+class Chunk:
+    """A CHUNK_SIZE x WORLD_HEIGHT x CHUNK_SIZE block of terrain stored as uint8"""
+
+    def __init__(self, chunk_x: int, chunk_z: int):
+        self.chunk_x = chunk_x
+        self.chunk_z = chunk_z
+        # Indexed [local_x, y, local_z]
+        self.blocks = np.zeros((CHUNK_SIZE, WORLD_HEIGHT, CHUNK_SIZE), dtype=np.uint8)
+        # False while the chunk only holds blocks spilled in from neighbours (tree leaves)
+        self.generated = False
+        # Highest solid (non-air, non-water) and highest water y per column, -1 if none
+        self.top_solid = np.full((CHUNK_SIZE, CHUNK_SIZE), -1, dtype=np.int8)
+        self.top_water = np.full((CHUNK_SIZE, CHUNK_SIZE), -1, dtype=np.int8)
+        # World positions of surface blocks and their cached (x, y, z, block_type) render list
+        self.surface: Set[Tuple[int, int, int]] = set()
+        self.render_cache: Optional[List[Tuple[int, int, int, int]]] = None
+        # Paging state: last Planet clock tick the chunk was used, and unsaved changes
+        self.last_access = 0
+        self.dirty = True
+        # Bumped when the heightmaps / the grass change, flow fields compare them to stay current
+        self.revision = next(_revisions)
+        self.grass_revision = next(_revisions)
+
+    @property
+    def key(self) -> Tuple[int, int]:
+        return (self.chunk_x, self.chunk_z)
+
+    @property
+    def origin(self) -> Tuple[int, int]:
+        """World x/z of the chunk's first column"""
+        return (self.chunk_x * CHUNK_SIZE, self.chunk_z * CHUNK_SIZE)
+    
+    def set_block(self, lx: int, y: int, lz: int, block_type: int):
+        """Set a block by local coordinates, keeping the column heightmaps current"""
+        if block_type == BlockType.GRASS or self.blocks.item(lx, y, lz) == BlockType.GRASS:
+            self.grass_revision = next(_revisions)
+        self.blocks[lx, y, lz] = block_type
+        self.dirty = True
+        
+        solid = block_type != BlockType.AIR and block_type != BlockType.WATER
+        top_solid = self.top_solid.item(lx, lz)
+        if solid and y > top_solid:
+            self.top_solid[lx, lz] = y
+        elif not solid and y == top_solid:
+            self.top_solid[lx, lz] = _top_index(self._solid_mask(self.blocks[lx, :y, lz]))
+        
+        top_water = self.top_water.item(lx, lz)
+        if block_type == BlockType.WATER and y > top_water:
+            self.top_water[lx, lz] = y
+        elif block_type != BlockType.WATER and y == top_water:
+            self.top_water[lx, lz] = _top_index(self.blocks[lx, :y, lz] == BlockType.WATER)
+        
+        if self.top_solid.item(lx, lz) != top_solid or self.top_water.item(lx, lz) != top_water:
+            self.revision = next(_revisions)
+    
+    def update_heightmap(self, lx0: int = 0, lx1: int = CHUNK_SIZE, lz0: int = 0, lz1: int = CHUNK_SIZE):
+        """Recompute the heightmaps for a window of columns after a bulk write"""
+        columns = self.blocks[lx0:lx1, :, lz0:lz1]
+        self.top_solid[lx0:lx1, lz0:lz1] = _top_index(self._solid_mask(columns), axis=1)
+        self.top_water[lx0:lx1, lz0:lz1] = _top_index(columns == BlockType.WATER, axis=1)
+        self.revision = next(_revisions)
+        self.grass_revision = next(_revisions)
+    
+    def rebuild_surface(self):
+        """Derive surface blocks from the array - solid blocks with air on any side"""
+        solid = self.blocks != BlockType.AIR
+        air = ~solid
+        exposed = np.zeros_like(solid)
+        exposed[:, -1, :] = True
+        exposed[:, :-1, :] |= air[:, 1:, :]
+        exposed[:, 1:, :] |= air[:, :-1, :]
+        exposed[:-1, :, :] |= air[1:, :, :]
+        exposed[1:, :, :] |= air[:-1, :, :]
+        exposed[:, :, :-1] |= air[:, :, 1:]
+        exposed[:, :, 1:] |= air[:, :, :-1]
+        
+        origin_x, origin_z = self.origin
+        self.surface = {(origin_x + lx, y, origin_z + lz)
+                        for lx, y, lz in np.argwhere(exposed & solid).tolist()}
+        self.render_cache = None
+    
+    def get_render_list(self) -> List[Tuple[int, int, int, int]]:
+        """Non-air surface blocks as (x, y, z, block_type), far-to-near, cached until invalidated"""
+        if self.render_cache is None:
+            origin_x, origin_z = self.origin
+            blocks = self.blocks
+            render = []
+            for x, y, z in self.surface:
+                block_type = blocks.item(x - origin_x, y, z - origin_z)
+                if block_type != BlockType.AIR:
+                    render.append((x, y, z, block_type))
+            # Pre-sorted runs make the renderer's sort of the merged list cheap
+            render.sort(key=lambda b: (b[0] + b[1] + b[2]), reverse=True)
+            self.render_cache = render
+        return self.render_cache
+    
+    @staticmethod
+    def _solid_mask(blocks: np.ndarray) -> np.ndarray:
+        return (blocks != BlockType.AIR) & (blocks != BlockType.WATER)
+
+def _top_index(mask: np.ndarray, axis: int = 0):
+    """Highest True index along axis, -1 where there is none"""
+    size = mask.shape[axis]
+    if size == 0:
+        return -1
+    top = size - 1 - np.argmax(np.flip(mask, axis=axis), axis=axis)
+    return np.where(mask.any(axis=axis), top, -1)
+
+class ChunkStore:
+    """Chunk arrays keyed by chunk coordinate, optionally paged to region files"""
+
+    def __init__(self, pager: Optional[RegionStore] = None):
+        self.chunks: Dict[Tuple[int, int], Chunk] = {}
+        self.pager = pager
+        # Called with each chunk read back from the pager / about to be dropped
+        self.on_page_in: Optional[Callable[[Chunk], None]] = None
+        self.on_page_out: Optional[Callable[[Chunk], None]] = None
+
+    @staticmethod
+    def chunk_key(x: int, z: int) -> Tuple[int, int]:
+        """Chunk coordinate containing world column (x, z)"""
+        return (x // CHUNK_SIZE, z // CHUNK_SIZE)
+
+    def get(self, chunk_x: int, chunk_z: int) -> Optional[Chunk]:
+        """Get chunk if it exists, paging it in from disk if it was evicted"""
+        chunk = self.chunks.get((chunk_x, chunk_z))
+        if chunk is None and self.pager is not None:
+            chunk = self._page_in(chunk_x, chunk_z)
+        return chunk
+
+    def get_or_create(self, chunk_x: int, chunk_z: int) -> Chunk:
+        """Get chunk, creating an empty one if needed"""
+        chunk = self.get(chunk_x, chunk_z)
+        if chunk is None:
+            chunk = Chunk(chunk_x, chunk_z)
+            self.chunks[(chunk_x, chunk_z)] = chunk
+        return chunk
+
+    def get_block(self, x: int, y: int, z: int) -> int:
+        """Get block type without triggering generation"""
+        if y < 0 or y >= WORLD_HEIGHT:
+            return BlockType.AIR
+        chunk = self.get(x // CHUNK_SIZE, z // CHUNK_SIZE)
+        if chunk is None:
+            return BlockType.AIR
+        return chunk.blocks.item(x % CHUNK_SIZE, y, z % CHUNK_SIZE)
+
+    def set_block(self, x: int, y: int, z: int, block_type: int) -> bool:
+        """Set block type, returns False if y is outside the world"""
+        if y < 0 or y >= WORLD_HEIGHT:
+            return False
+        chunk = self.get_or_create(x // CHUNK_SIZE, z // CHUNK_SIZE)
+        chunk.set_block(x % CHUNK_SIZE, y, z % CHUNK_SIZE, block_type)
+        return True
+
+    def _page_in(self, chunk_x: int, chunk_z: int) -> Optional[Chunk]:
+        state, blocks = self.pager.load(chunk_x, chunk_z)
+        if blocks is None:
+            return None
+        
+        chunk = Chunk(chunk_x, chunk_z)
+        chunk.blocks = blocks
+        chunk.generated = state == SLOT_GENERATED
+        chunk.update_heightmap()
+        chunk.rebuild_surface()
+        chunk.dirty = False
+        self.chunks[chunk.key] = chunk
+        if self.on_page_in:
+            self.on_page_in(chunk)
+        return chunk
+
+    def page_out(self, chunk: Chunk):
+        """Write a chunk to its region file (if changed) and drop it from memory"""
+        if chunk.dirty:
+            self.pager.save(chunk.chunk_x, chunk.chunk_z, chunk.blocks, chunk.generated)
+        if self.on_page_out:
+            self.on_page_out(chunk)
+        del self.chunks[chunk.key]
+
+    def evict(self, budget: int, now: int) -> int:
+        """Page out least recently used chunks until at most budget remain, returns the count"""
+        if self.pager is None or len(self.chunks) <= budget:
+            return 0
+        # Never evict chunks used during the current tick
+        candidates = [chunk for chunk in self.chunks.values() if chunk.last_access < now]
+        victims = heapq.nsmallest(len(self.chunks) - budget, candidates, key=lambda c: c.last_access)
+        for chunk in victims:
+            self.page_out(chunk)
+        return len(victims)
+
+    def __iter__(self) -> Iterator[Chunk]:
+        return iter(self.chunks.values())
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def __contains__(self, key: Tuple[int, int]) -> bool:
+        return key in self.chunks
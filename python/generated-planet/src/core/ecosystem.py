@@ -2,30 +2,66 @@
 
 import random
 import math
-from typing import List
+from typing import List, Optional
 from ..utils.vectors import Vector3
 from .planet import Planet
 from .animal import Animal
+from .genetics import GenePool
 from .health import HealthSystem
+from .spatial_hash import SpatialHash
+from .population import PopulationStore
+from .pool import AnimalPool
+from .registry import EntityRegistry
+from . import checkpoint
 from ..engine.weather import WeatherSystem
+from ..utils.timing import NULL_TIMER
 from ..utils.constants import (
     AnimalTypes, INITIAL_ANIMALS, BREEDING_ENERGY_THRESHOLD, 
     BREEDING_ENERGY_COST, BREEDING_AGE_MIN, BREEDING_COOLDOWN, BlockType,
-    PLANT_GROWTH_CHANCE, PLANT_MAX_AGE
+    PLANT_GROWTH_CHANCE, PLANT_MAX_AGE, CHUNK_WORKERS,
+    MAX_LOADED_CHUNKS, ANIMAL_ENERGY_DRAIN, USE_POPULATION_STORE, SIM_TICK_RATE,
+    LOD_RADIUS, LOD_INTERVAL
 )
 
+def spawn_initial_animals() -> List[Animal]:
+    """INITIAL_ANIMALS scattered around the origin, drawn from the global random stream"""
+    animals = []
+    spawn_height = 10
+    for animal_type, count in INITIAL_ANIMALS.items():
+        for _ in range(count):
+            pos = Vector3(
+                random.uniform(-25, 25),
+                spawn_height,
+                random.uniform(-25, 25)
+            )
+            animals.append(Animal(animal_type, pos))
+    return animals
+
 class Ecosystem:
     """Manages the ecosystem - animals, food, breeding"""
     
-    def __init__(self):
-        self.planet = Planet()
-        self.animals: List[Animal] = []
+    def __init__(self, seed: int = 42, chunk_workers: int = CHUNK_WORKERS,
+                 region_dir: Optional[str] = None,
+                 use_population_store: bool = USE_POPULATION_STORE, populate: bool = True):
+        self.seed = seed
+        random.seed(seed)
+        self.planet = Planet(seed=seed, workers=chunk_workers, region_dir=region_dir,
+                             max_loaded_chunks=MAX_LOADED_CHUNKS if region_dir else None)
+        self.registry = EntityRegistry()
+        self.animals: List[Animal] = self.registry.entities  # compacted once per tick, never reassigned
+        self.population: Optional[PopulationStore] = PopulationStore() if use_population_store else None
+        self.pool = AnimalPool()  # animals that died, reused by births
+        self.focus: Optional[Vector3] = None  # observer position, e.g. the camera
+        self.ghosts: list = []  # read-only copies of animals owned elsewhere, visible to neighbour queries
         self.frame_count = 0
+        self.animal_grid = SpatialHash()
         self.health_system = HealthSystem()
         self.weather = WeatherSystem()
         self.plant_ages = {}  # Track plant growth
+        self.timer = NULL_TIMER  # set to a PhaseTimer to time each phase of update()
         self.add_water_lake()
-        self.initialize_animals()
+        if populate:
+            self.initialize_animals()
     
     def add_water_lake(self):
         """Add water blocks in the center"""
@@ -34,94 +70,200 @@ class Ecosystem:
                 dist = math.sqrt(x**2 + z**2)
                 if dist < 8:
                     for y in range(0, 4):
-                        self.planet.blocks[(x, y, z)] = BlockType.WATER
-                        self.planet.surface_blocks.add((x, y, z))
+                        self.planet.set_block_at(x, y, z, BlockType.WATER)
     
     def initialize_animals(self):
         """Spawn initial animals"""
-        spawn_height = 10
-        for animal_type, count in INITIAL_ANIMALS.items():
-            for _ in range(count):
-                pos = Vector3(
-                    random.uniform(-25, 25),
-                    spawn_height,
-                    random.uniform(-25, 25)
-                )
-                self.animals.append(Animal(animal_type, pos))
+        for animal in spawn_initial_animals():
+            self.add_animal(animal)
+    
+    def add_animal(self, animal: Animal):
+        """Register a new animal with every per-animal structure"""
+        self.registry.add(animal)
+        if self.population is not None:
+            self.population.add(animal)
+    
+    def remove_animal(self, animal: Animal):
+        """Tombstone an animal; it leaves the animals list at the end of the tick"""
+        if self.registry.remove(animal):
+            if self.population is not None:
+                self.population.remove(animal)
+            self.animal_grid.remove(animal)
+    
+    def set_focus(self, position: Vector3):
+        """Set the observer position used to prioritise work around the camera"""
+        self.focus = position
+    
+    def lod_steps(self, animal: Animal) -> int:
+        """Ticks of behaviour the animal runs this tick: 1 within LOD_RADIUS of the focus,
+        beyond it LOD_INTERVAL every LOD_INTERVAL ticks and 0 in between"""
+        focus = self.focus
+        if focus is None:
+            return 1
+        dx = animal.position.x - focus.x
+        dz = animal.position.z - focus.z
+        if dx * dx + dz * dz <= LOD_RADIUS * LOD_RADIUS:
+            return 1
+        return 0 if (self.frame_count + animal.entity_id) % LOD_INTERVAL else LOD_INTERVAL
+    
+    def save_checkpoint(self, path: str, background: bool = True,
+                        compress: bool = True) -> checkpoint.CheckpointWrite:
+        """Snapshot now and write the checkpoint on a background thread; wait() on the result to block"""
+        return checkpoint.save(self, path, background, compress)
+    
+    @classmethod
+    def load_checkpoint(cls, path: str, chunk_workers: int = CHUNK_WORKERS,
+                        region_dir: Optional[str] = None,
+                        use_population_store: bool = USE_POPULATION_STORE) -> 'Ecosystem':
+        """Rebuild an ecosystem from save_checkpoint, ready to continue from the saved tick"""
+        with open(path, "rb") as f:
+            sections = checkpoint.read_sections(f)
+        ecosystem = cls(seed=checkpoint.read_meta(sections)["seed"], chunk_workers=chunk_workers,
+                        region_dir=region_dir, use_population_store=use_population_store, populate=False)
+        checkpoint.restore(ecosystem, sections)
+        return ecosystem
     
     def get_animal_counts(self) -> dict:
         """Get count of each animal type"""
+        if self.population is not None:
+            return self.population.species_counts()
         counts = {}
         for animal in self.animals:
             counts[animal.animal_type] = counts.get(animal.animal_type, 0) + 1
         return counts
     
+    def get_trait_stats(self, animal_type: Optional[str] = None) -> dict:
+        """Mean, variance, min and max of each genetic trait, for everyone or one species"""
+        if self.population is not None:
+            return self.population.trait_stats(animal_type)
+        animals = [a for a in self.animals if animal_type is None or a.animal_type == animal_type]
+        pool = GenePool(len(animals))
+        for animal in animals:
+            pool.append(animal.genetics)
+        return pool.stats()
+    
     def get_breeding_count(self) -> int:
         """Count animals currently breeding"""
+        if self.population is not None:
+            return int(self.population.columns["is_breeding"][:self.population.count].sum())
         return sum(1 for a in self.animals if a.is_breeding)
     
     def update(self, behavior_engine, reproduction_engine):
         """Update ecosystem"""
         self.frame_count += 1
+        timer = self.timer
+        timer.begin()
         
         # Update weather and environmental systems
         self.weather.update()
+        timer.lap("weather")
         
         # Update planet
         if self.frame_count % 60 == 0:
             self.planet.update()
+        timer.lap("planet")
         
         # Plant growth
         self.update_plant_growth()
+        timer.lap("plants")
         
         # Update animals
         new_animals = []
-        dead_from_disease = []
+        population = self.population
+        self.animal_grid.rebuild(self.animals)
+        for ghost in self.ghosts:
+            self.animal_grid.insert(ghost)
+        
+        if population is not None:
+            population.tick(ANIMAL_ENERGY_DRAIN)
+        timer.lap("grid")
+        
+        # Flock and herd headings for everyone at once, from last tick's positions
+        behavior_engine.steer_flocks(self.animals, population)
+        timer.lap("flocking")
         
         for animal in self.animals:
             # Update basic state
-            animal.age += 1
-            animal.energy -= animal.speed * 0.2
-            animal.breeding_cooldown = max(0, animal.breeding_cooldown - 1)
+            if population is None:
+                animal.age += 1
+                animal.energy -= animal.speed * ANIMAL_ENERGY_DRAIN
+                animal.breeding_cooldown = max(0, animal.breeding_cooldown - 1)
             
-            # Keep on ground
-            behavior_engine.constrain_to_ground(animal, self.planet)
+            # Out of the observer's sight animals behave in coarse steps, see lod_steps
+            steps = self.lod_steps(animal)
+            if steps:
+                # Keep on ground
+                behavior_engine.constrain_to_ground(animal, self.planet)
+                
+                # Find and pursue target, kills are only claimed here
+                target = behavior_engine.current_target(animal, self.planet, self.animals, self.animal_grid,
+                                                        self.registry, self.frame_count)
+                if target:
+                    behavior_engine.move_towards(animal, target, steps)
+                    behavior_engine.eat(animal, self.planet, self.animals, target, self.animal_grid,
+                                        self.registry)
+                elif not (behavior_engine.seek(animal, self.planet, steps) or
+                          behavior_engine.flock(animal, steps)):
+                    behavior_engine.random_walk(animal, steps)
+                
+                if steps > 1:
+                    # Moved further than the grid's slack allows for, re-bucket
+                    self.animal_grid.remove(animal)
+                    self.animal_grid.insert(animal)
             
-            # Find and pursue target
-            target = behavior_engine.find_target(animal, self.planet, self.animals)
-            if target:
-                behavior_engine.move_towards(animal, target)
-                behavior_engine.eat(animal, self.planet, self.animals, target)
-            else:
-                behavior_engine.random_walk(animal)
-            
-            # Try to breed
-            if reproduction_engine.can_breed(animal, BREEDING_ENERGY_THRESHOLD, 
-                                            BREEDING_AGE_MIN, BREEDING_COOLDOWN):
-                offspring = reproduction_engine.breed(animal, BREEDING_ENERGY_COST, BREEDING_COOLDOWN)
-                new_animals.append(offspring)
-            else:
-                animal.is_breeding = False
+            # Try to breed (with a population store everyone breeds at once after the loop)
+            if population is None:
+                if reproduction_engine.can_breed(animal, BREEDING_ENERGY_THRESHOLD, 
+                                                BREEDING_AGE_MIN, BREEDING_COOLDOWN):
+                    offspring = reproduction_engine.breed(animal, BREEDING_ENERGY_COST, BREEDING_COOLDOWN,
+                                                          self.pool)
+                    new_animals.append(offspring)
+                else:
+                    animal.is_breeding = False
+        timer.lap("behavior")
+        
+        # Each claimed prey is eaten exactly once
+        for prey in self.registry.resolve_kills():
+            if population is not None:
+                population.remove(prey)
+            self.animal_grid.remove(prey)
         
-        self.animals.extend(new_animals)
+        if population is not None:
+            breeders = reproduction_engine.can_breed_many(population, BREEDING_ENERGY_THRESHOLD,
+                                                          BREEDING_AGE_MIN, BREEDING_COOLDOWN)
+            new_animals = reproduction_engine.breed_many(population, breeders, BREEDING_ENERGY_COST,
+                                                         BREEDING_COOLDOWN, self.pool)
+        
+        for offspring in new_animals:
+            self.add_animal(offspring)
+            self.animal_grid.insert(offspring)
+        timer.lap("breeding")
         
         # Handle diseases
-        disease_deaths = self.health_system.update(self.animals)
-        dead_from_disease.extend(disease_deaths)
+        for dead in self.health_system.update(self.registry.live()):
+            self.remove_animal(dead)
+        timer.lap("disease")
         
         # Remove dead animals
-        for dead in dead_from_disease:
-            if dead in self.animals:
-                self.animals.remove(dead)
-        
-        self.animals = [a for a in self.animals if a.is_alive()]
+        if population is not None:
+            for dead in population.cull():
+                self.registry.remove(dead)
+            population.sync_positions()
+        else:
+            for animal in self.animals:
+                if not animal.is_alive():
+                    self.registry.remove(animal)
+        self.pool.release(self.registry.compact())
+        timer.lap("cull")
         
-        # Generate terrain around animals
+        # Generate terrain around animals and the observer in the background
         if self.frame_count % 30 == 0:
-            for animal in self.animals:
-                chunk_x = int(animal.position.x / 16) * 16
-                chunk_z = int(animal.position.z / 16) * 16
-                self.planet.generate_chunk(chunk_x, chunk_z)
+            positions = [animal.position for animal in self.animals]
+            if self.focus is not None:
+                positions.append(self.focus)
+            self.planet.prefetch_around(positions)
+        self.planet.stream_chunks()
+        timer.lap("chunks")
     
     def update_plant_growth(self):
         """Update plant growth on grass blocks"""
@@ -132,11 +274,11 @@ class Ecosystem:
         for _ in range(5):
             x = random.randint(-32, 32)
             z = random.randint(-32, 32)
-            for y in range(1, 16):
-                if self.planet.get_block_at(x, y, z) == BlockType.DIRT:
-                    if y < 15 and self.planet.get_block_at(x, y+1, z) == BlockType.AIR:
-                        if random.random() < PLANT_GROWTH_CHANCE:
-                            self.planet.set_block_at(x, y+1, z, BlockType.GRASS)
+            y = self.planet.get_surface_height(x, z)
+            if 1 <= y < 15 and self.planet.get_block_at(x, y, z) == BlockType.DIRT:
+                if self.planet.get_block_at(x, y+1, z) == BlockType.AIR:
+                    if random.random() < PLANT_GROWTH_CHANCE:
+                        self.planet.set_block_at(x, y+1, z, BlockType.GRASS)
     
     def get_total_animals(self) -> int:
         """Total animal count"""
@@ -144,4 +286,4 @@ class Ecosystem:
     
     def get_time_seconds(self) -> int:
         """Get elapsed time in seconds"""
-        return self.frame_count // 60
+        return self.frame_count // SIM_TICK_RATE
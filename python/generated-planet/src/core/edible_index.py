@@ -0,0 +1,109 @@
+"""Edible block index - grass and leaves bucketed into coarse cells for foraging"""
+
+import math
+from typing import Dict, Optional, Set, Tuple
+import numpy as np
+from ..utils.vectors import Vector3
+from ..utils.constants import BlockType, FOOD_INDEX_CELL_SIZE
+from ..utils.grid import ring_cells
+
+EDIBLE_BLOCKS = (BlockType.GRASS, BlockType.LEAVES)
+
+class EdibleIndex:
+    """Grass/leaves positions bucketed by (x, z) cell"""
+    
+    def __init__(self, cell_size: int = FOOD_INDEX_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], Set[Tuple[int, int, int]]] = {}
+    
+    def cell_key(self, x: int, z: int) -> Tuple[int, int]:
+        return (x // self.cell_size, z // self.cell_size)
+    
+    def add(self, x: int, y: int, z: int):
+        key = (x // self.cell_size, z // self.cell_size)
+        cell = self.cells.get(key)
+        if cell is None:
+            cell = self.cells[key] = set()
+        cell.add((x, y, z))
+    
+    def discard(self, x: int, y: int, z: int):
+        key = (x // self.cell_size, z // self.cell_size)
+        cell = self.cells.get(key)
+        if cell is not None:
+            cell.discard((x, y, z))
+            if not cell:
+                del self.cells[key]
+    
+    def contains(self, x: int, y: int, z: int) -> bool:
+        cell = self.cells.get((x // self.cell_size, z // self.cell_size))
+        return cell is not None and (x, y, z) in cell
+    
+    def update(self, x: int, y: int, z: int, old_type: int, new_type: int):
+        """Track a single block change"""
+        if old_type in EDIBLE_BLOCKS and new_type not in EDIBLE_BLOCKS:
+            self.discard(x, y, z)
+        elif new_type in EDIBLE_BLOCKS:
+            self.add(x, y, z)
+    
+    def remove_chunk(self, chunk):
+        """Drop every entry inside a chunk"""
+        origin_x, origin_z = chunk.origin
+        size = chunk.blocks.shape[0]
+        for cx in range(origin_x // self.cell_size, (origin_x + size) // self.cell_size):
+            for cz in range(origin_z // self.cell_size, (origin_z + size) // self.cell_size):
+                self.cells.pop((cx, cz), None)
+    
+    def rebuild_chunk(self, chunk):
+        """Re-index every block of a chunk after a bulk write"""
+        self.remove_chunk(chunk)
+        origin_x, origin_z = chunk.origin
+        edible = (chunk.blocks == BlockType.GRASS) | (chunk.blocks == BlockType.LEAVES)
+        coords = np.argwhere(edible)
+        coords[:, 0] += origin_x
+        coords[:, 2] += origin_z
+        self.add_many(map(tuple, coords.tolist()))
+    
+    def add_many(self, blocks):
+        """Add an iterable of (x, y, z) tuples"""
+        cells = self.cells
+        size = self.cell_size
+        for block in blocks:
+            key = (block[0] // size, block[2] // size)
+            cell = cells.get(key)
+            if cell is None:
+                cell = cells[key] = set()
+            cell.add(block)
+    
+    def find_nearest(self, pos: Vector3, radius: float) -> Optional[Tuple[int, int, int]]:
+        """Closest edible block strictly within radius, searching cells ring by ring
+
+        Ties go to the smallest (x, y, z), so the answer does not depend on the
+        order blocks were added in.
+        """
+        size = self.cell_size
+        home_x = math.floor(pos.x) // size
+        home_z = math.floor(pos.z) // size
+        best = None
+        best_dist_sq = radius * radius
+        
+        for ring in range(int(radius // size) + 2):
+            # Every cell in this ring is at least (ring - 1) cells away horizontally
+            if ring > 1 and ((ring - 1) * size) ** 2 >= best_dist_sq:
+                break
+            
+            for key in ring_cells(home_x, home_z, ring):
+                cell = self.cells.get(key)
+                if not cell:
+                    continue
+                for block in cell:
+                    dx = block[0] - pos.x
+                    dy = block[1] - pos.y
+                    dz = block[2] - pos.z
+                    dist_sq = dx * dx + dy * dy + dz * dz
+                    if dist_sq < best_dist_sq:
+                        best_dist_sq = dist_sq
+                        best = block
+                    elif dist_sq == best_dist_sq and best is not None and block < best:
+                        best = block
+        
+        return best
@@ -1,45 +1,155 @@
 """Genetic system for inherited traits"""
 
 import random
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from ..utils.arrays import draw_rng
 from ..utils.constants import GENETIC_VARIATION, TRAIT_MUTATION_CHANCE
 
+# Scalar traits and the range each is clamped to
+TRAIT_BOUNDS = {
+    "speed": (0.3, 2.0),
+    "vision": (10, 100),
+    "stamina": (0.3, 2.0),
+    "intelligence": (0.5, 2.0),
+}
+COLOR_SHIFT = 20  # largest change of one colour channel in a mutation
+
+def _clamp(trait: str, value: float) -> float:
+    low, high = TRAIT_BOUNDS[trait]
+    return max(low, min(high, value))
+
 class Genetics:
-    """Manages genetic traits for animals"""
-    
-    def __init__(self, speed: float = 1.0, color: tuple = (100, 100, 100), 
+    """Manages genetic traits for animals - fixed once the animal is born"""
+
+    __slots__ = ("speed", "color", "vision", "stamina", "intelligence")
+
+    def __init__(self, speed: float = 1.0, color: tuple = (100, 100, 100),
                  vision: float = 30, parent_genetics=None):
         """Initialize genetics, optionally inheriting from parent"""
         if parent_genetics:
             # Inherit from parent with variation
-            self.speed = parent_genetics.speed * random.uniform(1 - GENETIC_VARIATION, 1 + GENETIC_VARIATION)
-            self.color = self._mutate_color(parent_genetics.color)
-            self.vision = parent_genetics.vision * random.uniform(1 - GENETIC_VARIATION, 1 + GENETIC_VARIATION)
-            self.stamina = parent_genetics.stamina * random.uniform(1 - GENETIC_VARIATION, 1 + GENETIC_VARIATION)
-            self.intelligence = parent_genetics.intelligence * random.uniform(1 - GENETIC_VARIATION, 1 + GENETIC_VARIATION)
+            speed = parent_genetics.speed * random.uniform(1 - GENETIC_VARIATION, 1 + GENETIC_VARIATION)
+            color = self._mutate_color(parent_genetics.color)
+            vision = parent_genetics.vision * random.uniform(1 - GENETIC_VARIATION, 1 + GENETIC_VARIATION)
+            stamina = parent_genetics.stamina * random.uniform(1 - GENETIC_VARIATION, 1 + GENETIC_VARIATION)
+            intelligence = parent_genetics.intelligence * random.uniform(1 - GENETIC_VARIATION, 1 + GENETIC_VARIATION)
         else:
             # Base traits
-            self.speed = speed
-            self.color = color
-            self.vision = vision
-            self.stamina = random.uniform(0.8, 1.2)
-            self.intelligence = random.uniform(0.8, 1.2)
-        
-        # Clamp values
-        self.speed = max(0.3, min(2.0, self.speed))
-        self.vision = max(10, min(100, self.vision))
-        self.stamina = max(0.3, min(2.0, self.stamina))
-        self.intelligence = max(0.5, min(2.0, self.intelligence))
-    
+            stamina = random.uniform(0.8, 1.2)
+            intelligence = random.uniform(0.8, 1.2)
+
+        self.speed = _clamp("speed", speed)
+        self.color = color
+        self.vision = _clamp("vision", vision)
+        self.stamina = _clamp("stamina", stamina)
+        self.intelligence = _clamp("intelligence", intelligence)
+
+    @classmethod
+    def from_traits(cls, speed: float, color: tuple, vision: float, stamina: float,
+                    intelligence: float) -> 'Genetics':
+        """Genetics with exactly these traits, no draws and no clamping"""
+        return cls.__new__(cls).assign(speed, color, vision, stamina, intelligence)
+
+    def assign(self, speed: float, color: tuple, vision: float, stamina: float,
+               intelligence: float) -> 'Genetics':
+        """Overwrite every trait, for an animal reused by AnimalPool"""
+        self.speed = speed
+        self.color = color
+        self.vision = vision
+        self.stamina = stamina
+        self.intelligence = intelligence
+        return self
+
     def _mutate_color(self, base_color: tuple) -> tuple:
         """Mutate color with small random changes"""
         if random.random() < TRAIT_MUTATION_CHANCE:
             return (
-                max(0, min(255, int(base_color[0] + random.randint(-20, 20)))),
-                max(0, min(255, int(base_color[1] + random.randint(-20, 20)))),
-                max(0, min(255, int(base_color[2] + random.randint(-20, 20)))),
+                max(0, min(255, int(base_color[0] + random.randint(-COLOR_SHIFT, COLOR_SHIFT)))),
+                max(0, min(255, int(base_color[1] + random.randint(-COLOR_SHIFT, COLOR_SHIFT)))),
+                max(0, min(255, int(base_color[2] + random.randint(-COLOR_SHIFT, COLOR_SHIFT)))),
             )
         return base_color
-    
+
     def get_fitness(self) -> float:
         """Calculate overall fitness from traits"""
         return (self.speed + self.stamina + self.intelligence + (self.vision / 30)) / 4
+
+class GenePool:
+    """Traits of a whole population as arrays, one row per animal
+
+    Genetics never change after birth, so rows are copies kept in step with the
+    owner's rows (see PopulationStore) - births mutate many parents in one call
+    and population statistics never touch the Animal objects.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.count = 0
+        self.traits: Dict[str, np.ndarray] = {name: np.zeros(capacity) for name in TRAIT_BOUNDS}
+        self.color = np.zeros((capacity, 3), dtype=np.int16)
+
+    def grow(self, capacity: int):
+        for name, column in self.traits.items():
+            grown = np.zeros(capacity)
+            grown[:self.count] = column[:self.count]
+            self.traits[name] = grown
+        color = np.zeros((capacity, 3), dtype=np.int16)
+        color[:self.count] = self.color[:self.count]
+        self.color = color
+
+    def append(self, genetics: Genetics):
+        """Copy genetics into the next row; the caller has made room"""
+        row = self.count
+        for name, column in self.traits.items():
+            column[row] = getattr(genetics, name)
+        self.color[row] = genetics.color
+        self.count += 1
+
+    def remove(self, row: int):
+        """Fill row from the last one, matching PopulationStore.remove"""
+        last = self.count - 1
+        if row != last:
+            for column in self.traits.values():
+                column[row] = column[last]
+            self.color[row] = self.color[last]
+        self.count = last
+
+    def offspring(self, rows: np.ndarray, rng: Optional[np.random.Generator] = None) -> List[tuple]:
+        """Traits for one child of each parent row, mutated and clamped in one pass per trait
+        
+        Each is (speed, color, vision, stamina, intelligence), the arguments of Genetics.assign.
+        """
+        if not len(rows):
+            return []
+        rng = rng if rng is not None else draw_rng()
+        n = len(rows)
+        traits = {}
+        for name, (low, high) in TRAIT_BOUNDS.items():
+            scale = rng.uniform(1 - GENETIC_VARIATION, 1 + GENETIC_VARIATION, n)
+            traits[name] = np.clip(self.traits[name][rows] * scale, low, high).tolist()
+        color = self.color[rows]
+        mutated = rng.random(n) < TRAIT_MUTATION_CHANCE
+        if mutated.any():
+            shift = rng.integers(-COLOR_SHIFT, COLOR_SHIFT + 1, (int(mutated.sum()), 3))
+            color[mutated] = np.clip(color[mutated] + shift, 0, 255)
+        colors = list(map(tuple, color.tolist()))
+        return list(zip(traits["speed"], colors, traits["vision"], traits["stamina"], traits["intelligence"]))
+
+    def stats(self, mask: Optional[np.ndarray] = None) -> Dict[str, Dict[str, float]]:
+        """Mean, variance, min and max of each trait over all rows, or the masked ones"""
+        summary = {}
+        for name, column in self.traits.items():
+            values = column[:self.count] if mask is None else column[:self.count][mask]
+            if not len(values):
+                continue
+            summary[name] = {"mean": float(values.mean()), "var": float(values.var()),
+                             "min": float(values.min()), "max": float(values.max())}
+        return summary
+
+    def histogram(self, trait: str, bins: int = 10,
+                  mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Counts and bin edges of a trait over its clamp range"""
+        values = self.traits[trait][:self.count]
+        if mask is not None:
+            values = values[mask]
+        return np.histogram(values, bins=bins, range=TRAIT_BOUNDS[trait])
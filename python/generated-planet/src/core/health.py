@@ -1,7 +1,10 @@
 """Disease and health system"""
 
 import random
-from typing import List, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
+import numpy as np
+from ..utils.arrays import draw_rng, positions
+from ..utils.grid import neighbour_counts
 from ..utils.constants import (
     DISEASE_SPREAD_RADIUS, DISEASE_INFECTION_CHANCE, 
     DISEASE_DEATH_CHANCE, DISEASE_RECOVERY_TIME
@@ -11,58 +14,42 @@ if TYPE_CHECKING:
     from ..core.animal import Animal
 
 class Disease:
-    """Represents a disease affecting animals"""
+    """Represents a disease affecting animals - who carries it is stored on the animals themselves"""
     
     def __init__(self, name: str = "illness"):
         self.name = name
         self.severity = random.uniform(0.5, 1.0)
-        self.infected_animals: set = set()
+        self.carriers = 0  # animals infected at the last HealthSystem.update
     
     def infect(self, animal: 'Animal'):
         """Infect an animal"""
         if not hasattr(animal, 'health'):
             animal.health = 100
-        if not hasattr(animal, 'disease'):
-            animal.disease = None
-            animal.disease_timer = 0
-            animal.disease_severity = 0
-        
         animal.disease = self
         animal.disease_timer = DISEASE_RECOVERY_TIME
         animal.disease_severity = self.severity
-        self.infected_animals.add(id(animal))
-    
-    def spread(self, animals: List['Animal']):
-        """Spread disease among nearby animals"""
-        for animal in animals:
-            if id(animal) in self.infected_animals:
-                for other in animals:
-                    if (id(other) not in self.infected_animals and
-                        animal.position.distance_to(other.position) < DISEASE_SPREAD_RADIUS):
-                        if random.random() < DISEASE_INFECTION_CHANCE:
-                            self.infect(other)
+        self.carriers += 1
     
-    def update_animal(self, animal: 'Animal') -> bool:
-        """Update animal disease state. Returns True if died"""
-        if id(animal) not in self.infected_animals:
-            return False
-        
-        animal.disease_timer -= 1
+    def spread(self, animals: List['Animal'], rng: Optional[np.random.Generator] = None):
+        """Spread disease among nearby animals
         
-        # Reduce energy from disease
-        animal.energy -= animal.energy * animal.disease_severity * 0.01
+        Each carrier gives every healthy animal within DISEASE_SPREAD_RADIUS an
+        independent chance, so an animal near k carriers is infected with
+        1 - (1 - chance)^k: one draw per exposed animal, all drawn at once.
+        """
+        carriers = [a for a in animals if a.disease is self]
+        healthy = [a for a in animals if a.disease is None]
+        if not carriers or not healthy:
+            return
         
-        # Check death
-        if random.random() < DISEASE_DEATH_CHANCE * animal.disease_severity:
-            return True
-        
-        # Check recovery
-        if animal.disease_timer <= 0:
-            animal.disease = None
-            animal.disease_severity = 0
-            self.infected_animals.discard(id(animal))
-        
-        return False
+        counts = neighbour_counts(positions(healthy), positions(carriers), DISEASE_SPREAD_RADIUS)
+        exposed = np.flatnonzero(counts)
+        if not len(exposed):
+            return
+        rng = rng if rng is not None else draw_rng()
+        chances = 1.0 - (1.0 - DISEASE_INFECTION_CHANCE) ** counts[exposed]
+        for i in exposed[rng.random(len(exposed)) < chances].tolist():
+            self.infect(healthy[i])
 
 class HealthSystem:
     """Manages animal health and diseases"""
@@ -76,14 +63,45 @@ class HealthSystem:
         disease.infect(patient_zero)
         self.active_diseases.append(disease)
     
-    def update(self, animals: List['Animal']):
-        """Update all diseases"""
-        dead_animals = []
-        
+    def adopt_infection(self, animal: 'Animal', name: str, severity: float, timer: int):
+        """Carry an infection over from another simulation, e.g. a migrating animal"""
+        disease = next((d for d in self.active_diseases if d.name == name), None)
+        if disease is None:
+            disease = Disease(name)
+            self.active_diseases.append(disease)
+        disease.infect(animal)
+        animal.disease_severity = severity
+        animal.disease_timer = timer
+    
+    def update(self, animals: List['Animal']) -> List['Animal']:
+        """Spread, progress and retire diseases; returns the animals that died of them"""
+        if not self.active_diseases:
+            return []
+        rng = draw_rng()
         for disease in self.active_diseases:
-            disease.spread(animals)
-            for animal in animals:
-                if disease.update_animal(animal):
-                    dead_animals.append(animal)
+            disease.spread(animals, rng)
+        
+        # One pass over the infected, whatever the number of diseases
+        infected = [a for a in animals if a.disease is not None]
+        for animal in infected:
+            animal.disease_timer -= 1
+            animal.energy -= animal.energy * animal.disease_severity * 0.01
         
+        severity = np.fromiter((a.disease_severity for a in infected), dtype=np.float64, count=len(infected))
+        dies = rng.random(len(infected)) < DISEASE_DEATH_CHANCE * severity
+        
+        # Carriers are recounted from the survivors, so animals that died of anything
+        # no longer count; diseases nobody carries any more are retired
+        for disease in self.active_diseases:
+            disease.carriers = 0
+        dead_animals = []
+        for animal, died in zip(infected, dies.tolist()):
+            if died:
+                dead_animals.append(animal)
+            elif animal.disease_timer <= 0:
+                animal.disease = None
+                animal.disease_severity = 0
+            else:
+                animal.disease.carriers += 1
+        self.active_diseases = [d for d in self.active_diseases if d.carriers > 0]
         return dead_animals
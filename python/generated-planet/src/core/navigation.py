@@ -0,0 +1,162 @@
+"""Navigation - flow fields over the surface heightmap, shared by every animal heading for the same goals"""
+
+import math
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+import numpy as np
+from ..utils.constants import (BlockType, CHUNK_SIZE, FLOW_FIELD_MARGIN, FLOW_FIELD_MAX_CLIMB,
+                               FLOW_FIELD_CACHE_LIMIT)
+
+if TYPE_CHECKING:
+    from .planet import Planet
+
+FOOD = "food"  # walkable columns topped with grass
+WATER = "water"  # columns holding water, where water animals can swim (see constrain_to_ground)
+
+# Neighbour offsets (dx, dz) and the unit step along each; a field stores indexes into these
+OFFSETS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+DIRECTIONS = tuple((dx / math.hypot(dx, dz), dz / math.hypot(dx, dz)) for dx, dz in OFFSETS)
+NO_DIRECTION = -1  # at a goal, or no goal reachable within the field's window
+
+_UNREACHED = np.iinfo(np.int32).max
+
+def _shifted(values: np.ndarray, dx: int, dz: int, fill) -> np.ndarray:
+    """Array whose [x, z] is values[x + dx, z + dz], fill where that falls outside"""
+    out = np.full_like(values, fill)
+    w, h = values.shape
+    out[max(0, -dx):w - max(0, dx), max(0, -dz):h - max(0, dz)] = \
+        values[max(0, dx):w - max(0, -dx), max(0, dz):h - max(0, -dz)]
+    return out
+
+def compute_field(heights: np.ndarray, walkable: np.ndarray, goals: np.ndarray,
+                  inner: slice, max_climb: int = FLOW_FIELD_MAX_CLIMB) -> np.ndarray:
+    """Direction index of the first step toward the nearest goal, for the inner x inner part of a window
+    
+    Breadth-first over the window from every goal at once; animals can step to any
+    of the 8 neighbours that is walkable and at most max_climb higher or lower,
+    and cannot cut a corner past an unwalkable column.
+    """
+    heights = heights.astype(np.int16)
+    allowed = []
+    for dx, dz in OFFSETS:
+        ok = walkable & _shifted(walkable, dx, dz, False)
+        ok &= np.abs(_shifted(heights, dx, dz, 0) - heights) <= max_climb
+        if dx and dz:
+            ok &= _shifted(walkable, dx, 0, False) & _shifted(walkable, 0, dz, False)
+        allowed.append(ok)
+    
+    distance = np.full(heights.shape, _UNREACHED, dtype=np.int32)
+    frontier = goals & walkable
+    distance[frontier] = 0
+    step = 0
+    while frontier.any():
+        step += 1
+        reached = np.zeros_like(frontier)
+        for (dx, dz), ok in zip(OFFSETS, allowed):
+            reached |= ok & _shifted(frontier, dx, dz, False)
+        frontier = reached & (distance == _UNREACHED)
+        distance[frontier] = step
+    
+    # Steepest descent of the distances, inside the inner window only
+    downhill = np.stack([np.where(ok, _shifted(distance, dx, dz, _UNREACHED), _UNREACHED)[inner, inner]
+                         for (dx, dz), ok in zip(OFFSETS, allowed)])
+    best = downhill.argmin(axis=0)
+    here = distance[inner, inner]
+    moves = (here > 0) & (np.take_along_axis(downhill, best[None], axis=0)[0] < here)
+    return np.where(moves, best, NO_DIRECTION).astype(np.int8)
+
+class FlowFields:
+    """Per-chunk flow fields toward FOOD or WATER, computed on first use and cached
+    
+    A chunk's field covers its own columns but searches FLOW_FIELD_MARGIN chunks
+    around it, so goals up to that far away pull animals across chunk borders.
+    A field is rebuilt once a chunk in its window changes its heightmaps (walkability)
+    or, for FOOD, its grass; the check runs at most once per Planet clock tick.
+    """
+    
+    def __init__(self, planet: 'Planet', margin: int = FLOW_FIELD_MARGIN,
+                 cache_limit: int = FLOW_FIELD_CACHE_LIMIT):
+        self.planet = planet
+        self.margin = margin
+        self.cache_limit = cache_limit
+        # (chunk key, kind) -> [field, window stamp, clock tick it was last checked]
+        self.cache: Dict[Tuple[Tuple[int, int], str], list] = {}
+        self.builds = 0
+    
+    def direction(self, x: float, z: float, kind: str) -> Optional[Tuple[float, float]]:
+        """Unit (dx, dz) of the next step toward the nearest goal of kind, None if there is none"""
+        xi, zi = math.floor(x), math.floor(z)
+        index = self.field((xi // CHUNK_SIZE, zi // CHUNK_SIZE), kind).item(xi % CHUNK_SIZE, zi % CHUNK_SIZE)
+        return DIRECTIONS[index] if index != NO_DIRECTION else None
+    
+    def field(self, key: Tuple[int, int], kind: str) -> np.ndarray:
+        entry = self.cache.get((key, kind))
+        clock = self.planet.clock
+        if entry is not None:
+            if entry[2] == clock:
+                return entry[0]
+            stamp = self._stamp(key, kind)
+            if entry[1] == stamp:
+                entry[2] = clock
+                return entry[0]
+        else:
+            stamp = self._stamp(key, kind)
+        
+        if len(self.cache) >= self.cache_limit:
+            self.cache.clear()
+        field = self._build(key, kind)
+        self.cache[(key, kind)] = [field, stamp, clock]
+        return field
+    
+    def _window(self, key: Tuple[int, int]) -> List[Tuple[int, int]]:
+        cx, cz = key
+        span = range(-self.margin, self.margin + 1)
+        return [(cx + dx, cz + dz) for dx in span for dz in span]
+    
+    def _stamp(self, key: Tuple[int, int], kind: str) -> tuple:
+        """Revisions of every chunk in the window, None for chunks not generated yet"""
+        loaded = self.planet.chunks.chunks
+        stamp = []
+        for window_key in self._window(key):
+            chunk = loaded.get(window_key)
+            if chunk is None or not chunk.generated:
+                stamp.append(None)
+            elif kind == FOOD:
+                stamp.append((chunk.revision, chunk.grass_revision))
+            else:
+                stamp.append(chunk.revision)
+        return tuple(stamp)
+    
+    def _build(self, key: Tuple[int, int], kind: str) -> np.ndarray:
+        """Assemble the window's heightmaps (missing chunks count as unwalkable) and compute the field"""
+        self.builds += 1
+        side = (2 * self.margin + 1) * CHUNK_SIZE
+        heights = np.full((side, side), -1, dtype=np.int16)
+        wet = np.zeros((side, side), dtype=bool)  # water above the ground
+        water = np.zeros((side, side), dtype=bool)
+        grass = np.zeros((side, side), dtype=bool)
+        loaded = self.planet.chunks.chunks
+        cx, cz = key
+        for window_key in self._window(key):
+            chunk = loaded.get(window_key)
+            if chunk is None or not chunk.generated:
+                continue
+            x0 = (window_key[0] - cx + self.margin) * CHUNK_SIZE
+            z0 = (window_key[1] - cz + self.margin) * CHUNK_SIZE
+            area = (slice(x0, x0 + CHUNK_SIZE), slice(z0, z0 + CHUNK_SIZE))
+            top = chunk.top_solid.astype(np.intp)
+            surface_water = chunk.top_water > chunk.top_solid
+            heights[area] = np.where(surface_water, chunk.top_water, top)
+            wet[area] = surface_water
+            water[area] = chunk.top_water >= 0
+            if kind == FOOD:
+                tops = np.take_along_axis(chunk.blocks, np.maximum(top, 0)[:, None, :], axis=1)[:, 0, :]
+                grass[area] = (tops == BlockType.GRASS) & (top >= 0)
+        
+        walkable = heights >= 0
+        if kind == FOOD:
+            walkable &= ~wet
+            goals = grass
+        else:
+            goals = water
+        inner = slice(self.margin * CHUNK_SIZE, (self.margin + 1) * CHUNK_SIZE)
+        return compute_field(heights, walkable, goals, inner)
@@ -1,18 +1,41 @@
 import random
 import math
-from typing import Dict, Tuple, Set, List
+from typing import Dict, Tuple, Set, List, Optional
+import numpy as np
 from ..utils.vectors import Vector3
-from ..utils.constants import BlockType, WORLD_HEIGHT, CHUNK_SIZE, RENDER_DISTANCE
+from ..utils.constants import (BlockType, WORLD_HEIGHT, CHUNK_SIZE, RENDER_DISTANCE, CHUNK_PREFETCH_RADIUS,
+                               CHUNK_STREAM_DELAY, GRASS_REGROWTH_CHANCE)
+from .chunks import Chunk, ChunkStore
+from .edible_index import EdibleIndex
+from .navigation import FlowFields
+from .terrain import (ChunkData, GENERATOR_VERSION, generate_chunk_data, terrain_height,
+                      block_type, terrain_heights, block_layers)
+from .region import RegionStore, TerrainCache
+from .chunk_generator import ChunkGenerator
 
 class Planet:
     """3D Minecraft-style voxel terrain planet - optimized"""
     
-    def __init__(self, seed: int = 42):
+    def __init__(self, seed: int = 42, vectorized: bool = True, workers: int = 0,
+                 use_processes: bool = False, region_dir: Optional[str] = None,
+                 max_loaded_chunks: Optional[int] = None):
         self.seed = seed
-        random.seed(seed)
-        self.blocks: Dict[Tuple[int, int, int], int] = {}
-        self.surface_blocks: Set[Tuple[int, int, int]] = set()
-        self.chunks_generated = set()
+        self.vectorized = vectorized  # NumPy chunk generation, False uses the per-block reference path
+        # Under region_dir: generated terrain shared between runs, and this run's own pages
+        self.terrain = TerrainCache(region_dir, seed, GENERATOR_VERSION) if region_dir else None
+        pager = RegionStore.for_run(region_dir, seed) if region_dir else None
+        self.chunks = ChunkStore(pager)
+        self.edible = EdibleIndex()
+        self.chunks.on_page_in = self.edible.rebuild_chunk
+        self.chunks.on_page_out = self.edible.remove_chunk
+        self.flow_fields = FlowFields(self)
+        # Chunks beyond the budget are paged out least recently used first (needs region_dir)
+        self.max_loaded_chunks = max_loaded_chunks
+        self.clock = 0
+        # Requested chunk -> tick it is applied on, in request order
+        self.pending: Dict[Tuple[int, int], int] = {}
+        # With workers, chunks are generated in the background; 0 generates everything inline
+        self.generator = ChunkGenerator(seed, workers, use_processes, vectorized) if workers > 0 else None
         self.generate_initial_terrain()
     
     def generate_initial_terrain(self):
@@ -22,128 +45,260 @@ class Planet:
                 self.generate_chunk(x, z)
     
     def generate_chunk(self, chunk_x: int, chunk_z: int):
-        """Generate a chunk of terrain"""
-        chunk_key = (chunk_x // CHUNK_SIZE, chunk_z // CHUNK_SIZE)
-        if chunk_key in self.chunks_generated:
+        """Generate a chunk of terrain now (or read it from the terrain cache), waiting for it if it is in flight"""
+        key = (chunk_x // CHUNK_SIZE, chunk_z // CHUNK_SIZE)
+        self.pending.pop(key, None)
+        chunk = self.chunks.get(*key)
+        if chunk is not None and chunk.generated:
             return
         
-        self.chunks_generated.add(chunk_key)
+        data = self.generator.wait(*key) if self.generator else None
+        cached = data is None and self.terrain is not None and key in self.terrain
+        if cached:
+            data = self.terrain.load(*key)
+        elif data is None:
+            data = generate_chunk_data(self.seed, key[0], key[1], self.vectorized)
+        if self.terrain is not None and not cached:
+            self.terrain.save(data)
+        self._apply_chunk_data(data)
+    
+    def request_chunk(self, chunk_x: int, chunk_z: int, due: Optional[int] = None):
+        """Queue chunk coordinate (chunk_x, chunk_z) to be applied CHUNK_STREAM_DELAY ticks from now
         
-        for x in range(chunk_x, chunk_x + CHUNK_SIZE):
-            for z in range(chunk_z, chunk_z + CHUNK_SIZE):
-                height = self.get_terrain_height(x, z)
-                
-                for y in range(0, int(height) + 1):
-                    block_type = self.get_block_type(x, y, z, height)
-                    if block_type != BlockType.AIR:
-                        self.blocks[(x, y, z)] = block_type
-                        if y == int(height):
-                            self.surface_blocks.add((x, y, z))
-                
-                # Add trees on grass
-                if int(height) > 3 and random.random() < 0.08:
-                    self.place_tree(x, int(height) + 1, z)
+        Workers get the whole delay to generate it in the background; either way
+        it joins the world on the same tick, so runs do not depend on thread timing.
+        """
+        key = (chunk_x, chunk_z)
+        if key in self.pending:
+            return
+        chunk = self.chunks.get(chunk_x, chunk_z)
+        if chunk is not None and chunk.generated:
+            return
+        self.pending[key] = self.clock + CHUNK_STREAM_DELAY if due is None else due
+        if self.generator and not (self.terrain is not None and key in self.terrain):
+            self.generator.request(chunk_x, chunk_z)
     
-    def place_tree(self, x: int, y: int, z: int):
-        """Place a tree at coordinates"""
-        height = random.randint(3, 5)
+    def prefetch_around(self, positions: List[Vector3], radius: int = CHUNK_PREFETCH_RADIUS):
+        """Queue every chunk within radius chunks of the given positions"""
+        centres = {self.chunks.chunk_key(int(math.floor(pos.x)), int(math.floor(pos.z)))
+                   for pos in positions}
+        wanted = set()
+        for cx, cz in centres:
+            for dx in range(-radius, radius + 1):
+                for dz in range(-radius, radius + 1):
+                    wanted.add((cx + dx, cz + dz))
+        
+        # Nearest rings first so the workers pick up the most urgent chunks
+        for key in sorted(wanted, key=lambda k: (min(max(abs(k[0] - cx), abs(k[1] - cz))
+                                                     for cx, cz in centres), k)):
+            self.request_chunk(*key)
+    
+    def integrate_due_chunks(self) -> int:
+        """Apply queued chunks whose tick has come, in request order, returns how many were applied"""
+        due = [key for key, tick in self.pending.items() if tick <= self.clock]
+        for chunk_x, chunk_z in due:
+            self.generate_chunk(chunk_x * CHUNK_SIZE, chunk_z * CHUNK_SIZE)
+        return len(due)
+    
+    def stream_chunks(self):
+        """Once per tick: apply chunks that are due and page out chunks over budget"""
+        self.clock += 1
+        self.integrate_due_chunks()
+        if self.max_loaded_chunks is not None:
+            self.chunks.evict(self.max_loaded_chunks, self.clock)
+    
+    def is_chunk_in_flight(self, chunk_x: int, chunk_z: int) -> bool:
+        """True while the chunk is queued and not yet applied"""
+        return (chunk_x, chunk_z) in self.pending
+    
+    def close(self):
+        """Stop background generation and delete this run's paged chunks, keeping the terrain cache"""
+        if self.generator:
+            self.generator.shutdown()
+            self.generator = None
+        self.pending.clear()
+        if self.terrain is not None:
+            self.terrain.close()
+        if self.chunks.pager:
+            self.chunks.pager.close()
+    
+    def _apply_chunk_data(self, data: ChunkData):
+        """Merge generated terrain and trees into the store"""
+        chunk = self.chunks.get_or_create(data.chunk_x, data.chunk_z)
+        if chunk.generated:
+            return
+        
+        chunk.generated = True
+        chunk_x, chunk_z = chunk.origin
+        
+        # Terrain overwrites everything at or below the surface, blocks above
+        # (leaves spilled in from neighbouring trees) are kept
+        np.copyto(chunk.blocks, data.blocks, where=data.blocks != BlockType.AIR)
+        chunk.dirty = True
+        chunk.update_heightmap()
+        self.edible.rebuild_chunk(chunk)
+        
+        surface = data.surface
+        for lx in range(CHUNK_SIZE):
+            for lz in range(CHUNK_SIZE):
+                chunk.surface.add((chunk_x + lx, surface[lx][lz], chunk_z + lz))
+        chunk.render_cache = None
+        
+        touched = set()
+        for x, y, z, height in data.trees:
+            self.place_tree(x, y, z, touched, height)
+        for canopy_chunk in touched:
+            canopy_chunk.update_heightmap()
+    
+    def place_tree(self, x: int, y: int, z: int, touched: Optional[Set[Chunk]] = None,
+                   height: Optional[int] = None):
+        """Place a tree at coordinates
+        
+        Canopies written as array slices leave chunk heightmaps stale; pass
+        touched to collect those chunks and refresh them once after placing
+        several trees.
+        """
+        if height is None:
+            height = random.randint(3, 5)
         
         for i in range(height):
-            self.blocks[(x, y + i, z)] = BlockType.WOOD
-            self.surface_blocks.add((x, y + i, z))
+            self.set_block_at(x, y + i, z, BlockType.WOOD)
+        
+        if self.vectorized:
+            canopy_chunks = self._place_canopy(x, y + height - 2, z)
+            if touched is None:
+                for chunk in canopy_chunks:
+                    chunk.update_heightmap()
+            else:
+                touched.update(canopy_chunks)
+            return
         
         for dx in range(-2, 3):
             for dz in range(-2, 3):
                 for dy in range(height - 2, height + 1):
                     pos = (x + dx, y + dy, z + dz)
-                    if pos not in self.blocks:
-                        self.blocks[pos] = BlockType.LEAVES
-                        self.surface_blocks.add(pos)
+                    if self.chunks.get_block(*pos) == BlockType.AIR:
+                        self.set_block_at(*pos, BlockType.LEAVES)
     
-    def get_terrain_height(self, x: int, z: int) -> float:
-        """Generate height at coordinates"""
-        height = 0
-        scale = 1.0
-        amplitude = 1.0
+    def _place_canopy(self, x: int, bottom: int, z: int) -> List[Chunk]:
+        """Fill the empty cells of a 5x3x5 leaf canopy, one array slice per chunk it overlaps"""
+        top = min(bottom + 3, WORLD_HEIGHT)
+        if bottom >= top:
+            return []
         
-        for octave in range(3):
-            frequency = scale * 0.05
-            value = math.sin(x * frequency) * math.cos(z * frequency)
-            height += value * amplitude
-            scale *= 2
-            amplitude *= 0.5
+        touched = []
+        min_cx, min_cz = self.chunks.chunk_key(x - 2, z - 2)
+        max_cx, max_cz = self.chunks.chunk_key(x + 2, z + 2)
+        for cx in range(min_cx, max_cx + 1):
+            for cz in range(min_cz, max_cz + 1):
+                chunk = self.chunks.get_or_create(cx, cz)
+                origin_x, origin_z = chunk.origin
+                x0, x1 = max(x - 2, origin_x), min(x + 3, origin_x + CHUNK_SIZE)
+                z0, z1 = max(z - 2, origin_z), min(z + 3, origin_z + CHUNK_SIZE)
+                
+                canopy = chunk.blocks[x0 - origin_x:x1 - origin_x, bottom:top, z0 - origin_z:z1 - origin_z]
+                empty = canopy == BlockType.AIR
+                canopy[empty] = BlockType.LEAVES
+                chunk.dirty = True
+                leaves = [(x0 + dx, bottom + dy, z0 + dz) for dx, dy, dz in np.argwhere(empty).tolist()]
+                chunk.surface.update(leaves)
+                chunk.render_cache = None
+                self.edible.add_many(leaves)
+                touched.append(chunk)
         
-        height = (height + 1.5) / 3.0
-        height = 4 + height * 8
-        return min(height, WORLD_HEIGHT - 1)
+        return touched
+    
+    def get_terrain_height(self, x: int, z: int) -> float:
+        """Generate height at coordinates"""
+        return terrain_height(x, z)
     
     def get_block_type(self, x: int, y: int, z: int, height: float) -> int:
         """Determine block type at coordinates"""
-        if y > height:
-            return BlockType.AIR
-        
-        if y < 0:
-            return BlockType.STONE
-        
-        surface_y = int(height)
-        
-        if y == surface_y:
-            if surface_y < 4:
-                return BlockType.SAND
-            return BlockType.GRASS
-        
-        if y > surface_y - 3:
-            if surface_y < 4:
-                return BlockType.SAND
-            return BlockType.DIRT
-        
-        return BlockType.STONE
+        return block_type(y, height)
+    
+    def get_terrain_heights(self, xs: np.ndarray, zs: np.ndarray) -> np.ndarray:
+        """Heights for the grid xs x zs, same values as get_terrain_height"""
+        return terrain_heights(xs, zs)
+    
+    def get_block_types(self, surface: np.ndarray) -> np.ndarray:
+        """Block layering for columns with the given surface y, same rules as get_block_type"""
+        return block_layers(surface)
+    
+    def _loaded_chunk(self, x: int, z: int) -> Chunk:
+        """Chunk containing column (x, z), generating it if needed"""
+        chunk = self.chunks.get(x // CHUNK_SIZE, z // CHUNK_SIZE)
+        if chunk is None or not chunk.generated:
+            self.generate_chunk((x // CHUNK_SIZE) * CHUNK_SIZE, (z // CHUNK_SIZE) * CHUNK_SIZE)
+            chunk = self.chunks.get(x // CHUNK_SIZE, z // CHUNK_SIZE)
+        chunk.last_access = self.clock
+        return chunk
     
     def get_block_at(self, x: int, y: int, z: int) -> int:
         """Get block type at coordinates"""
         if y < 0 or y >= WORLD_HEIGHT:
             return BlockType.AIR
         
-        chunk_x = (x // CHUNK_SIZE) * CHUNK_SIZE
-        chunk_z = (z // CHUNK_SIZE) * CHUNK_SIZE
-        self.generate_chunk(chunk_x, chunk_z)
-        
-        key = (x, y, z)
-        return self.blocks.get(key, BlockType.AIR)
+        return self._loaded_chunk(x, z).blocks.item(x % CHUNK_SIZE, y, z % CHUNK_SIZE)
+    
+    def get_surface_height(self, x: int, z: int) -> int:
+        """Y of the highest solid (non-air, non-water) block in the column, -1 if none"""
+        return self._loaded_chunk(x, z).top_solid.item(x % CHUNK_SIZE, z % CHUNK_SIZE)
+    
+    def get_water_level(self, x: int, z: int) -> int:
+        """Y of the highest water block in the column, -1 if none"""
+        return self._loaded_chunk(x, z).top_water.item(x % CHUNK_SIZE, z % CHUNK_SIZE)
     
     def set_block_at(self, x: int, y: int, z: int, block_type: int):
         """Set block type at coordinates"""
-        if 0 <= y < WORLD_HEIGHT:
-            self.blocks[(x, y, z)] = block_type
-            if block_type != BlockType.AIR:
-                self.surface_blocks.add((x, y, z))
+        if y < 0 or y >= WORLD_HEIGHT:
+            return
+        
+        chunk = self.chunks.get_or_create(x // CHUNK_SIZE, z // CHUNK_SIZE)
+        lx, lz = x % CHUNK_SIZE, z % CHUNK_SIZE
+        old_type = chunk.blocks.item(lx, y, lz)
+        chunk.set_block(lx, y, lz, block_type)
+        self.edible.update(x, y, z, old_type, block_type)
+        if block_type != BlockType.AIR:
+            chunk.surface.add((x, y, z))
+        chunk.render_cache = None
     
     def update(self):
-        """Update planet state"""
-        keys_to_update = []
-        for (x, y, z), block_type in list(self.blocks.items())[:30]:
-            if block_type == BlockType.DIRT and random.random() < 0.05:
-                if y == int(self.get_terrain_height(x, z)):
-                    keys_to_update.append(((x, y, z), BlockType.GRASS))
+        """Update planet state - each generated chunk may regrow grass on one exposed dirt column
         
-        for key, block_type in keys_to_update:
-            self.blocks[key] = block_type
+        The chance is per chunk, so a column regrows at the same rate however
+        large the world has grown.
+        """
+        for chunk in sorted((chunk for chunk in self.chunks if chunk.generated), key=lambda chunk: chunk.key):
+            if random.random() >= GRASS_REGROWTH_CHANCE:
+                continue
+            lx, lz = random.randrange(CHUNK_SIZE), random.randrange(CHUNK_SIZE)
+            y = chunk.top_solid.item(lx, lz)
+            if y >= 0 and chunk.blocks.item(lx, y, lz) == BlockType.DIRT:
+                origin_x, origin_z = chunk.origin
+                self.set_block_at(origin_x + lx, y, origin_z + lz, BlockType.GRASS)
     
     def get_visible_blocks(self, camera_pos: Vector3) -> List[Tuple]:
-        """Get only surface blocks within render distance"""
+        """Get surface blocks of chunks within render distance"""
         visible = []
-        for (x, y, z) in self.surface_blocks:
-            block_pos = Vector3(x, y, z)
-            distance = camera_pos.distance_to(block_pos)
-            if distance < RENDER_DISTANCE:
-                visible.append((x, y, z, self.blocks[(x, y, z)]))
+        limit_sq = RENDER_DISTANCE * RENDER_DISTANCE
+        half = CHUNK_SIZE / 2
+        dy = WORLD_HEIGHT / 2 - camera_pos.y
+        
+        # One distance test per chunk, measured to the chunk centre
+        for chunk in self.chunks:
+            if not chunk.surface:
+                continue
+            origin_x, origin_z = chunk.origin
+            dx = origin_x + half - camera_pos.x
+            dz = origin_z + half - camera_pos.z
+            if dx * dx + dy * dy + dz * dz < limit_sq:
+                chunk.last_access = self.clock
+                visible.extend(chunk.get_render_list())
         return visible
     
-    def get_nearby_blocks(self, pos: Vector3, radius: float) -> List[Tuple]:
-        """Get blocks near a position - for animal pathfinding"""
-        nearby = []
-        for (x, y, z), block_type in list(self.blocks.items())[:100]:
-            block_pos = Vector3(x, y, z)
-            if block_pos.distance_to(pos) < radius:
-                nearby.append(((x, y, z), block_type))
-        return nearby
+    def find_nearest_edible(self, pos: Vector3, radius: float) -> Optional[Vector3]:
+        """Closest grass/leaves block within radius, cost scales with local food density"""
+        block = self.edible.find_nearest(pos, radius)
+        if block is None:
+            return None
+        return Vector3(*block)
@@ -0,0 +1,51 @@
+"""Animal pool - dead animals reinitialised in place for new births"""
+
+from typing import Iterable, List, Optional
+from ..utils.vectors import Vector3
+from ..utils.constants import ANIMAL_POOL_LIMIT
+from .animal import Animal
+from .genetics import Genetics
+
+class AnimalPool:
+    """Free list of animals that have left the simulation
+
+    Ecosystem.update releases what EntityRegistry.compact drops at the end of a
+    tick, so nothing still refers to them; births then reuse the Animal, its
+    position and home_range vectors and its Genetics instead of allocating.
+    """
+
+    def __init__(self, limit: int = ANIMAL_POOL_LIMIT):
+        self.limit = limit
+        self.free: List[Animal] = []
+        self.reused = 0
+        self.allocated = 0
+
+    def __len__(self) -> int:
+        return len(self.free)
+
+    def release(self, animals: Iterable[Animal]):
+        """Keep dead animals for reuse, up to limit"""
+        free = self.free
+        for animal in animals:
+            if len(free) >= self.limit:
+                break
+            if animal._store is None:  # still in a PopulationStore means it was not really removed
+                animal.pack = None
+                animal.disease = None
+                animal.target_pos = None
+                free.append(animal)
+
+    def acquire(self, animal_type: str, x: float, y: float, z: float, parent: Optional[Animal] = None,
+                traits: Optional[tuple] = None) -> Animal:
+        """A newborn at (x, y, z), with traits from GenePool.offspring or else drawn from parent"""
+        if self.free:
+            animal = self.free.pop()
+            self.reused += 1
+            genetics = animal.genetics.assign(*traits) if traits is not None else None
+            animal.position.set(x, y, z)
+            animal.home_range.set(x, y, z)
+            animal.reset(animal_type, parent, genetics)
+            return animal
+        self.allocated += 1
+        genetics = Genetics.from_traits(*traits) if traits is not None else None
+        return Animal(animal_type, Vector3(x, y, z), parent, genetics)
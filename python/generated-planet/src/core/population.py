@@ -0,0 +1,169 @@
+"""Population store - animal state in NumPy columns for whole-population bookkeeping"""
+
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+import numpy as np
+from .genetics import GenePool
+from ..utils.constants import ANIMAL_CONFIGS, ANIMAL_MAX_AGE
+
+if TYPE_CHECKING:
+    from .animal import Animal
+
+SPECIES = list(ANIMAL_CONFIGS)
+SPECIES_IDS = {name: i for i, name in enumerate(SPECIES)}
+
+# Scalar columns an Animal reads through StoreColumn while it belongs to a store
+COLUMNS = {
+    "energy": np.float64,
+    "max_energy": np.float64,
+    "age": np.int64,
+    "speed": np.float64,
+    "breeding_cooldown": np.int64,
+    "is_breeding": np.bool_,
+    "heading_x": np.float64,  # flocking direction, see engine/flocking.py
+    "heading_z": np.float64,
+}
+
+class StoreColumn:
+    """Animal attribute backed by a PopulationStore row, or the "_<name>" slot when detached"""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __set_name__(self, owner, attr):
+        self.local = owner.__dict__["_" + self.name]  # slot descriptor for the detached value
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        store = obj._store
+        if store is None:
+            return self.local.__get__(obj, owner)
+        return store.columns[self.name].item(obj._row)
+
+    def __set__(self, obj, value):
+        store = obj._store
+        if store is None:
+            self.local.__set__(obj, value)
+        else:
+            store.columns[self.name][obj._row] = value
+
+class PopulationStore:
+    """Rows of animal state; row i belongs to animals[i]
+
+    Removal swaps the last row into the hole, so rows stay dense and every
+    per-tick update is a single array operation over [:count].
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self.count = 0
+        self.animals: List['Animal'] = []
+        self.columns: Dict[str, np.ndarray] = {name: np.zeros(capacity, dtype=dtype)
+                                               for name, dtype in COLUMNS.items()}
+        self.species = np.zeros(capacity, dtype=np.int16)
+        self.positions = np.zeros((capacity, 3))  # mirrored from Animal.position by sync_positions
+        self.genes = GenePool(capacity)  # copies of Animal.genetics, taken when the animal is added
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, animal: 'Animal') -> bool:
+        return animal._store is self
+
+    def _grow(self):
+        self.capacity *= 2
+        for name, column in self.columns.items():
+            grown = np.zeros(self.capacity, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            self.columns[name] = grown
+        species = np.zeros(self.capacity, dtype=np.int16)
+        species[:self.count] = self.species[:self.count]
+        self.species = species
+        positions = np.zeros((self.capacity, 3))
+        positions[:self.count] = self.positions[:self.count]
+        self.positions = positions
+        self.genes.grow(self.capacity)
+
+    def add(self, animal: 'Animal'):
+        """Move an animal's state into a new row"""
+        if animal._store is not None:
+            return
+        if self.count == self.capacity:
+            self._grow()
+
+        row = self.count
+        for name, column in self.columns.items():
+            column[row] = getattr(animal, name)
+        self.species[row] = SPECIES_IDS[animal.animal_type]
+        pos = animal.position
+        self.positions[row] = (pos.x, pos.y, pos.z)
+        self.genes.append(animal.genetics)
+        animal._store = self
+        animal._row = row
+        self.animals.append(animal)
+        self.count += 1
+
+    def remove(self, animal: 'Animal'):
+        """Hand an animal its state back and fill its row from the end"""
+        if animal._store is not self:
+            return
+
+        row = animal._row
+        animal._store = None
+        for name, column in self.columns.items():
+            setattr(animal, name, column.item(row))
+
+        last = self.count - 1
+        if row != last:
+            for column in self.columns.values():
+                column[row] = column[last]
+            self.species[row] = self.species[last]
+            self.positions[row] = self.positions[last]
+            moved = self.animals[last]
+            moved._row = row
+            self.animals[row] = moved
+        self.genes.remove(row)
+        self.animals.pop()
+        self.count = last
+
+    def sync_positions(self):
+        """Copy every animal's position into the positions column"""
+        if self.count:
+            self.positions[:self.count] = [(a.position.x, a.position.y, a.position.z)
+                                           for a in self.animals]
+
+    def tick(self, energy_drain: float):
+        """Ageing, movement energy cost and breeding cooldown for every row"""
+        n = self.count
+        columns = self.columns
+        columns["age"][:n] += 1
+        columns["energy"][:n] -= columns["speed"][:n] * energy_drain
+        np.maximum(columns["breeding_cooldown"][:n] - 1, 0, out=columns["breeding_cooldown"][:n])
+
+    def alive_mask(self) -> np.ndarray:
+        """Same test as Animal.is_alive, for every row"""
+        n = self.count
+        return (self.columns["energy"][:n] > 0) & (self.columns["age"][:n] < ANIMAL_MAX_AGE)
+
+    def cull(self) -> List['Animal']:
+        """Remove and return animals that are no longer alive"""
+        dead_rows = np.flatnonzero(~self.alive_mask())
+        dead = [self.animals[row] for row in dead_rows]
+        for animal in dead:
+            self.remove(animal)
+        return dead
+
+    def species_mask(self, animal_type: str) -> np.ndarray:
+        return self.species[:self.count] == SPECIES_IDS[animal_type]
+
+    def trait_stats(self, animal_type: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """GenePool.stats over every row, or one species"""
+        return self.genes.stats(None if animal_type is None else self.species_mask(animal_type))
+
+    def trait_histogram(self, trait: str, bins: int = 10,
+                        animal_type: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        return self.genes.histogram(trait, bins, None if animal_type is None else self.species_mask(animal_type))
+
+    def species_counts(self) -> Dict[str, int]:
+        counts = np.bincount(self.species[:self.count], minlength=len(SPECIES))
+        return {SPECIES[i]: int(c) for i, c in enumerate(counts) if c}
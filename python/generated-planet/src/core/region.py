@@ -0,0 +1,188 @@
+"""Region files - chunks paged to disk in fixed-slot, memory-mapped files"""
+
+import os
+import shutil
+import struct
+import tempfile
+from collections import OrderedDict
+from typing import Iterator, Optional, Tuple
+import numpy as np
+from ..utils.constants import CHUNK_SIZE, WORLD_HEIGHT, REGION_SIZE
+from .terrain import ChunkData, chunk_data_from_blocks
+
+REGION_MAGIC = b"PRGN"
+REGION_FORMAT_VERSION = 1
+MAX_OPEN_REGIONS = 16
+
+# Slot states in the region presence table
+SLOT_EMPTY = 0
+SLOT_GENERATED = 1
+SLOT_PARTIAL = 2  # only blocks spilled in from neighbouring trees
+
+_HEADER = struct.Struct("<4sHHI")  # magic, format version, region size, packed chunk bytes
+_CHUNK_CELLS = CHUNK_SIZE * WORLD_HEIGHT * CHUNK_SIZE
+_PACKED_BYTES = _CHUNK_CELLS // 2  # two 4-bit block types per byte
+_REGION_CHUNKS = REGION_SIZE * REGION_SIZE
+
+def pack_blocks(blocks: np.ndarray) -> np.ndarray:
+    """Pack a chunk's uint8 block types (all < 16) into nibbles"""
+    flat = blocks.reshape(-1)
+    return (flat[0::2] << 4) | flat[1::2]
+
+def unpack_blocks(packed: np.ndarray) -> np.ndarray:
+    """Inverse of pack_blocks"""
+    flat = np.empty(_CHUNK_CELLS, dtype=np.uint8)
+    flat[0::2] = packed >> 4
+    flat[1::2] = packed & 0x0F
+    return flat.reshape((CHUNK_SIZE, WORLD_HEIGHT, CHUNK_SIZE))
+
+class RegionFile:
+    """One REGION_SIZE x REGION_SIZE block of chunk slots, memory mapped"""
+
+    def __init__(self, path: str):
+        self.path = path
+        size = _HEADER.size + _REGION_CHUNKS + _REGION_CHUNKS * _PACKED_BYTES
+        if not os.path.exists(path):
+            # Written aside and renamed, so another process never maps a half-created file
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(REGION_MAGIC, REGION_FORMAT_VERSION, REGION_SIZE, _PACKED_BYTES))
+                f.truncate(size)
+            os.replace(temp_path, path)
+        else:
+            with open(path, "rb") as f:
+                magic, version, region_size, packed_bytes = _HEADER.unpack(f.read(_HEADER.size))
+            if (magic, version, region_size, packed_bytes) != (REGION_MAGIC, REGION_FORMAT_VERSION,
+                                                                REGION_SIZE, _PACKED_BYTES):
+                raise ValueError(f"Incompatible region file: {path}")
+
+        self.map = np.memmap(path, dtype=np.uint8, mode="r+", shape=(size,))
+        self.presence = self.map[_HEADER.size:_HEADER.size + _REGION_CHUNKS]
+        self.slots = self.map[_HEADER.size + _REGION_CHUNKS:].reshape(_REGION_CHUNKS, _PACKED_BYTES)
+
+    def state(self, slot: int) -> int:
+        return int(self.presence[slot])
+
+    def read(self, slot: int) -> np.ndarray:
+        return unpack_blocks(self.slots[slot])
+
+    def write(self, slot: int, blocks: np.ndarray, state: int):
+        self.slots[slot] = pack_blocks(blocks)
+        self.presence[slot] = state
+
+    def close(self):
+        self.map.flush()
+        del self.presence, self.slots, self.map
+
+class RegionStore:
+    """Region files in one directory, opened on first use and kept mapped up to MAX_OPEN_REGIONS
+
+    A temporary store deletes its directory when closed.
+    """
+
+    def __init__(self, directory: str, temporary: bool = False):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.temporary = temporary
+        self.open_regions: "OrderedDict[Tuple[int, int], RegionFile]" = OrderedDict()
+
+    @staticmethod
+    def _locate(chunk_x: int, chunk_z: int) -> Tuple[Tuple[int, int], int]:
+        region = (chunk_x // REGION_SIZE, chunk_z // REGION_SIZE)
+        slot = (chunk_x % REGION_SIZE) * REGION_SIZE + (chunk_z % REGION_SIZE)
+        return region, slot
+
+    def _region(self, key: Tuple[int, int], create: bool) -> Optional[RegionFile]:
+        region = self.open_regions.get(key)
+        if region is not None:
+            self.open_regions.move_to_end(key)
+            return region
+
+        path = os.path.join(self.directory, f"r.{key[0]}.{key[1]}.bin")
+        if not create and not os.path.exists(path):
+            return None
+        region = RegionFile(path)
+        self.open_regions[key] = region
+        if len(self.open_regions) > MAX_OPEN_REGIONS:
+            _, oldest = self.open_regions.popitem(last=False)
+            oldest.close()
+        return region
+
+    def contains(self, chunk_x: int, chunk_z: int) -> bool:
+        key, slot = self._locate(chunk_x, chunk_z)
+        region = self._region(key, create=False)
+        return region is not None and region.state(slot) != SLOT_EMPTY
+
+    def load(self, chunk_x: int, chunk_z: int) -> Tuple[int, Optional[np.ndarray]]:
+        """(slot state, blocks) for a chunk, (SLOT_EMPTY, None) if it was never saved"""
+        key, slot = self._locate(chunk_x, chunk_z)
+        region = self._region(key, create=False)
+        if region is None:
+            return SLOT_EMPTY, None
+        state = region.state(slot)
+        if state == SLOT_EMPTY:
+            return SLOT_EMPTY, None
+        return state, region.read(slot)
+
+    def save(self, chunk_x: int, chunk_z: int, blocks: np.ndarray, generated: bool):
+        key, slot = self._locate(chunk_x, chunk_z)
+        self._region(key, create=True).write(slot, blocks, SLOT_GENERATED if generated else SLOT_PARTIAL)
+
+    def saved_chunks(self) -> Iterator[Tuple[int, int, int, np.ndarray]]:
+        """(chunk_x, chunk_z, slot state, packed blocks copy) for every chunk on disk"""
+        for name in sorted(os.listdir(self.directory)):
+            parts = name.split(".")
+            if len(parts) != 4 or parts[0] != "r" or parts[3] != "bin":
+                continue
+            key = (int(parts[1]), int(parts[2]))
+            region = self._region(key, create=False)
+            for slot in np.flatnonzero(region.presence).tolist():
+                chunk_x = key[0] * REGION_SIZE + slot // REGION_SIZE
+                chunk_z = key[1] * REGION_SIZE + slot % REGION_SIZE
+                yield chunk_x, chunk_z, region.state(slot), region.slots[slot].copy()
+    
+    def close(self):
+        """Unmap the region files, and delete them if the store is temporary"""
+        for region in self.open_regions.values():
+            region.close()
+        self.open_regions.clear()
+        if self.temporary:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    @classmethod
+    def for_run(cls, root: str, seed: int) -> 'RegionStore':
+        """Temporary store for one run's chunks, in a new directory under root"""
+        os.makedirs(root, exist_ok=True)
+        return cls(tempfile.mkdtemp(prefix=f"run-seed{seed}-", dir=root), temporary=True)
+
+class TerrainCache:
+    """Generated terrain shared by every run of one seed and generator version, under root/seed{seed}-gen{version}
+
+    It holds generate_chunk_data output only - never gameplay edits or leaves
+    spilled in from neighbouring trees, which a run pages to its own
+    RegionStore - so a chunk read back is exactly the chunk the generator would
+    make. Trees are drawn again from the chunk's RNG rather than stored.
+    """
+
+    def __init__(self, root: str, seed: int, generator_version: int):
+        self.seed = seed
+        self.regions = RegionStore(os.path.join(root, f"seed{seed}-gen{generator_version}"))
+        self.hits = 0  # chunks read instead of generated
+
+    def __contains__(self, key: Tuple[int, int]) -> bool:
+        return self.regions.contains(*key)
+
+    def load(self, chunk_x: int, chunk_z: int) -> Optional[ChunkData]:
+        """Cached terrain of a chunk, None if no run has generated it yet"""
+        _, blocks = self.regions.load(chunk_x, chunk_z)
+        if blocks is None:
+            return None
+        self.hits += 1
+        return chunk_data_from_blocks(self.seed, chunk_x, chunk_z, blocks)
+
+    def save(self, data: ChunkData):
+        """Keep freshly generated terrain for later runs"""
+        self.regions.save(data.chunk_x, data.chunk_z, data.blocks, True)
+
+    def close(self):
+        self.regions.close()
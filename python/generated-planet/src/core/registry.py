@@ -0,0 +1,92 @@
+"""Entity registry - stable ids, tombstoned removal and once-per-tick kill resolution"""
+
+from typing import Dict, List, Optional, Set, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .animal import Animal
+
+class EntityRegistry:
+    """Owns the animal list; removals are tombstones until compact() at the end of a tick
+
+    entities is only ever rebuilt in place, so callers may hold a reference to
+    it, and it is never shortened while a tick is iterating over it.
+    """
+
+    def __init__(self):
+        self.entities: List['Animal'] = []
+        self.by_id: Dict[int, 'Animal'] = {}
+        self.tombstones: Set[int] = set()
+        self.kill_claims: Dict[int, 'Animal'] = {}  # prey id -> predator, first claim wins
+        self.next_id = 0
+
+    def __len__(self) -> int:
+        return len(self.entities) - len(self.tombstones)
+
+    def add(self, animal: 'Animal', entity_id: Optional[int] = None) -> int:
+        """Register an animal under a new id, or under a previously issued one when restoring"""
+        if entity_id is None:
+            entity_id = self.next_id
+        self.next_id = max(self.next_id, entity_id + 1)
+        animal.entity_id = entity_id
+        self.by_id[entity_id] = animal
+        self.entities.append(animal)
+        return entity_id
+
+    def get(self, entity_id: int) -> Optional['Animal']:
+        return self.by_id.get(entity_id)
+
+    def is_live(self, animal: 'Animal') -> bool:
+        return animal.entity_id in self.by_id and animal.entity_id not in self.tombstones
+
+    def remove(self, animal: 'Animal') -> bool:
+        """Tombstone an animal, False if it was already removed"""
+        entity_id = animal.entity_id
+        if entity_id not in self.by_id or entity_id in self.tombstones:
+            return False
+        self.tombstones.add(entity_id)
+        return True
+
+    def live(self) -> List['Animal']:
+        """Entities without a tombstone - the entities list itself when nothing was removed"""
+        if not self.tombstones:
+            return self.entities
+        tombstones = self.tombstones
+        return [a for a in self.entities if a.entity_id not in tombstones]
+
+    def claim_kill(self, predator: 'Animal', prey: 'Animal') -> bool:
+        """Ask to eat prey this tick, False if it is gone or already claimed"""
+        if prey.entity_id in self.kill_claims or not self.is_live(prey):
+            return False
+        self.kill_claims[prey.entity_id] = predator
+        return True
+
+    def is_claimed(self, prey: 'Animal') -> bool:
+        return prey.entity_id in self.kill_claims
+
+    def resolve_kills(self) -> List['Animal']:
+        """Feed each claiming predator and tombstone its prey, returns the prey"""
+        eaten = []
+        for prey_id, predator in self.kill_claims.items():
+            prey = self.by_id[prey_id]
+            if self.remove(prey):
+                predator.energy += prey.max_energy
+                eaten.append(prey)
+        self.kill_claims.clear()
+        return eaten
+
+    def compact(self) -> List['Animal']:
+        """Drop tombstoned entities in one pass, returns them"""
+        if not self.tombstones:
+            return []
+        tombstones = self.tombstones
+        removed = []
+        kept = []
+        for animal in self.entities:
+            if animal.entity_id in tombstones:
+                removed.append(animal)
+                del self.by_id[animal.entity_id]
+            else:
+                kept.append(animal)
+        self.entities[:] = kept
+        tombstones.clear()
+        return removed
@@ -0,0 +1,122 @@
+"""Spatial hash - uniform grid over animal positions for neighbour queries"""
+
+import math
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+from ..utils.vectors import Vector3
+from ..utils.grid import ring_cells
+from ..utils.constants import ANIMAL_GRID_CELL_SIZE, ANIMAL_GRID_SLACK
+
+if TYPE_CHECKING:
+    from .animal import Animal
+
+class SpatialHash:
+    """Animals bucketed by species, then by (x, z) cell
+
+    Rebuilt once per tick. Animals keep moving after the rebuild, so queries
+    widen their cell range by slack - the most an animal can move in between.
+    """
+
+    def __init__(self, cell_size: float = ANIMAL_GRID_CELL_SIZE, slack: float = ANIMAL_GRID_SLACK):
+        self.cell_size = cell_size
+        self.slack = slack
+        self.buckets: Dict[str, Dict[Tuple[int, int], List['Animal']]] = {}
+        self.cell_of: Dict['Animal', Tuple[str, Tuple[int, int]]] = {}
+
+    def cell_key(self, pos: Vector3) -> Tuple[int, int]:
+        return (math.floor(pos.x / self.cell_size), math.floor(pos.z / self.cell_size))
+
+    def rebuild(self, animals: Iterable['Animal']):
+        """Re-bucket every animal at its current position"""
+        self.buckets.clear()
+        self.cell_of.clear()
+        for animal in animals:
+            self.insert(animal)
+
+    def insert(self, animal: 'Animal'):
+        key = self.cell_key(animal.position)
+        cells = self.buckets.get(animal.animal_type)
+        if cells is None:
+            cells = self.buckets[animal.animal_type] = {}
+        cell = cells.get(key)
+        if cell is None:
+            cell = cells[key] = []
+        cell.append(animal)
+        self.cell_of[animal] = (animal.animal_type, key)
+
+    def remove(self, animal: 'Animal'):
+        """Drop an animal (e.g. eaten mid-tick) so later queries skip it"""
+        entry = self.cell_of.pop(animal, None)
+        if entry is None:
+            return
+        species, key = entry
+        cell = self.buckets[species][key]
+        cell.remove(animal)
+        if not cell:
+            del self.buckets[species][key]
+
+    def _species_cells(self, species: Optional[Iterable[str]]) -> List[Dict[Tuple[int, int], List['Animal']]]:
+        if species is None:
+            return list(self.buckets.values())
+        return [self.buckets[s] for s in species if s in self.buckets]
+
+    def query_radius(self, pos: Vector3, radius: float, species: Optional[Iterable[str]] = None) -> List['Animal']:
+        """Animals strictly within radius of pos, optionally only the given species"""
+        tables = self._species_cells(species)
+        if not tables:
+            return []
+
+        reach = radius + self.slack
+        min_x = math.floor((pos.x - reach) / self.cell_size)
+        max_x = math.floor((pos.x + reach) / self.cell_size)
+        min_z = math.floor((pos.z - reach) / self.cell_size)
+        max_z = math.floor((pos.z + reach) / self.cell_size)
+        radius_sq = radius * radius
+
+        found = []
+        for cells in tables:
+            for cx in range(min_x, max_x + 1):
+                for cz in range(min_z, max_z + 1):
+                    cell = cells.get((cx, cz))
+                    if not cell:
+                        continue
+                    for other in cell:
+                        o = other.position
+                        dx, dy, dz = o.x - pos.x, o.y - pos.y, o.z - pos.z
+                        if dx * dx + dy * dy + dz * dz < radius_sq:
+                            found.append(other)
+        return found
+
+    def nearest(self, pos: Vector3, radius: float, species: Optional[Iterable[str]] = None,
+                exclude: Optional['Animal'] = None) -> Optional['Animal']:
+        """Closest animal strictly within radius, searching cells ring by ring"""
+        tables = self._species_cells(species)
+        if not tables:
+            return None
+
+        size = self.cell_size
+        home_x, home_z = self.cell_key(pos)
+        best = None
+        best_dist_sq = radius * radius
+
+        for ring in range(int((radius + self.slack) // size) + 2):
+            # Every cell in this ring is at least (ring - 1) cells away, less the slack
+            bound = (ring - 1) * size - self.slack
+            if bound > 0 and bound * bound >= best_dist_sq:
+                break
+
+            for key in ring_cells(home_x, home_z, ring):
+                for cells in tables:
+                    cell = cells.get(key)
+                    if not cell:
+                        continue
+                    for other in cell:
+                        if other is exclude:
+                            continue
+                        o = other.position
+                        dx, dy, dz = o.x - pos.x, o.y - pos.y, o.z - pos.z
+                        dist_sq = dx * dx + dy * dy + dz * dz
+                        if dist_sq < best_dist_sq:
+                            best_dist_sq = dist_sq
+                            best = other
+
+        return best
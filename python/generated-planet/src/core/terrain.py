@@ -0,0 +1,138 @@
+"""Terrain generation - pure per-chunk functions, safe to run in worker threads or processes"""
+
+import math
+import random
+from typing import List, Tuple
+import numpy as np
+from ..utils.constants import BlockType, WORLD_HEIGHT, CHUNK_SIZE
+
+# Bump whenever generation output changes, so region caches of older terrain are not reused
+GENERATOR_VERSION = 1
+TREE_CHANCE = 0.08
+
+def terrain_height(x: int, z: int) -> float:
+    """Generate height at coordinates"""
+    height = 0
+    scale = 1.0
+    amplitude = 1.0
+
+    for octave in range(3):
+        frequency = scale * 0.05
+        value = math.sin(x * frequency) * math.cos(z * frequency)
+        height += value * amplitude
+        scale *= 2
+        amplitude *= 0.5
+
+    height = (height + 1.5) / 3.0
+    height = 4 + height * 8
+    return min(height, WORLD_HEIGHT - 1)
+
+def block_type(y: int, height: float) -> int:
+    """Determine block type at height y of a column"""
+    if y > height:
+        return BlockType.AIR
+
+    if y < 0:
+        return BlockType.STONE
+
+    surface_y = int(height)
+
+    if y == surface_y:
+        if surface_y < 4:
+            return BlockType.SAND
+        return BlockType.GRASS
+
+    if y > surface_y - 3:
+        if surface_y < 4:
+            return BlockType.SAND
+        return BlockType.DIRT
+
+    return BlockType.STONE
+
+def terrain_heights(xs: np.ndarray, zs: np.ndarray) -> np.ndarray:
+    """Heights for the grid xs x zs, same values as terrain_height"""
+    xs = np.asarray(xs, dtype=np.float64)[:, None]
+    zs = np.asarray(zs, dtype=np.float64)[None, :]
+    height = np.zeros((xs.shape[0], zs.shape[1]))
+    scale = 1.0
+    amplitude = 1.0
+
+    for octave in range(3):
+        frequency = scale * 0.05
+        height += np.sin(xs * frequency) * np.cos(zs * frequency) * amplitude
+        scale *= 2
+        amplitude *= 0.5
+
+    height = (height + 1.5) / 3.0
+    height = 4 + height * 8
+    return np.minimum(height, WORLD_HEIGHT - 1)
+
+def block_layers(surface: np.ndarray) -> np.ndarray:
+    """Block layering for columns with the given surface y, same rules as block_type"""
+    surface_y = surface[:, None, :]
+    y = np.arange(WORLD_HEIGHT)[None, :, None]
+    sandy = surface_y < 4
+
+    top = np.where(sandy, BlockType.SAND, BlockType.GRASS)
+    shallow = np.where(sandy, BlockType.SAND, BlockType.DIRT)
+    blocks = np.where(y == surface_y, top,
+                      np.where(y > surface_y - 3, shallow, BlockType.STONE))
+    blocks[np.broadcast_to(y > surface_y, blocks.shape)] = BlockType.AIR
+    return blocks.astype(np.uint8)
+
+def chunk_rng(seed: int, chunk_x: int, chunk_z: int) -> random.Random:
+    """RNG for one chunk - depends only on seed and chunk coordinate, never on generation order"""
+    return random.Random(f"{seed}:{chunk_x}:{chunk_z}")
+
+class ChunkData:
+    """Result of generating one chunk, applied to the Planet on the main thread"""
+
+    def __init__(self, chunk_x: int, chunk_z: int, blocks: np.ndarray,
+                 surface: List[List[int]], trees: List[Tuple[int, int, int, int]]):
+        self.chunk_x = chunk_x
+        self.chunk_z = chunk_z
+        self.blocks = blocks      # terrain only, AIR above the surface
+        self.surface = surface    # surface y per local column
+        self.trees = trees        # (x, y, z, height) in placement order
+
+def generate_chunk_data(seed: int, chunk_x: int, chunk_z: int, vectorized: bool = True) -> ChunkData:
+    """Generate terrain and tree placements for chunk coordinate (chunk_x, chunk_z)"""
+    origin_x, origin_z = chunk_x * CHUNK_SIZE, chunk_z * CHUNK_SIZE
+
+    if vectorized:
+        xs = np.arange(origin_x, origin_x + CHUNK_SIZE)
+        zs = np.arange(origin_z, origin_z + CHUNK_SIZE)
+        surface_y = terrain_heights(xs, zs).astype(np.int64)
+        blocks = block_layers(surface_y)
+        surface = surface_y.tolist()
+    else:
+        blocks = np.zeros((CHUNK_SIZE, WORLD_HEIGHT, CHUNK_SIZE), dtype=np.uint8)
+        surface = []
+        for x in range(origin_x, origin_x + CHUNK_SIZE):
+            row = []
+            for z in range(origin_z, origin_z + CHUNK_SIZE):
+                height = terrain_height(x, z)
+                for y in range(0, int(height) + 1):
+                    blocks[x - origin_x, y, z - origin_z] = block_type(y, height)
+                row.append(int(height))
+            surface.append(row)
+
+    return ChunkData(chunk_x, chunk_z, blocks, surface, chunk_trees(seed, chunk_x, chunk_z, surface))
+
+def chunk_trees(seed: int, chunk_x: int, chunk_z: int, surface: List[List[int]]) -> List[Tuple[int, int, int, int]]:
+    """Trees on grass, drawn in column order from the chunk's own RNG"""
+    origin_x, origin_z = chunk_x * CHUNK_SIZE, chunk_z * CHUNK_SIZE
+    rng = chunk_rng(seed, chunk_x, chunk_z)
+    trees = []
+    for lx in range(CHUNK_SIZE):
+        for lz in range(CHUNK_SIZE):
+            column_y = surface[lx][lz]
+            if column_y > 3 and rng.random() < TREE_CHANCE:
+                trees.append((origin_x + lx, column_y + 1, origin_z + lz, rng.randint(3, 5)))
+    return trees
+
+def chunk_data_from_blocks(seed: int, chunk_x: int, chunk_z: int, blocks: np.ndarray) -> ChunkData:
+    """Rebuild the ChunkData of terrain blocks saved from generate_chunk_data"""
+    solid = blocks != BlockType.AIR
+    surface = (WORLD_HEIGHT - 1 - np.argmax(solid[:, ::-1, :], axis=1)).tolist()
+    return ChunkData(chunk_x, chunk_z, blocks, surface, chunk_trees(seed, chunk_x, chunk_z, surface))
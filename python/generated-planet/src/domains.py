@@ -0,0 +1,228 @@
+"""Domain decomposition - the world split into rectangles of chunks, one worker process each"""
+
+import argparse
+import math
+import random
+import time
+from multiprocessing import Pipe, Process
+from typing import Dict, List, Optional, Tuple
+from .core.animal import Animal
+from .core.ecosystem import Ecosystem, spawn_initial_animals
+from .engine.behaviors import BehaviorEngine, ReproductionEngine
+from .utils.vectors import Vector3
+from .utils.constants import CHUNK_SIZE, DOMAIN_CHUNKS, DOMAIN_HALO, USE_POPULATION_STORE
+
+# (animal, (disease name, severity, timer) or None)
+Migrant = Tuple[Animal, Optional[Tuple[str, float, int]]]
+# (animal_type, x, y, z)
+GhostState = Tuple[str, float, float, float]
+
+class DomainLayout:
+    """domains_x x domains_z rectangles of chunks_per_domain chunks, centred on the origin
+
+    The outer rows and columns extend to infinity, so every position has an owner.
+    """
+
+    def __init__(self, domains_x: int, domains_z: int, chunks_per_domain: int = DOMAIN_CHUNKS):
+        self.domains_x = domains_x
+        self.domains_z = domains_z
+        self.size = chunks_per_domain * CHUNK_SIZE  # blocks per domain side, always whole chunks
+        self.origin_x = -(domains_x * chunks_per_domain // 2) * CHUNK_SIZE
+        self.origin_z = -(domains_z * chunks_per_domain // 2) * CHUNK_SIZE
+
+    @property
+    def count(self) -> int:
+        return self.domains_x * self.domains_z
+
+    def _column(self, x: float) -> int:
+        return min(self.domains_x - 1, max(0, math.floor((x - self.origin_x) / self.size)))
+
+    def _row(self, z: float) -> int:
+        return min(self.domains_z - 1, max(0, math.floor((z - self.origin_z) / self.size)))
+
+    def domain_of(self, pos: Vector3) -> int:
+        return self._column(pos.x) * self.domains_z + self._row(pos.z)
+
+    def halo_targets(self, pos: Vector3, halo: float, own: int) -> List[int]:
+        """Other domains whose rectangle, grown by halo, contains pos"""
+        targets = []
+        for column in range(self._column(pos.x - halo), self._column(pos.x + halo) + 1):
+            for row in range(self._row(pos.z - halo), self._row(pos.z + halo) + 1):
+                index = column * self.domains_z + row
+                if index != own:
+                    targets.append(index)
+        return targets
+
+class GhostAnimal:
+    """Copy of an animal owned by a neighbouring worker, only visible to neighbour queries"""
+
+    is_ghost = True
+    entity_id = -1  # never registered locally, so kill claims on it always fail
+    pack = None
+
+    def __init__(self, animal_type: str, position: Vector3):
+        self.animal_type = animal_type
+        self.position = position
+
+def export_animal(ecosystem: Ecosystem, animal: Animal) -> Migrant:
+    """Remove an animal from its ecosystem and package it for another worker"""
+    infection = None
+    if animal.disease is not None:
+        infection = (animal.disease.name, animal.disease_severity, animal.disease_timer)
+    ecosystem.remove_animal(animal)
+    return animal, infection
+
+def import_animal(ecosystem: Ecosystem, migrant: Migrant):
+    animal, infection = migrant
+    ecosystem.add_animal(animal)
+    if infection is not None:
+        ecosystem.health_system.adopt_infection(animal, *infection)
+
+def domain_worker(conn, index: int, seed: int, layout: DomainLayout, halo: float, use_population_store: bool):
+    """Owns the animals (and so the streamed chunks) of one domain; one message in and out per tick"""
+    ecosystem = Ecosystem(seed=seed, chunk_workers=0, region_dir=None,
+                          use_population_store=use_population_store, populate=False)
+    random.seed(f"{seed}:domain:{index}")
+    behavior_engine = BehaviorEngine()
+    reproduction_engine = ReproductionEngine()
+
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        migrants, ghosts = message
+        for migrant in migrants:
+            import_animal(ecosystem, migrant)
+        ecosystem.ghosts = [GhostAnimal(animal_type, Vector3(x, y, z)) for animal_type, x, y, z in ghosts]
+
+        start = time.perf_counter()
+        ecosystem.update(behavior_engine, reproduction_engine)
+        elapsed = time.perf_counter() - start
+
+        # Hand over animals that left the domain, copy the ones near its border to the neighbours
+        emigrants: List[Migrant] = []
+        halo_out: Dict[int, List[GhostState]] = {}
+        for animal in ecosystem.animals:
+            pos = animal.position
+            if layout.domain_of(pos) != index:
+                emigrants.append(export_animal(ecosystem, animal))
+                continue
+            for target in layout.halo_targets(pos, halo, index):
+                halo_out.setdefault(target, []).append((animal.animal_type, pos.x, pos.y, pos.z))
+        ecosystem.registry.compact()
+
+        conn.send((emigrants, halo_out, ecosystem.get_animal_counts(), elapsed))
+
+    ecosystem.planet.close()
+    conn.close()
+
+class DomainSimulation:
+    """Runs one ecosystem per domain in worker processes, routing migrants and halos between ticks
+
+    Workers only talk to this hub, which forwards each worker's emigrants to their
+    new owner and its border animals to the neighbours. Animals interact across a
+    border only within the halo; each worker's terrain edits stay in its own copy
+    of the world, which is authoritative inside its domain.
+    """
+
+    def __init__(self, seed: int = 42, domains_x: int = 2, domains_z: int = 2,
+                 chunks_per_domain: int = DOMAIN_CHUNKS, halo: float = DOMAIN_HALO,
+                 use_population_store: bool = USE_POPULATION_STORE):
+        self.seed = seed
+        self.layout = DomainLayout(domains_x, domains_z, chunks_per_domain)
+        self.halo = halo
+        self.frame_count = 0
+        self.counts: List[Dict[str, int]] = [{} for _ in range(self.layout.count)]
+        self.worker_time = [0.0] * self.layout.count
+
+        self.connections = []
+        self.workers = []
+        for index in range(self.layout.count):
+            parent, child = Pipe()
+            worker = Process(target=domain_worker, daemon=True,
+                             args=(child, index, seed, self.layout, halo, use_population_store))
+            worker.start()
+            child.close()
+            self.connections.append(parent)
+            self.workers.append(worker)
+
+        # Same initial animals as a single Ecosystem with this seed
+        random.seed(seed)
+        self.migrants: List[List[Migrant]] = [[] for _ in range(self.layout.count)]
+        self.ghosts: List[List[GhostState]] = [[] for _ in range(self.layout.count)]
+        for animal in spawn_initial_animals():
+            self.migrants[self.layout.domain_of(animal.position)].append((animal, None))
+
+    def step(self):
+        """Advance every domain one tick in parallel"""
+        for index, conn in enumerate(self.connections):
+            conn.send((self.migrants[index], self.ghosts[index]))
+
+        migrants: List[List[Migrant]] = [[] for _ in range(self.layout.count)]
+        ghosts: List[List[GhostState]] = [[] for _ in range(self.layout.count)]
+        for index, conn in enumerate(self.connections):
+            emigrants, halo_out, counts, elapsed = conn.recv()
+            for migrant in emigrants:
+                migrants[self.layout.domain_of(migrant[0].position)].append(migrant)
+            for target, states in halo_out.items():
+                ghosts[target].extend(states)
+            self.counts[index] = counts
+            self.worker_time[index] += elapsed
+
+        self.migrants = migrants
+        self.ghosts = ghosts
+        self.frame_count += 1
+
+    def get_animal_counts(self) -> Dict[str, int]:
+        """Counts over all domains, including animals in transit between them"""
+        totals: Dict[str, int] = {}
+        for counts in self.counts:
+            for species, count in counts.items():
+                totals[species] = totals.get(species, 0) + count
+        for inbox in self.migrants:
+            for animal, _ in inbox:
+                totals[animal.animal_type] = totals.get(animal.animal_type, 0) + 1
+        return totals
+
+    def get_total_animals(self) -> int:
+        return sum(self.get_animal_counts().values())
+
+    def domain_totals(self) -> List[int]:
+        return [sum(counts.values()) for counts in self.counts]
+
+    def close(self):
+        for conn in self.connections:
+            conn.send(None)
+        for worker in self.workers:
+            worker.join()
+        for conn in self.connections:
+            conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run the ecosystem split across worker processes")
+    parser.add_argument("--domains", default="2x2", help="domains along x and z, e.g. 2x2")
+    parser.add_argument("--chunks", type=int, default=DOMAIN_CHUNKS, help="chunks per domain side")
+    parser.add_argument("--halo", type=float, default=DOMAIN_HALO)
+    parser.add_argument("--ticks", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    domains_x, domains_z = (int(n) for n in args.domains.lower().split("x"))
+
+    with DomainSimulation(args.seed, domains_x, domains_z, args.chunks, args.halo) as sim:
+        start = time.perf_counter()
+        for tick in range(1, args.ticks + 1):
+            sim.step()
+            if tick % 100 == 0:
+                print(f"tick {tick:6d}: {sim.get_total_animals():6d} animals, per domain {sim.domain_totals()}")
+        elapsed = time.perf_counter() - start
+        print(f"{args.ticks} ticks in {elapsed:.2f} s ({args.ticks / elapsed:.1f} ticks/s), "
+              f"busiest worker {max(sim.worker_time):.2f} s")
+
+if __name__ == "__main__":
+    main()
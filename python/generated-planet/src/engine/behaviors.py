@@ -3,76 +3,186 @@
 from typing import List, Optional, TYPE_CHECKING
 import random
 import math
+import numpy as np
 from ..utils.vectors import Vector3
-from ..utils.constants import AnimalTypes, BlockType
+from ..utils.constants import BlockType, EAT_REACH, WATER_ANIMALS, FLOCKING_ANIMALS
+from ..utils.arrays import draw_rng, positions
+from ..core.navigation import FOOD, WATER
+from ..core.pool import AnimalPool
+from ..core.population import SPECIES, SPECIES_IDS
+from .flocking import steer
 
 if TYPE_CHECKING:
     from ..core.planet import Planet
     from ..core.animal import Animal
+    from ..core.spatial_hash import SpatialHash
+    from ..core.population import PopulationStore
+    from ..core.registry import EntityRegistry
+
+FLOCKING_SPECIES = np.array([name in FLOCKING_ANIMALS for name in SPECIES])  # indexed by species id
 
 class BehaviorEngine:
     """Handles all animal behavior logic"""
     
     @staticmethod
-    def find_target(animal: 'Animal', planet: 'Planet', animals: List['Animal']) -> Optional[Vector3]:
-        """Find food or prey"""
-        best_target = None
-        best_distance = float('inf')
+    def find_prey(animal: 'Animal', animals: List['Animal'],
+                  grid: Optional['SpatialHash'] = None) -> Optional['Animal']:
+        """Closest animal of a prey type within vision range"""
+        if grid is not None:
+            return grid.nearest(animal.position, animal.vision_range, animal.prey_types, exclude=animal)
         
+        best_prey = None
+        best_distance = animal.vision_range * animal.vision_range
+        for target_animal in animals:
+            if target_animal is not animal and target_animal.animal_type in animal.prey_types:
+                distance_sq = animal.position.distance_sq_to(target_animal.position)
+                if distance_sq < best_distance:
+                    best_distance = distance_sq
+                    best_prey = target_animal
+        return best_prey
+    
+    @staticmethod
+    def find_target(animal: 'Animal', planet: 'Planet', animals: List['Animal'],
+                    grid: Optional['SpatialHash'] = None) -> Optional[Vector3]:
+        """Find food or prey"""
         if animal.is_herbivore:
             # Look for grass/leaves nearby
-            nearby = planet.get_nearby_blocks(animal.position, animal.vision_range)
-            for (x, y, z), block_type in nearby:
-                if block_type in [BlockType.GRASS, BlockType.LEAVES]:
-                    target_pos = Vector3(x, y, z)
-                    distance = animal.position.distance_to(target_pos)
-                    if distance < best_distance:
-                        best_distance = distance
-                        best_target = target_pos
+            return planet.find_nearest_edible(animal.position, animal.vision_range)
+        if animal.prey_types:
+            prey = BehaviorEngine.find_prey(animal, animals, grid)
+            return prey.position if prey else None
+        return None
+    
+    @staticmethod
+    def current_target(animal: 'Animal', planet: 'Planet', animals: List['Animal'],
+                       grid: Optional['SpatialHash'], registry: Optional['EntityRegistry'],
+                       tick: int) -> Optional[Vector3]:
+        """find_target, re-planned every replan_interval ticks or as soon as the cached target is gone
         
-        elif animal.is_carnivore or animal.is_water:
-            # Look for prey
-            prey_types = []
-            if animal.is_carnivore:
-                prey_types = [AnimalTypes.RABBIT, AnimalTypes.MOUSE, AnimalTypes.DUCK]
-                if animal.animal_type == AnimalTypes.EAGLE:
-                    prey_types += [AnimalTypes.BIRD]
-            else:  # Water animals
-                prey_types = [AnimalTypes.FISH, AnimalTypes.DUCK]
-            
-            for target_animal in animals:
-                if target_animal.animal_type in prey_types:
-                    distance = animal.position.distance_to(target_animal.position)
-                    if distance < animal.vision_range and distance < best_distance:
-                        best_distance = distance
-                        best_target = target_animal.position
+        Animals are staggered by entity id so only about 1/replan_interval of them
+        search in any one tick. A cached block must still be edible, a cached prey
+        still alive and unclaimed, and either must stay within vision range.
+        """
+        if animal.planned and (tick + animal.entity_id) % animal.replan_interval:
+            vision_sq = animal.vision_range * animal.vision_range
+            target = animal.target_pos
+            if target is not None:
+                if (planet.edible.contains(int(target.x), int(target.y), int(target.z)) and
+                        animal.position.distance_sq_to(target) < vision_sq):
+                    return target
+            elif animal.target_id >= 0:
+                prey = registry.get(animal.target_id)
+                if (prey is not None and registry.is_live(prey) and not registry.is_claimed(prey) and
+                        animal.position.distance_sq_to(prey.position) < vision_sq):
+                    return prey.position
+            else:
+                return None  # nothing was in range at the last plan
         
-        return best_target
+        # Re-plan
+        animal.target_pos = None
+        animal.target_id = -1
+        animal.planned = True
+        if animal.is_herbivore:
+            animal.target_pos = planet.find_nearest_edible(animal.position, animal.vision_range)
+            return animal.target_pos
+        if not animal.prey_types:
+            return None
+        prey = BehaviorEngine.find_prey(animal, animals, grid)
+        if prey is None:
+            return None
+        if registry is None or prey.entity_id < 0:
+            animal.planned = False  # ghosts and unregistered prey cannot be looked up again
+        else:
+            animal.target_id = prey.entity_id
+        return prey.position
     
     @staticmethod
-    def move_towards(animal: 'Animal', target: Vector3):
-        """Move animal towards target"""
-        direction = (target - animal.position).normalize()
-        animal.position = animal.position + direction * animal.speed
+    def move_towards(animal: 'Animal', target: Vector3, steps: int = 1):
+        """Move animal towards target, steps ticks' worth without overshooting it"""
+        if steps == 1:
+            animal.position.step_towards(target, animal.speed)
+            return
+        distance = math.sqrt(animal.position.distance_sq_to(target))
+        animal.position.step_towards(target, min(animal.speed * steps, distance))
     
     @staticmethod
-    def random_walk(animal: 'Animal'):
-        """Random movement"""
-        direction = Vector3(
-            random.uniform(-1, 1),
-            random.uniform(-0.3, 0.3) if not animal.is_bird else random.uniform(-0.5, 0.5),
-            random.uniform(-1, 1)
-        ).normalize()
-        animal.position = animal.position + direction * animal.speed
-        
-        # Bound checking
-        animal.position.x = max(-50, min(50, animal.position.x))
-        animal.position.y = max(0, min(20, animal.position.y))
-        animal.position.z = max(-50, min(50, animal.position.z))
+    def follow_flow(animal: 'Animal', planet: 'Planet', kind: str, steps: int = 1) -> bool:
+        """Step along the planet's flow field toward kind, False where it has no direction"""
+        direction = planet.flow_fields.direction(animal.position.x, animal.position.z, kind)
+        if direction is None:
+            return False
+        animal.position.iadd_scaled(direction[0], 0, direction[1], animal.speed * steps)
+        BehaviorEngine.keep_in_bounds(animal.position)
+        return True
+    
+    @staticmethod
+    def seek(animal: 'Animal', planet: 'Planet', steps: int = 1) -> bool:
+        """With nothing in sight: stranded water animals head for water, herbivores for grass"""
+        if not animal.is_water and animal.animal_type in WATER_ANIMALS:
+            return BehaviorEngine.follow_flow(animal, planet, WATER, steps)
+        if animal.is_herbivore:
+            return BehaviorEngine.follow_flow(animal, planet, FOOD, steps)
+        return False
+    
+    @staticmethod
+    def steer_flocks(animals: List['Animal'], population: Optional['PopulationStore'] = None):
+        """Set the heading of every FLOCKING_ANIMALS member for this tick in one pass, see flocking.steer"""
+        if population is not None:
+            n = population.count
+            rows = np.flatnonzero(FLOCKING_SPECIES[population.species[:n]])
+            if not len(rows):
+                return
+            columns = population.columns
+            headings = np.stack([columns["heading_x"][rows], columns["heading_z"][rows]], axis=1)
+            headings = steer(population.positions[rows], headings, population.species[rows])
+            columns["heading_x"][rows] = headings[:, 0]
+            columns["heading_z"][rows] = headings[:, 1]
+            return
+        members = [a for a in animals if a.animal_type in FLOCKING_ANIMALS]
+        if not members:
+            return
+        headings = steer(positions(members), np.array([(a.heading_x, a.heading_z) for a in members]),
+                         np.array([SPECIES_IDS[a.animal_type] for a in members]))
+        for animal, (hx, hz) in zip(members, headings.tolist()):
+            animal.heading_x = hx
+            animal.heading_z = hz
+    
+    @staticmethod
+    def flock(animal: 'Animal', steps: int = 1) -> bool:
+        """Step along the heading from steer_flocks, False for animals without flockmates"""
+        hx = animal.heading_x
+        hz = animal.heading_z
+        if not hx and not hz:
+            return False
+        pos = animal.position
+        pos.iadd_scaled(hx, 0, hz, animal.speed * steps)
+        BehaviorEngine.keep_in_bounds(pos)
+        return True
+    
+    @staticmethod
+    def random_walk(animal: 'Animal', steps: int = 1):
+        """Random movement - steps ticks of wandering cover about sqrt(steps) times one tick's distance"""
+        dx = random.uniform(-1, 1)
+        dy = random.uniform(-0.3, 0.3) if not animal.is_bird else random.uniform(-0.5, 0.5)
+        dz = random.uniform(-1, 1)
+        length = math.sqrt(dx * dx + dy * dy + dz * dz)
+        pos = animal.position
+        if length != 0:
+            step = animal.speed if steps == 1 else animal.speed * math.sqrt(steps)
+            pos.iadd_scaled(dx, dy, dz, step / length)
+        BehaviorEngine.keep_in_bounds(pos)
+    
+    @staticmethod
+    def keep_in_bounds(pos: Vector3):
+        """Bound checking for wandering animals"""
+        pos.x = max(-50, min(50, pos.x))
+        pos.y = max(0, min(20, pos.y))
+        pos.z = max(-50, min(50, pos.z))
     
     @staticmethod
-    def eat(animal: 'Animal', planet: 'Planet', animals: List['Animal'], target: Vector3):
-        """Animal eats food or prey"""
+    def eat(animal: 'Animal', planet: 'Planet', animals: List['Animal'], target: Vector3,
+            grid: Optional['SpatialHash'] = None, registry: Optional['EntityRegistry'] = None):
+        """Animal eats food or prey - with a registry the kill is only claimed, see resolve_kills"""
         if animal.is_herbivore:
             x, y, z = int(target.x), int(target.y), int(target.z)
             block = planet.get_block_at(x, y, z)
@@ -80,10 +190,19 @@ class BehaviorEngine:
                 planet.set_block_at(x, y, z, BlockType.DIRT if block == BlockType.GRASS else BlockType.AIR)
                 animal.energy += 25
         else:
-            for other_animal in animals[:]:
-                if animal.position.distance_to(other_animal.position) < 2:
+            candidates = grid.query_radius(animal.position, EAT_REACH, animal.prey_types) if grid is not None else animals
+            for other_animal in candidates:
+                if other_animal is animal or other_animal.animal_type not in animal.prey_types:
+                    continue
+                if animal.position.distance_sq_to(other_animal.position) < EAT_REACH * EAT_REACH:
+                    if registry is not None:
+                        if registry.claim_kill(animal, other_animal):
+                            break
+                        continue
                     animal.energy += other_animal.max_energy
                     animals.remove(other_animal)
+                    if grid is not None:
+                        grid.remove(other_animal)
                     break
     
     @staticmethod
@@ -91,23 +210,19 @@ class BehaviorEngine:
         """Keep animals on ground or in water"""
         x, z = int(animal.position.x), int(animal.position.z)
         
-        if animal.is_water:
+        if animal.is_water or animal.animal_type in WATER_ANIMALS:
             # Find water level
-            for y in range(15, -1, -1):
-                if planet.get_block_at(x, y, z) == BlockType.WATER:
-                    animal.position.y = y + 1
-                    return
+            water_y = planet.get_water_level(x, z)
+            if water_y >= 0:
+                animal.is_water = True  # back in the water if it was stranded
+                animal.position.y = water_y + 1
+                return
             # If no water, fall to ground
             animal.is_water = False
         
         # Find ground level
-        for y in range(15, -1, -1):
-            block = planet.get_block_at(x, y, z)
-            if block != BlockType.AIR and block != BlockType.WATER:
-                animal.position.y = y + 1
-                return
-        
-        animal.position.y = 1
+        ground_y = planet.get_surface_height(x, z)
+        animal.position.y = ground_y + 1 if ground_y >= 0 else 1
 
 class ReproductionEngine:
     """Handles breeding logic"""
@@ -121,9 +236,47 @@ class ReproductionEngine:
                 animal.breeding_cooldown == 0)
     
     @staticmethod
-    def breed(animal: 'Animal', breeding_energy_cost: float, breeding_cooldown: int):
+    def breed(animal: 'Animal', breeding_energy_cost: float, breeding_cooldown: int,
+              pool: Optional['AnimalPool'] = None):
         """Execute breeding"""
         animal.energy -= animal.max_energy * breeding_energy_cost
         animal.breeding_cooldown = breeding_cooldown
         animal.is_breeding = True
-        return animal.reproduce()
+        return animal.reproduce(pool)
+    
+    @staticmethod
+    def can_breed_many(store: 'PopulationStore', breeding_energy_threshold: float, breeding_age_min: int,
+                       breeding_cooldown: int) -> np.ndarray:
+        """can_breed for every row of a population store"""
+        n = store.count
+        columns = store.columns
+        return ((columns["energy"][:n] > columns["max_energy"][:n] * breeding_energy_threshold) &
+                (columns["age"][:n] > breeding_age_min) &
+                (columns["breeding_cooldown"][:n] == 0))
+    
+    @staticmethod
+    def breed_many(store: 'PopulationStore', mask: np.ndarray, breeding_energy_cost: float,
+                   breeding_cooldown: int, pool: Optional['AnimalPool'] = None) -> List['Animal']:
+        """breed for every masked row, clearing is_breeding on the rest; offspring reuse pool's animals"""
+        n = store.count
+        columns = store.columns
+        columns["energy"][:n][mask] -= columns["max_energy"][:n][mask] * breeding_energy_cost
+        columns["breeding_cooldown"][:n][mask] = breeding_cooldown
+        columns["is_breeding"][:n] = mask
+        rows = np.flatnonzero(mask)
+        if not len(rows):
+            return []
+        if pool is None:
+            pool = AnimalPool(limit=0)
+        # One draw per trait for the whole brood instead of a Genetics per birth
+        rng = draw_rng()
+        genes = store.genes.offspring(rows, rng)
+        offsets = rng.uniform(-5, 5, (len(rows), 2)).tolist()
+        animals = store.animals
+        acquire = pool.acquire
+        offspring = []
+        for row, traits, (dx, dz) in zip(rows.tolist(), genes, offsets):
+            parent = animals[row]
+            pos = parent.position
+            offspring.append(acquire(parent.animal_type, pos.x + dx, pos.y, pos.z + dz, parent, traits))
+        return offspring
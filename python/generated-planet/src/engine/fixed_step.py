@@ -0,0 +1,147 @@
+"""Fixed-step loop - simulation ticks at a constant rate, rendering interpolates between them"""
+
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+from ..utils.constants import SIM_TICK_RATE, SIM_MAX_STEPS_PER_FRAME
+
+class AnimalFrame(NamedTuple):
+    """Everything the renderer needs of one animal at one tick"""
+    entity_id: int
+    animal_type: str
+    color: tuple
+    x: float
+    y: float
+    z: float
+    energy_pct: float
+    is_breeding: bool
+
+class WorldSnapshot:
+    """Immutable copy of the drawable world state after a tick"""
+
+    def __init__(self, tick: int, animals: List[AnimalFrame], counts: Dict[str, int],
+                 breeding_count: int, time_seconds: int, weather: str, brightness: float):
+        self.tick = tick
+        self.animals = animals
+        self.counts = counts
+        self.breeding_count = breeding_count
+        self.time_seconds = time_seconds
+        self.weather = weather
+        self.brightness = brightness
+
+    @classmethod
+    def capture(cls, ecosystem) -> 'WorldSnapshot':
+        animals = [AnimalFrame(a.entity_id, a.animal_type, a.color,
+                               a.position.x, a.position.y, a.position.z,
+                               min(1.0, a.energy / a.max_energy), a.is_breeding)
+                   for a in ecosystem.animals]
+        return cls(ecosystem.frame_count, animals, ecosystem.get_animal_counts(),
+                   ecosystem.get_breeding_count(), ecosystem.get_time_seconds(),
+                   ecosystem.weather.current_weather, ecosystem.weather.get_brightness())
+
+def interpolate(previous: WorldSnapshot, current: WorldSnapshot, alpha: float) -> List[AnimalFrame]:
+    """Animals of current with positions blended from previous; newborns appear where they are"""
+    if previous is current or alpha >= 1.0:
+        return current.animals
+    before = {frame.entity_id: frame for frame in previous.animals}
+    blended = []
+    for frame in current.animals:
+        old = before.get(frame.entity_id)
+        if old is None:
+            blended.append(frame)
+            continue
+        blended.append(frame._replace(x=old.x + (frame.x - old.x) * alpha,
+                                      y=old.y + (frame.y - old.y) * alpha,
+                                      z=old.z + (frame.z - old.z) * alpha))
+    return blended
+
+class FixedStepLoop:
+    """Runs step() tick_rate times per second of wall clock, on the caller's thread or its own
+
+    Same-thread mode: call advance(frame_seconds) once per rendered frame.
+    Threaded mode: start() once; lock is held for every tick, so hold it too
+    when touching the world from another thread.
+    """
+
+    def __init__(self, step: Callable[[], None], capture: Callable[[], WorldSnapshot],
+                 tick_rate: float = SIM_TICK_RATE, max_steps: int = SIM_MAX_STEPS_PER_FRAME):
+        self.step = step
+        self.capture = capture
+        self.dt = 1.0 / tick_rate
+        self.max_steps = max_steps
+        self.paused = False
+        self.lock = threading.Lock()
+        self.accumulator = 0.0
+        self.ticks = 0
+        self.dropped = 0.0  # simulated seconds skipped because ticks could not keep up
+        snapshot = capture()
+        # (previous, current, publish time), swapped as a whole so readers see a consistent pair
+        self.states = (snapshot, snapshot, time.perf_counter())
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _tick(self):
+        with self.lock:
+            self.step()
+            snapshot = self.capture()
+        self.states = (self.states[1], snapshot, time.perf_counter())
+        self.ticks += 1
+
+    @property
+    def current(self) -> WorldSnapshot:
+        return self.states[1]
+
+    def _consume(self, elapsed: float):
+        """Run the ticks owed for elapsed seconds, at most max_steps of them"""
+        if self.paused:
+            self.accumulator = 0.0
+            current = self.states[1]
+            self.states = (current, current, time.perf_counter())
+            return
+        self.accumulator += elapsed
+        steps = 0
+        while self.accumulator >= self.dt and steps < self.max_steps:
+            self._tick()
+            self.accumulator -= self.dt
+            steps += 1
+        if self.accumulator >= self.dt:
+            # Too far behind: let simulated time slip instead of spiralling
+            self.dropped += self.accumulator - self.accumulator % self.dt
+            self.accumulator %= self.dt
+
+    def advance(self, frame_seconds: float):
+        """Same-thread mode: run the ticks owed for the time since the last frame"""
+        self._consume(frame_seconds)
+
+    def frames(self) -> List[AnimalFrame]:
+        """Interpolated animals for a frame drawn now"""
+        previous, current, published_at = self.states
+        if self._thread is None:
+            alpha = self.accumulator / self.dt
+        else:
+            alpha = min(1.0, (time.perf_counter() - published_at) / self.dt)
+        return interpolate(previous, current, alpha)
+
+    def start(self):
+        """Threaded mode: tick on a daemon thread until stop()"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.is_set():
+            now = time.perf_counter()
+            self._consume(now - last)
+            last = now
+            # Sleep until the next tick is due
+            self._stop.wait(max(0.0, self.dt - self.accumulator))
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
@@ -0,0 +1,63 @@
+"""Flocking - boids steering for every flock member in one NumPy pass"""
+
+from typing import Optional
+import numpy as np
+from ..utils.arrays import draw_rng
+from ..utils.grid import neighbour_pairs
+from ..utils.constants import (
+    FLOCK_RADIUS, FLOCK_SEPARATION, FLOCK_COHESION, FLOCK_ALIGNMENT, FLOCK_AVOIDANCE, FLOCK_WANDER
+)
+
+def steer(points: np.ndarray, headings: np.ndarray, groups: np.ndarray,
+          rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """New (x, z) headings for members at (n, 3) points with (n, 2) headings
+    
+    Members only flock with others of the same group (species) within
+    FLOCK_RADIUS: cohesion toward their centre, alignment with their mean
+    heading and separation from those within FLOCK_SEPARATION. Members with no
+    flockmates get a zero heading and wander on their own, see BehaviorEngine.flock.
+    """
+    n = len(points)
+    new = np.zeros((n, 2))
+    if n < 2 or np.bincount(groups).max() < 2:
+        return new
+    i, j = neighbour_pairs(points, FLOCK_RADIUS)
+    same = groups[i] == groups[j]
+    if not same.all():
+        i, j = i[same], j[same]
+    counts = np.bincount(i, minlength=n)
+    members = counts > 0
+    if not members.any():
+        return new
+
+    x = np.ascontiguousarray(points[:, 0])
+    z = np.ascontiguousarray(points[:, 2])
+    hx = np.ascontiguousarray(headings[:, 0])
+    hz = np.ascontiguousarray(headings[:, 1])
+    mates = counts[members]
+    dx = x[i] - x[j]
+    dz = z[i] - z[j]
+    # Mean offset to the flockmates is the pull toward their centre
+    cohesion_x = -np.bincount(i, dx, n)[members] / mates
+    cohesion_z = -np.bincount(i, dz, n)[members] / mates
+    alignment_x = np.bincount(i, hx[j], n)[members] / mates
+    alignment_z = np.bincount(i, hz[j], n)[members] / mates
+
+    distance_sq = dx * dx + dz * dz
+    close = np.flatnonzero(distance_sq < FLOCK_SEPARATION * FLOCK_SEPARATION)
+    push = 1 / np.maximum(distance_sq[close], 1e-6)
+    separation_x = np.bincount(i[close], dx[close] * push, n)[members]
+    separation_z = np.bincount(i[close], dz[close] * push, n)[members]
+
+    rng = rng if rng is not None else draw_rng()
+    wander = rng.standard_normal((2, len(mates)))
+    desired = new[members]
+    desired[:, 0] = (hx[members] + FLOCK_COHESION * cohesion_x + FLOCK_ALIGNMENT * alignment_x +
+                     FLOCK_AVOIDANCE * separation_x + FLOCK_WANDER * wander[0])
+    desired[:, 1] = (hz[members] + FLOCK_COHESION * cohesion_z + FLOCK_ALIGNMENT * alignment_z +
+                     FLOCK_AVOIDANCE * separation_z + FLOCK_WANDER * wander[1])
+    length = np.hypot(desired[:, 0], desired[:, 1])
+    moving = length > 0
+    desired[moving] /= length[moving, None]
+    new[members] = desired
+    return new
@@ -6,6 +6,7 @@ from ..utils.constants import PACK_FORMATION_DISTANCE, PACK_HUNT_BONUS
 
 if TYPE_CHECKING:
     from ..core.animal import Animal
+    from ..core.spatial_hash import SpatialHash
 
 class Pack:
     """Represents a group of predators hunting together"""
@@ -56,12 +57,15 @@ class PackBehavior:
     """Manages pack hunting and coordination"""
     
     @staticmethod
-    def find_pack_nearby(animal: 'Animal', animals: List['Animal'], radius: float = 30) -> Optional[Pack]:
+    def find_pack_nearby(animal: 'Animal', animals: List['Animal'], radius: float = 30,
+                         grid: Optional['SpatialHash'] = None) -> Optional[Pack]:
         """Find nearby pack of same predator type"""
+        if grid is not None:
+            animals = grid.query_radius(animal.position, radius, [animal.animal_type])
         for other in animals:
             if (other.animal_type == animal.animal_type and 
                 other.is_carnivore and 
-                animal.position.distance_to(other.position) < radius):
+                animal.position.distance_sq_to(other.position) < radius * radius):
                 if hasattr(other, 'pack') and other.pack:
                     return other.pack
         return None
@@ -75,19 +79,22 @@ class PackBehavior:
         # Pack members close to target get bonus damage
         members_in_range = 0
         for member in pack.members:
-            if member.position.distance_to(target) < 10:
+            if member.position.distance_sq_to(target) < 100:
                 members_in_range += 1
         
         # More members = higher bonus
         return 1.0 + (members_in_range - 1) * PACK_HUNT_BONUS / len(pack.members)
     
     @staticmethod
-    def defend_territory(animal: 'Animal', territory_center: Vector3, animals: List['Animal']):
+    def defend_territory(animal: 'Animal', territory_center: Vector3, animals: List['Animal'],
+                         grid: Optional['SpatialHash'] = None):
         """Make animal defend territory from intruders"""
+        if grid is not None:
+            animals = grid.query_radius(territory_center, 30, [animal.animal_type])
         for other in animals:
             if (other.animal_type == animal.animal_type and 
                 other != animal and
-                territory_center.distance_to(other.position) < 30):
+                territory_center.distance_sq_to(other.position) < 900):
                 animal.aggression = 0.8
                 return territory_center
         animal.aggression = 0.2
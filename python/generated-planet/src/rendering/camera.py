@@ -1,7 +1,7 @@
 """Camera module - handles 3D projection and camera movement"""
 
 import math
-from ..utils.vectors import Vector3, rotate_x, rotate_y
+from ..utils.vectors import Vector3
 from ..utils.constants import WINDOW_WIDTH, WINDOW_HEIGHT, DEFAULT_ZOOM
 
 class Camera:
@@ -12,45 +12,54 @@ class Camera:
         self.rotation_x = 0.6
         self.rotation_y = 0
         self.zoom = DEFAULT_ZOOM
+        self._trig_key = None  # rotations the cached cos/sin below were computed for
+        self._trig = (1.0, 0.0, 1.0, 0.0)
     
     def project_3d_to_2d(self, point: Vector3) -> tuple:
         """Project 3D point to 2D screen with perspective"""
+        return self.project_xyz(point.x, point.y, point.z)
+    
+    def project_xyz(self, x: float, y: float, z: float) -> tuple:
+        """project_3d_to_2d for raw coordinates, without building any vectors"""
+        if self._trig_key != (self.rotation_x, self.rotation_y):
+            self._trig_key = (self.rotation_x, self.rotation_y)
+            self._trig = (math.cos(self.rotation_x), math.sin(self.rotation_x),
+                          math.cos(self.rotation_y), math.sin(self.rotation_y))
+        cos_x, sin_x, cos_y, sin_y = self._trig
+        
         # Translate to camera position
-        p = point - self.position
+        pos = self.position
+        px, py, pz = x - pos.x, y - pos.y, z - pos.z
         
-        # Apply rotations
-        p = rotate_x(p, self.rotation_x)
-        p = rotate_y(p, self.rotation_y)
+        # Apply rotations, same as rotate_x then rotate_y
+        py, pz = py * cos_x - pz * sin_x, py * sin_x + pz * cos_x
+        px, pz = px * cos_y + pz * sin_y, -px * sin_y + pz * cos_y
         
         # Perspective projection
-        if p.z < 0.1:
+        if pz < 0.1:
             return None
         
-        scale = 300 / (p.z * self.zoom)
-        x_2d = WINDOW_WIDTH // 2 + p.x * scale
-        y_2d = WINDOW_HEIGHT // 2 - p.y * scale
+        scale = 300 / (pz * self.zoom)
+        x_2d = WINDOW_WIDTH // 2 + px * scale
+        y_2d = WINDOW_HEIGHT // 2 - py * scale
         
         return (int(x_2d), int(y_2d), scale)
     
     def move_forward(self, speed: float):
         """Move forward in view direction"""
-        forward = Vector3(math.sin(self.rotation_y), 0, -math.cos(self.rotation_y)) * speed
-        self.position = self.position + forward
+        self.position.iadd_scaled(math.sin(self.rotation_y), 0, -math.cos(self.rotation_y), speed)
     
     def move_backward(self, speed: float):
         """Move backward"""
-        forward = Vector3(math.sin(self.rotation_y), 0, -math.cos(self.rotation_y)) * speed
-        self.position = self.position - forward
+        self.position.iadd_scaled(math.sin(self.rotation_y), 0, -math.cos(self.rotation_y), -speed)
     
     def move_left(self, speed: float):
         """Move left"""
-        right = Vector3(math.cos(self.rotation_y), 0, math.sin(self.rotation_y)) * speed
-        self.position = self.position - right
+        self.position.iadd_scaled(math.cos(self.rotation_y), 0, math.sin(self.rotation_y), -speed)
     
     def move_right(self, speed: float):
         """Move right"""
-        right = Vector3(math.cos(self.rotation_y), 0, math.sin(self.rotation_y)) * speed
-        self.position = self.position + right
+        self.position.iadd_scaled(math.cos(self.rotation_y), 0, math.sin(self.rotation_y), speed)
     
     def move_up(self, speed: float):
         """Move up"""
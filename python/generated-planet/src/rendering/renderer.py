@@ -1,11 +1,10 @@
 """Renderer module - handles all drawing operations"""
 
 import pygame
-from typing import List, Dict
-from ..utils.vectors import Vector3
+from typing import List, Tuple
 from .camera import Camera
 from .sprites import draw_3d_animal_sprite, draw_energy_bar, draw_breeding_indicator, draw_terrain_block
-from ..utils.constants import BLOCK_COLORS, WINDOW_WIDTH, WINDOW_HEIGHT, BlockType
+from ..utils.constants import BLOCK_COLORS, WINDOW_WIDTH, WINDOW_HEIGHT, BlockType, RENDER_DISTANCE
 
 class Renderer:
     """Main rendering engine"""
@@ -18,10 +17,8 @@ class Renderer:
         """Clear screen with color"""
         self.screen.fill(color)
     
-    def render_terrain(self, planet):
-        """Render all visible terrain blocks"""
-        visible_blocks = planet.get_visible_blocks(self.camera.position)
-        
+    def render_terrain(self, visible_blocks: List[Tuple]):
+        """Render visible terrain blocks as returned by Planet.get_visible_blocks"""
         # Sort by distance for proper rendering
         visible_blocks.sort(key=lambda b: (b[0] + b[1] + b[2]), reverse=True)
         
@@ -29,8 +26,7 @@ class Renderer:
             if block_type == BlockType.AIR:
                 continue
             
-            block_pos = Vector3(x + 0.5, y + 0.5, z + 0.5)
-            projected = self.camera.project_3d_to_2d(block_pos)
+            projected = self.camera.project_xyz(x + 0.5, y + 0.5, z + 0.5)
             
             if projected:
                 x_2d, y_2d, scale = projected
@@ -40,9 +36,15 @@ class Renderer:
                     draw_terrain_block(self.screen, x_2d, y_2d, size, color)
     
     def render_animals(self, animals: List):
-        """Render all animals"""
+        """Render the AnimalFrames within RENDER_DISTANCE (horizontally) of the camera"""
+        eye = self.camera.position
+        limit_sq = RENDER_DISTANCE * RENDER_DISTANCE
         for animal in animals:
-            projected = self.camera.project_3d_to_2d(animal.position)
+            dx = animal.x - eye.x
+            dz = animal.z - eye.z
+            if dx * dx + dz * dz > limit_sq:
+                continue  # past the terrain, and possibly moving in coarse steps (LOD_RADIUS)
+            projected = self.camera.project_xyz(animal.x, animal.y, animal.z)
             
             if projected:
                 x_2d, y_2d, scale = projected
@@ -53,17 +55,16 @@ class Renderer:
                     draw_3d_animal_sprite(self.screen, x_2d, y_2d, size, animal.color, animal.animal_type, scale)
                     
                     # Draw energy bar
-                    energy_pct = min(1.0, animal.energy / animal.max_energy)
-                    draw_energy_bar(self.screen, x_2d, y_2d, size, energy_pct)
+                    draw_energy_bar(self.screen, x_2d, y_2d, size, animal.energy_pct)
                     
                     # Draw breeding indicator
                     if animal.is_breeding:
                         draw_breeding_indicator(self.screen, x_2d, y_2d, size)
     
-    def render_scene(self, planet, animals: List):
+    def render_scene(self, visible_blocks: List[Tuple], animals: List):
         """Render complete scene"""
         self.clear()
-        self.render_terrain(planet)
+        self.render_terrain(visible_blocks)
         self.render_animals(animals)
     
     def update_display(self):
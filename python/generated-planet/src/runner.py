@@ -0,0 +1,135 @@
+"""Headless runner - steps the ecosystem without a window, pygame or frame pacing"""
+
+import argparse
+import json
+import time
+from typing import Dict, List, Optional
+from .core.ecosystem import Ecosystem
+from .engine.behaviors import BehaviorEngine, ReproductionEngine
+from .utils.timing import PhaseTimer
+from .utils.vectors import Vector3
+from .utils.constants import CHUNK_WORKERS, REGION_CACHE_DIR, SIM_TICK_RATE
+
+class RunReport:
+    """Throughput, per-phase time and population curve of one headless run"""
+
+    def __init__(self, seed: int, ticks: int, elapsed: float, phases: Dict[str, Dict[str, float]],
+                 population: List[Dict]):
+        self.seed = seed
+        self.ticks = ticks
+        self.elapsed = elapsed
+        self.phases = phases
+        self.population = population  # one sample per sample_every ticks, plus the final tick
+
+    @property
+    def ticks_per_second(self) -> float:
+        return self.ticks / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "seed": self.seed,
+            "ticks": self.ticks,
+            "elapsed_s": self.elapsed,
+            "ticks_per_second": self.ticks_per_second,
+            "sim_seconds": self.ticks / SIM_TICK_RATE,
+            "phases": self.phases,
+            "population": self.population,
+        }
+
+    def format(self) -> str:
+        lines = [
+            f"ticks:        {self.ticks} ({self.ticks / SIM_TICK_RATE:.1f} simulated s at {SIM_TICK_RATE} ticks/s)",
+            f"wall clock:   {self.elapsed:.2f} s",
+            f"throughput:   {self.ticks_per_second:.1f} ticks/s ({self.ticks_per_second / SIM_TICK_RATE:.1f}x real time)",
+            "",
+            f"{'phase':<10} {'ms/tick':>9} {'share':>7}",
+        ]
+        for phase, stats in self.phases.items():
+            lines.append(f"{phase:<10} {stats['ms_per_tick']:9.3f} {stats['share']:7.1%}")
+        lines += ["", f"{'tick':>7} {'total':>6}  species"]
+        for sample in self.population:
+            species = ", ".join(f"{name} {count}" for name, count in sorted(sample["species"].items()))
+            lines.append(f"{sample['tick']:7d} {sample['total']:6d}  {species}")
+        return "\n".join(lines)
+
+def sample_population(ecosystem: Ecosystem) -> Dict:
+    return {"tick": ecosystem.frame_count,
+            "total": ecosystem.get_total_animals(),
+            "species": ecosystem.get_animal_counts()}
+
+def run_headless(ticks: Optional[int] = 1000, seconds: Optional[float] = None, seed: int = 42,
+                 sample_every: int = 100, chunk_workers: int = CHUNK_WORKERS,
+                 region_dir: Optional[str] = None,
+                 ecosystem: Optional[Ecosystem] = None) -> RunReport:
+    """Step the ecosystem as fast as possible for ticks steps or seconds of wall clock, whichever ends first"""
+    if ticks is None and seconds is None:
+        raise ValueError("run_headless needs a tick count or a time budget")
+
+    own_ecosystem = ecosystem is None
+    if own_ecosystem:
+        ecosystem = Ecosystem(seed=seed, chunk_workers=chunk_workers, region_dir=region_dir)
+    behavior_engine = BehaviorEngine()
+    reproduction_engine = ReproductionEngine()
+    timer = PhaseTimer()
+    ecosystem.timer = timer
+    population = [sample_population(ecosystem)]
+
+    done = 0
+    start = time.perf_counter()
+    deadline = start + seconds if seconds is not None else None
+    try:
+        while ticks is None or done < ticks:
+            ecosystem.update(behavior_engine, reproduction_engine)
+            done += 1
+            if sample_every and done % sample_every == 0:
+                population.append(sample_population(ecosystem))
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        elapsed = time.perf_counter() - start
+    finally:
+        if own_ecosystem:
+            ecosystem.planet.close()
+
+    if population[-1]["tick"] != ecosystem.frame_count:
+        population.append(sample_population(ecosystem))
+    return RunReport(seed, done, elapsed, timer.report(), population)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run the ecosystem without a display")
+    parser.add_argument("--ticks", type=int, default=1000, help="ticks to run, 0 for no limit")
+    parser.add_argument("--seconds", type=float, default=None, help="wall-clock budget")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--sample-every", type=int, default=100, help="ticks between population samples")
+    parser.add_argument("--workers", type=int, default=CHUNK_WORKERS, help="chunk generation workers")
+    parser.add_argument("--region-dir", default=REGION_CACHE_DIR, help="chunk paging directory, '' to disable")
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    parser.add_argument("--resume", metavar="PATH",
+                        help="continue from a checkpoint instead of --seed (chunks stay in memory)")
+    parser.add_argument("--save-checkpoint", metavar="PATH", help="write a checkpoint after the run")
+    parser.add_argument("--focus", type=float, nargs=2, metavar=("X", "Z"),
+                        help="observer position: animals beyond LOD_RADIUS of it take coarse steps")
+    args = parser.parse_args(argv)
+
+    if not args.ticks and args.seconds is None:
+        parser.error("--ticks 0 needs --seconds")
+
+    if args.resume:
+        ecosystem = Ecosystem.load_checkpoint(args.resume, chunk_workers=args.workers)
+    else:
+        ecosystem = Ecosystem(seed=args.seed, chunk_workers=args.workers, region_dir=args.region_dir or None)
+    if args.focus:
+        ecosystem.set_focus(Vector3(args.focus[0], 0, args.focus[1]))
+    try:
+        report = run_headless(ticks=args.ticks or None, seconds=args.seconds, seed=ecosystem.seed,
+                              sample_every=args.sample_every, ecosystem=ecosystem)
+        if args.save_checkpoint:
+            ecosystem.save_checkpoint(args.save_checkpoint).wait()
+    finally:
+        ecosystem.planet.close()
+    print(report.format())
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report.to_dict(), f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 """Main simulation - orchestrates all modules"""
 
+import time
 import pygame
 from .rendering.camera import Camera
 from .rendering.renderer import Renderer
@@ -8,12 +9,14 @@ from .ui.hud import HUD, Minimap, Stats
 from .engine.input_handler import InputHandler
 from .core.ecosystem import Ecosystem
 from .engine.behaviors import BehaviorEngine, ReproductionEngine
-from .utils.constants import WINDOW_WIDTH, WINDOW_HEIGHT, FPS
+from .engine.fixed_step import FixedStepLoop, WorldSnapshot
+from .utils.timing import Profiler, NULL_TIMER
+from .utils.constants import WINDOW_WIDTH, WINDOW_HEIGHT, FPS, SIM_THREADED, REGION_CACHE_DIR
 
 class PlanetSimulation:
     """Main simulation class - orchestrates all systems"""
     
-    def __init__(self):
+    def __init__(self, threaded: bool = SIM_THREADED):
         pygame.init()
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("3D Planet Simulation - Animals & Terrain (v2.0: Enhanced Ecology)")
@@ -28,11 +31,21 @@ class PlanetSimulation:
         self.minimap = Minimap()
         self.stats = Stats(self.font)
         self.input_handler = InputHandler()
-        self.ecosystem = Ecosystem()
+        self.ecosystem = Ecosystem(region_dir=REGION_CACHE_DIR)
         self.behavior_engine = BehaviorEngine()
         self.camera_mode = "normal"  # normal, follow, top-down
         self.reproduction_engine = ReproductionEngine()
         
+        # Ticks at SIM_TICK_RATE whatever the frame rate, frames interpolate between ticks
+        self.threaded = threaded
+        self.loop = FixedStepLoop(self.step, lambda: WorldSnapshot.capture(self.ecosystem))
+        self.visible_blocks = []
+        
+        # Frame profiler, off until F3: one track for frames, one for simulation ticks
+        self.profiler = Profiler()
+        self.frame_timer = NULL_TIMER
+        self.trace_path = ""  # last trace written, shown in the profile panel
+        
         # State
         self.paused = False
         self.show_debug = True
@@ -67,36 +80,84 @@ class PlanetSimulation:
                 self.camera.rotate_pitch(0.1)
             elif key == pygame.K_h:
                 self.show_debug = not self.show_debug
+            elif key == pygame.K_F3:
+                self.set_profiling(self.frame_timer is NULL_TIMER)
+            elif key == pygame.K_F4:
+                self.trace_path = self.toggle_trace() or self.trace_path
             elif key == pygame.K_c:  # Switch camera mode
                 modes = ["normal", "follow", "top-down"]
                 current_idx = modes.index(self.camera_mode)
                 self.camera_mode = modes[(current_idx + 1) % len(modes)]
             elif key == pygame.K_d:  # Create disease outbreak
-                if self.ecosystem.animals:
-                    from .core.health import HealthSystem
-                    import random
-                    patient = random.choice(self.ecosystem.animals)
-                    self.ecosystem.health_system.create_outbreak(self.ecosystem.animals, patient)
+                with self.loop.lock:
+                    if self.ecosystem.animals:
+                        import random
+                        patient = random.choice(self.ecosystem.animals)
+                        self.ecosystem.health_system.create_outbreak(self.ecosystem.animals, patient)
             elif key == pygame.K_e:  # Trigger particle effects demo
                 for _ in range(10):
                     self.effects.blood_splash(600 + 200 * self.clock.get_fps() % 200, 400)
         
         return True
     
-    def update(self):
-        """Update simulation"""
-        if not self.paused:
-            self.ecosystem.update(self.behavior_engine, self.reproduction_engine)
-            self.stats.update(self.ecosystem.get_animal_counts())
+    def set_profiling(self, enabled: bool):
+        """Time every phase of frames and ticks and show the breakdown in the HUD"""
+        if enabled:
+            self.frame_timer = self.profiler.track("frame")
+            self.ecosystem.timer = self.profiler.track("simulation")
+        else:
+            if self.profiler.recording:
+                self.toggle_trace()
+            self.frame_timer = NULL_TIMER
+            self.ecosystem.timer = NULL_TIMER
+    
+    def toggle_trace(self) -> str:
+        """Start recording a trace, or stop and write it as Chrome trace JSON; returns the path"""
+        if not self.profiler.recording:
+            self.set_profiling(True)
+            self.profiler.start_trace()
+            return ""
+        path = time.strftime("trace-%Y%m%d-%H%M%S.json")
+        self.profiler.export_chrome_trace(path, self.profiler.stop_trace())
+        return path
+    
+    def step(self):
+        """Advance the simulation one fixed tick"""
+        self.ecosystem.update(self.behavior_engine, self.reproduction_engine)
+        self.stats.update(self.ecosystem.get_animal_counts())
+    
+    def update(self, frame_seconds: float):
+        """Update simulation for the wall-clock time since the last frame"""
+        self.ecosystem.set_focus(self.camera.position)
+        self.loop.paused = self.paused
+        if not self.threaded:
+            self.loop.advance(frame_seconds)
+    
+    def gather_terrain(self):
+        """Collect visible blocks, reusing the last ones while the simulation thread is mid-tick"""
+        if self.loop.lock.acquire(blocking=not self.threaded):
+            try:
+                self.visible_blocks = self.ecosystem.planet.get_visible_blocks(self.camera.position)
+            finally:
+                self.loop.lock.release()
     
     def draw(self):
         """Draw everything"""
+        timer = self.frame_timer
+        snapshot = self.loop.current
+        
         # Get weather effects
-        brightness = self.ecosystem.weather.get_brightness()
-        weather_type = self.ecosystem.weather.current_weather
+        brightness = snapshot.brightness
+        weather_type = snapshot.weather
         
         # Render scene
-        self.renderer.render_scene(self.ecosystem.planet, self.ecosystem.animals)
+        self.renderer.clear()
+        self.gather_terrain()
+        self.renderer.render_terrain(self.visible_blocks)
+        timer.lap("terrain")
+        animals = self.loop.frames()
+        self.renderer.render_animals(animals)
+        timer.lap("animals")
         
         # Draw weather effects
         if weather_type == "rain":
@@ -107,40 +168,52 @@ class PlanetSimulation:
         # Draw particles
         self.effects.update()
         self.effects.draw(self.screen)
+        timer.lap("particles")
         
         # Draw UI
         if self.show_debug:
-            animal_counts = self.ecosystem.get_animal_counts()
-            breeding_count = self.ecosystem.get_breeding_count()
-            season = self.ecosystem.weather.get_season()
-            weather = self.ecosystem.weather.current_weather
-            temp = int(self.ecosystem.weather.temperature)
+            animal_counts = snapshot.counts
+            breeding_count = snapshot.breeding_count
             
             self.hud.draw_info(
                 self.screen,
                 int(self.clock.get_fps()),
-                self.ecosystem.get_time_seconds(),
-                self.ecosystem.get_total_animals(),
+                snapshot.time_seconds,
+                len(snapshot.animals),
                 animal_counts,
                 self.paused,
-                breeding_count
+                breeding_count,
+                self.profiler.breakdown() if timer is not NULL_TIMER else None,
+                "recording trace" if self.profiler.recording else self.trace_path
             )
             
             species_end_y = self.hud.draw_species_list(self.screen, animal_counts)
             self.hud.draw_controls(self.screen, species_end_y + 20)
             
             # Draw minimap
-            self.minimap.draw(self.screen, self.camera.position, self.ecosystem.animals, self.ecosystem.planet)
+            self.minimap.draw(self.screen, self.camera.position, animals, self.ecosystem.planet)
+        timer.lap("hud")
         
         self.renderer.update_display()
+        timer.lap("present")
     
     def run(self):
         """Main simulation loop"""
+        if self.threaded:
+            self.loop.start()
         running = True
         while running:
+            frame_seconds = self.clock.tick(FPS) / 1000
+            timer = self.frame_timer
+            timer.begin()
             running = self.handle_input()
-            self.update()
+            timer.lap("input")
+            self.update(frame_seconds)
+            timer.lap("simulate")
             self.draw()
-            self.clock.tick(FPS)
         
+        if self.profiler.recording:
+            self.toggle_trace()
+        self.loop.stop()
+        self.ecosystem.planet.close()
         pygame.quit()
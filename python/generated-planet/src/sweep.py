@@ -0,0 +1,186 @@
+"""Parameter sweeps - independent ecosystems on a process pool, aggregated into percentile bands"""
+
+import argparse
+import ast
+import itertools
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import numpy as np
+from .core.ecosystem import Ecosystem
+from .core.population import SPECIES, SPECIES_IDS
+from .engine.behaviors import BehaviorEngine, ReproductionEngine
+from .utils import constants
+
+PACKAGE = __name__.rsplit(".", 1)[0]
+
+def apply_overrides(overrides: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Rebind constants in every loaded module of the package, returns what to restore
+
+    Modules import constants by value, so each module's own binding is replaced.
+    Defaults already baked into function signatures are not affected.
+    """
+    previous: Dict[str, Dict[str, Any]] = {}
+    for name, value in overrides.items():
+        if not hasattr(constants, name):
+            raise KeyError(f"Unknown constant: {name}")
+        for module_name, module in list(sys.modules.items()):
+            if module is None or not (module_name == PACKAGE or module_name.startswith(PACKAGE + ".")):
+                continue
+            if name in vars(module):
+                previous.setdefault(module_name, {})[name] = vars(module)[name]
+                setattr(module, name, value)
+    return previous
+
+def restore_overrides(previous: Dict[str, Dict[str, Any]]):
+    for module_name, names in previous.items():
+        module = sys.modules[module_name]
+        for name, value in names.items():
+            setattr(module, name, value)
+
+def run_one(config: str, overrides: Dict[str, Any], seed: int, ticks: int, sample_every: int) -> Dict:
+    """One ecosystem run; returns per-sample species counts as a compact uint32 array"""
+    previous = apply_overrides(overrides)
+    try:
+        start = time.perf_counter()
+        ecosystem = Ecosystem(seed=seed, chunk_workers=0, region_dir=None)
+        try:
+            behavior_engine = BehaviorEngine()
+            reproduction_engine = ReproductionEngine()
+            counts = np.zeros((ticks // sample_every + 1, len(SPECIES)), dtype=np.uint32)
+
+            def sample(row: int):
+                for species, count in ecosystem.get_animal_counts().items():
+                    counts[row, SPECIES_IDS[species]] = count
+
+            sample(0)
+            for tick in range(1, ticks + 1):
+                ecosystem.update(behavior_engine, reproduction_engine)
+                if tick % sample_every == 0:
+                    sample(tick // sample_every)
+        finally:
+            ecosystem.planet.close()
+        return {"config": config, "seed": seed, "counts": counts, "elapsed": time.perf_counter() - start}
+    finally:
+        restore_overrides(previous)
+
+def percentile_bands(counts: np.ndarray, percentiles: Sequence[float]) -> Dict[str, np.ndarray]:
+    """counts is (runs, samples, species); bands are (len(percentiles), samples) per series"""
+    bands = {"total": np.percentile(counts.sum(axis=2), percentiles, axis=0)}
+    for i, species in enumerate(SPECIES):
+        if counts[:, :, i].any():
+            bands[species] = np.percentile(counts[:, :, i], percentiles, axis=0)
+    return bands
+
+class SweepResult:
+    """All runs of one configuration"""
+
+    def __init__(self, config: str, overrides: Dict[str, Any], sample_every: int):
+        self.config = config
+        self.overrides = overrides
+        self.sample_every = sample_every
+        self.seeds: List[int] = []
+        self.runs: List[np.ndarray] = []
+        self.elapsed: List[float] = []
+
+    def add(self, run: Dict):
+        self.seeds.append(run["seed"])
+        self.runs.append(run["counts"])
+        self.elapsed.append(run["elapsed"])
+
+    def bands(self, percentiles: Sequence[float] = (10, 50, 90)) -> Dict[str, np.ndarray]:
+        return percentile_bands(np.stack(self.runs), percentiles)
+
+    def to_dict(self, percentiles: Sequence[float] = (10, 50, 90)) -> Dict:
+        return {
+            "config": self.config,
+            "overrides": {k: repr(v) for k, v in self.overrides.items()},
+            "seeds": self.seeds,
+            "sample_every": self.sample_every,
+            "percentiles": list(percentiles),
+            "bands": {name: band.tolist() for name, band in self.bands(percentiles).items()},
+        }
+
+def config_grid(sets: Dict[str, List[Any]]) -> Dict[str, Dict[str, Any]]:
+    """Cartesian product of constant values, keyed by a readable name"""
+    if not sets:
+        return {"baseline": {}}
+    names = list(sets)
+    grid = {}
+    for values in itertools.product(*(sets[name] for name in names)):
+        overrides = dict(zip(names, values))
+        grid[", ".join(f"{k}={v!r}" for k, v in overrides.items())] = overrides
+    return grid
+
+def run_sweep(configs: Dict[str, Dict[str, Any]], seeds: Sequence[int], ticks: int,
+              workers: Optional[int] = None, sample_every: int = 10,
+              on_result: Optional[Callable[[Dict], None]] = None) -> Dict[str, SweepResult]:
+    """Run every (config, seed) pair on its own worker process
+
+    Results arrive as each run finishes; on_result sees them in completion order.
+    Workers are replaced after every run when the interpreter supports it, so
+    memory stays bounded by one ecosystem per worker.
+    """
+    pool_options = {"max_workers": workers}
+    if sys.version_info >= (3, 11):
+        pool_options["max_tasks_per_child"] = 1
+
+    results = {name: SweepResult(name, overrides, sample_every) for name, overrides in configs.items()}
+    with ProcessPoolExecutor(**pool_options) as pool:
+        futures = [pool.submit(run_one, name, overrides, seed, ticks, sample_every)
+                   for name, overrides in configs.items() for seed in seeds]
+        for future in as_completed(futures):
+            run = future.result()
+            results[run["config"]].add(run)
+            if on_result is not None:
+                on_result(run)
+    return results
+
+def parse_set(option: str):
+    name, _, value = option.partition("=")
+    if not value:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got {option!r}")
+    try:
+        return name.strip(), ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return name.strip(), value
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run seeds x constant overrides on a process pool")
+    parser.add_argument("--seeds", type=int, default=8, help="runs per configuration, seeds 0..N-1")
+    parser.add_argument("--ticks", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, default one per core")
+    parser.add_argument("--sample-every", type=int, default=10, help="ticks between population samples")
+    parser.add_argument("--set", dest="sets", type=parse_set, action="append", default=[],
+                        metavar="NAME=VALUE", help="constant override, repeat a NAME to sweep several values")
+    parser.add_argument("--json", metavar="PATH", help="write percentile bands as JSON")
+    args = parser.parse_args(argv)
+
+    sets: Dict[str, List[Any]] = {}
+    for name, value in args.sets:
+        sets.setdefault(name, []).append(value)
+    configs = config_grid(sets)
+
+    def progress(run: Dict):
+        final = int(run["counts"][-1].sum())
+        print(f"  {run['config']} seed {run['seed']}: {final} animals at tick {args.ticks} "
+              f"({run['elapsed']:.1f} s)", flush=True)
+
+    start = time.perf_counter()
+    results = run_sweep(configs, range(args.seeds), args.ticks, args.workers, args.sample_every, progress)
+    elapsed = time.perf_counter() - start
+    runs = len(configs) * args.seeds
+    print(f"{runs} runs in {elapsed:.1f} s ({runs * args.ticks / elapsed:.0f} ticks/s overall)")
+
+    for result in results.values():
+        p10, p50, p90 = result.bands()["total"][:, -1]
+        print(f"{result.config}: final population p10 {p10:.0f}, median {p50:.0f}, p90 {p90:.0f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([result.to_dict() for result in results.values()], f, indent=2)
+
+if __name__ == "__main__":
+    main()
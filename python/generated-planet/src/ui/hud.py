@@ -1,6 +1,7 @@
 """UI rendering module - handles HUD and interface"""
 
 import pygame
+from typing import List, Optional, Tuple
 from ..utils.constants import WINDOW_WIDTH, WINDOW_HEIGHT
 
 class HUD:
@@ -11,8 +12,9 @@ class HUD:
         self.small_font = pygame.font.Font(None, 16)
     
     def draw_info(self, surface: pygame.Surface, fps: int, time_seconds: int, 
-                  total_animals: int, animal_counts: dict, paused: bool, breeding_count: int):
-        """Draw main info panel"""
+                  total_animals: int, animal_counts: dict, paused: bool, breeding_count: int,
+                  profile: Optional[List[Tuple[str, str, float]]] = None, trace_status: str = ""):
+        """Draw main info panel, plus the profiler breakdown when given one"""
         info = [
             f"FPS: {fps} | Time: {time_seconds}s | Breeding: {breeding_count}",
             f"Total Animals: {total_animals} | Status: {'PAUSED' if paused else 'RUNNING'}",
@@ -22,6 +24,35 @@ class HUD:
         for i, text in enumerate(info):
             text_surface = self.font.render(text, True, (0, 0, 0))
             surface.blit(text_surface, (10, y_offset + i * 22))
+        
+        if profile:
+            self.draw_profile(surface, profile, trace_status)
+    
+    def draw_profile(self, surface: pygame.Surface, profile: List[Tuple[str, str, float]],
+                     trace_status: str = "", width: int = 260, start_y: int = 170):
+        """Rolling mean ms per frame of each phase, with bars scaled to one 60 FPS frame
+        
+        trace_status (e.g. the last trace written) is shown under the breakdown.
+        """
+        x = WINDOW_WIDTH - width - 10
+        height = 28 + 16 * len(profile) + (16 if trace_status else 0)
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 160))
+        surface.blit(panel, (x, start_y))
+        surface.blit(self.small_font.render("Profile (ms per frame / tick)  F4 trace", True, (255, 255, 255)),
+                     (x + 6, start_y + 6))
+        
+        budget = 1000 / 60
+        y = start_y + 24
+        for track, phase, ms in profile:
+            bar = int(min(1.0, ms / budget) * 80)
+            color = (255, 120, 80) if ms > budget / 4 else (120, 220, 120)
+            pygame.draw.rect(surface, color, (x + width - 86, y + 3, max(1, bar), 8))
+            label = f"{track[:3]} {phase:<10} {ms:6.2f}"
+            surface.blit(self.small_font.render(label, True, (255, 255, 255)), (x + 6, y))
+            y += 16
+        if trace_status:
+            surface.blit(self.small_font.render(trace_status, True, (200, 200, 200)), (x + 6, y))
     
     def draw_species_list(self, surface: pygame.Surface, animal_counts: dict, start_y: int = 60):
         """Draw list of species and counts"""
@@ -46,6 +77,7 @@ class HUD:
             "WASD - Move | SPACE/SHIFT - Up/Down | P - Pause",
             "Arrow Keys - Rotate | R/F - Tilt | H - Toggle Info",
             "UP/DOWN - Zoom | Magenta circle = Breeding",
+            "F3 - Profiler | F4 - Record trace",
         ]
         
         y_offset = start_y + 25
@@ -74,8 +106,8 @@ class Minimap:
         
         # Draw animals
         for animal in animals:
-            px = int(self.x + (animal.position.x + 50) * scale)
-            py = int(self.y + (animal.position.z + 50) * scale)
+            px = int(self.x + (animal.x + 50) * scale)
+            py = int(self.y + (animal.z + 50) * scale)
             
             if 0 <= px < self.x + self.width and 0 <= py < self.y + self.height:
                 pygame.draw.circle(surface, animal.color, (px, py), 2)
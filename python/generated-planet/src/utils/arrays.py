@@ -0,0 +1,16 @@
+"""NumPy helpers shared by the vectorized population systems"""
+
+import random
+from typing import List, TYPE_CHECKING
+import numpy as np
+
+if TYPE_CHECKING:
+    from ..core.animal import Animal
+
+def positions(animals: List['Animal']) -> np.ndarray:
+    """(n, 3) array of animal positions"""
+    return np.array([(a.position.x, a.position.y, a.position.z) for a in animals], dtype=np.float64)
+
+def draw_rng() -> np.random.Generator:
+    """NumPy generator seeded from the global random stream, so checkpoints and seeds still cover it"""
+    return np.random.default_rng(random.getrandbits(64))
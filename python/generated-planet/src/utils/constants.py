@@ -1,14 +1,34 @@
+import os
+
 # Window settings
 WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 800
 FPS = 60
+SIM_TICK_RATE = 60  # simulation ticks per second of wall clock, independent of FPS
+SIM_MAX_STEPS_PER_FRAME = 5  # catch-up ticks per frame before simulated time is allowed to slip
+SIM_THREADED = False  # tick the simulation on its own thread instead of between frames
+LOD_RADIUS = 96  # beyond this distance from the focus animals behave in coarse steps; keep it at least
+                 # RENDER_DISTANCE plus one coarse step (max speed 2.0 * LOD_INTERVAL) so no jump is drawn
+LOD_INTERVAL = 8  # ticks per coarse step, staggered by entity id
+PROFILER_WINDOW = 120  # frames averaged in the profiler overlay
+PROFILER_MAX_TRACE_EVENTS = 500000  # spans kept per recorded trace
 
 # Planet settings - reduced for performance
 CHUNK_SIZE = 16
 WORLD_HEIGHT = 16
 TERRAIN_SCALE = 0.1
 RENDER_DISTANCE = 80  # Only render blocks within this distance
+CHUNK_WORKERS = 2  # background chunk generation workers, 0 generates inline
+CHUNK_PREFETCH_RADIUS = 2  # chunks queued around the camera and each animal
+CHUNK_STREAM_DELAY = 10  # ticks between queueing a chunk and applying it, workers or not
+REGION_SIZE = 8  # chunks per side of an on-disk region file
+# Terrain cache and per-run chunk pages for the app and the headless CLI; the library
+# (Ecosystem, run_headless) keeps chunks in memory unless given a region_dir
+REGION_CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                                "generated-planet", "regions")
+MAX_LOADED_CHUNKS = 400  # least recently used chunks beyond this are paged out to disk
 SURFACE_ONLY = True  # Only render surface blocks
+GRASS_REGROWTH_CHANCE = 0.05  # per generated chunk and tick: one random column's exposed dirt turns to grass
 
 # Block types
 class BlockType:
@@ -48,18 +68,25 @@ class AnimalTypes:
     DUCK = "duck"
     TURTLE = "turtle"
 
+# Species that swim while there is water under them
+WATER_ANIMALS = (AnimalTypes.FISH, AnimalTypes.TURTLE, AnimalTypes.DUCK)
+
+# Species that flock (birds) or herd (deer) when they have nothing else to do, see engine/flocking.py
+FLOCKING_ANIMALS = (AnimalTypes.BIRD, AnimalTypes.EAGLE, AnimalTypes.DUCK, AnimalTypes.DEER)
+
 # Animal colors and settings
+# "replan" is the number of ticks an animal keeps its target before looking for a better one
 ANIMAL_CONFIGS = {
-    AnimalTypes.RABBIT: {"color": (200, 200, 200), "speed": 0.8, "energy": 100, "vision": 25},
-    AnimalTypes.DEER: {"color": (139, 69, 19), "speed": 1.0, "energy": 150, "vision": 40},
-    AnimalTypes.MOUSE: {"color": (100, 100, 100), "speed": 0.6, "energy": 50, "vision": 15},
-    AnimalTypes.WOLF: {"color": (200, 50, 50), "speed": 1.2, "energy": 200, "vision": 50},
-    AnimalTypes.FOX: {"color": (255, 165, 0), "speed": 1.1, "energy": 180, "vision": 45},
-    AnimalTypes.BIRD: {"color": (255, 200, 0), "speed": 1.5, "energy": 60, "vision": 60},
-    AnimalTypes.EAGLE: {"color": (139, 69, 19), "speed": 2.0, "energy": 120, "vision": 80},
-    AnimalTypes.DUCK: {"color": (0, 100, 150), "speed": 1.3, "energy": 70, "vision": 35},
-    AnimalTypes.FISH: {"color": (255, 100, 0), "speed": 0.9, "energy": 40, "vision": 20},
-    AnimalTypes.TURTLE: {"color": (100, 100, 0), "speed": 0.4, "energy": 80, "vision": 20},
+    AnimalTypes.RABBIT: {"color": (200, 200, 200), "speed": 0.8, "energy": 100, "vision": 25, "replan": 8},
+    AnimalTypes.DEER: {"color": (139, 69, 19), "speed": 1.0, "energy": 150, "vision": 40, "replan": 8},
+    AnimalTypes.MOUSE: {"color": (100, 100, 100), "speed": 0.6, "energy": 50, "vision": 15, "replan": 8},
+    AnimalTypes.WOLF: {"color": (200, 50, 50), "speed": 1.2, "energy": 200, "vision": 50, "replan": 4},
+    AnimalTypes.FOX: {"color": (255, 165, 0), "speed": 1.1, "energy": 180, "vision": 45, "replan": 4},
+    AnimalTypes.BIRD: {"color": (255, 200, 0), "speed": 1.5, "energy": 60, "vision": 60, "replan": 6},
+    AnimalTypes.EAGLE: {"color": (139, 69, 19), "speed": 2.0, "energy": 120, "vision": 80, "replan": 4},
+    AnimalTypes.DUCK: {"color": (0, 100, 150), "speed": 1.3, "energy": 70, "vision": 35, "replan": 6},
+    AnimalTypes.FISH: {"color": (255, 100, 0), "speed": 0.9, "energy": 40, "vision": 20, "replan": 6},
+    AnimalTypes.TURTLE: {"color": (100, 100, 0), "speed": 0.4, "energy": 80, "vision": 20, "replan": 12},
 }
 
 # Initial animal counts - reduced for performance
@@ -76,6 +103,14 @@ INITIAL_ANIMALS = {
     AnimalTypes.TURTLE: 2,
 }
 
+# Population
+ANIMAL_MAX_AGE = 3000  # frames
+TARGET_REPLAN_INTERVAL = 8  # ticks between target searches for species without a "replan" entry
+EAT_REACH = 2  # blocks from a predator to the prey it kills; herbivores graze their target wherever it is
+ANIMAL_ENERGY_DRAIN = 0.2  # energy lost per frame per unit of speed
+USE_POPULATION_STORE = True  # keep per-tick animal state in NumPy columns
+ANIMAL_POOL_LIMIT = 10000  # dead animals kept for reuse by later births
+
 # Camera settings
 DEFAULT_ZOOM = 1.2
 CAMERA_DISTANCE = 300
@@ -170,6 +205,28 @@ MIGRATION_DISTANCE = 30
 MIGRATION_THRESHOLD_POPULATION = 10
 MIGRATION_FOOD_THRESHOLD = 0.3  # food abundance
 
+# Spatial indexing
+FOOD_INDEX_CELL_SIZE = 4  # edible block buckets, must divide CHUNK_SIZE
+ANIMAL_GRID_CELL_SIZE = 10  # animal spatial hash cell width
+ANIMAL_GRID_SLACK = 2.0  # max distance an animal moves between grid rebuilds (speed is clamped to 2.0)
+
+# Navigation
+FLOW_FIELD_MARGIN = 2  # chunks around a chunk searched for goals by its flow fields
+FLOW_FIELD_MAX_CLIMB = 1  # highest step up or down between neighbouring columns an animal can walk
+FLOW_FIELD_CACHE_LIMIT = 4096  # cached fields before the cache is emptied
+
+# Flocking
+FLOCK_RADIUS = 12  # flockmates of the same species within this distance steer together
+FLOCK_SEPARATION = 3  # flockmates closer than this push each other apart
+FLOCK_COHESION = 0.02  # weight of the pull toward the flockmates' centre (a vector up to FLOCK_RADIUS long)
+FLOCK_ALIGNMENT = 0.5  # weight of the flockmates' mean heading
+FLOCK_AVOIDANCE = 1.0  # weight of separation, which grows as 1 / distance
+FLOCK_WANDER = 0.2  # weight of per-tick random steering
+
+# Domain decomposition
+DOMAIN_CHUNKS = 4  # chunks per side of a worker's region
+DOMAIN_HALO = 16  # border strip, in blocks, copied to neighbouring workers each tick
+
 # Plant growth
 PLANT_GROWTH_CHANCE = 0.05  # per frame per grass block
 PLANT_MAX_AGE = 1000  # frames
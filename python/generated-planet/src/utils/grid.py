@@ -0,0 +1,100 @@
+"""Uniform grid helpers shared by the spatial indexes"""
+
+from typing import Dict, Iterator, Tuple
+import numpy as np
+
+BRUTE_FORCE_POINTS = 64  # neighbour_pairs compares all pairs directly up to this many points
+
+def ring_cells(cx: int, cz: int, ring: int) -> Iterator[Tuple[int, int]]:
+    """Cell keys at Chebyshev distance ring from (cx, cz)"""
+    if ring == 0:
+        yield (cx, cz)
+        return
+    for dx in range(-ring, ring + 1):
+        yield (cx + dx, cz - ring)
+        yield (cx + dx, cz + ring)
+    for dz in range(-ring + 1, ring):
+        yield (cx - ring, cz + dz)
+        yield (cx + ring, cz + dz)
+
+def bucket(points: np.ndarray, cell_size: float) -> Dict[Tuple[int, int], np.ndarray]:
+    """Row indexes of an (n, 3) array of points grouped by (x, z) cell"""
+    if not len(points):
+        return {}
+    keys = np.floor(points[:, [0, 2]] / cell_size).astype(np.int64)
+    order = np.lexsort((keys[:, 1], keys[:, 0]))
+    sorted_keys = keys[order]
+    starts = np.concatenate(([0], np.flatnonzero((np.diff(sorted_keys, axis=0) != 0).any(axis=1)) + 1))
+    ends = np.append(starts[1:], len(order))
+    return {(int(k[0]), int(k[1])): order[start:end]
+            for k, start, end in zip(sorted_keys[starts].tolist(), starts, ends)}
+
+def neighbour_counts(points: np.ndarray, sources: np.ndarray, radius: float) -> np.ndarray:
+    """How many of sources lie strictly within radius of each of points, both (n, 3) arrays
+    
+    Both sides are bucketed into cells of width radius, so each cell of points
+    is only tested against the sources in the 3 x 3 cells around it.
+    """
+    counts = np.zeros(len(points), dtype=np.int64)
+    if not len(points) or not len(sources):
+        return counts
+    source_cells = bucket(sources, radius)
+    radius_sq = radius * radius
+    for (cx, cz), rows in bucket(points, radius).items():
+        near = [source_cells[key] for ring in (0, 1) for key in ring_cells(cx, cz, ring)
+                if key in source_cells]
+        if not near:
+            continue
+        candidates = sources[np.concatenate(near)]
+        offsets = points[rows, None, :] - candidates[None, :, :]
+        counts[rows] = ((offsets * offsets).sum(axis=2) < radius_sq).sum(axis=1)
+    return counts
+
+def neighbour_pairs(points: np.ndarray, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Row indexes (i, j) of every ordered pair of distinct points of an (n, 3) array strictly within radius
+    
+    Points are sorted by (x, z) cell of width radius. Each point finds the run of
+    points in a neighbouring cell with one searchsorted, for its own cell and the
+    four neighbours on one side; the other four are covered by flipping those
+    pairs, so there is no per-cell Python loop and each pair is tested once.
+    """
+    empty = np.zeros(0, dtype=np.int64)
+    if len(points) < 2:
+        return empty, empty
+    radius_sq = radius * radius
+    if len(points) <= BRUTE_FORCE_POINTS:
+        offsets = points[:, None, :] - points[None, :, :]
+        near = (offsets * offsets).sum(axis=2) < radius_sq
+        np.fill_diagonal(near, False)
+        return np.nonzero(near)
+    keys = np.floor(points[:, [0, 2]] / radius).astype(np.int64)
+    keys -= keys.min(axis=0) - 1  # a free row and column on each side, so offsets never wrap
+    width = int(keys[:, 1].max()) + 2
+    cell = keys[:, 0] * width + keys[:, 1]
+    order = np.argsort(cell, kind="stable")
+    sorted_cells = cell[order]
+    coords = [np.ascontiguousarray(points[:, axis]) for axis in range(3)]
+    firsts, seconds = [empty], [empty]
+    for dx, dz in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+        target = cell + dx * width + dz
+        starts = np.searchsorted(sorted_cells, target, side="left")
+        counts = np.searchsorted(sorted_cells, target, side="right") - starts
+        total = int(counts.sum())
+        if not total:
+            continue
+        i = np.repeat(np.arange(len(points)), counts)
+        run_starts = np.repeat(np.cumsum(counts) - counts, counts)
+        j = order[np.repeat(starts, counts) + np.arange(total) - run_starts]
+        if dx == 0 and dz == 0:
+            ahead = i < j
+            i, j = i[ahead], j[ahead]
+        distance_sq = np.zeros(len(i))
+        for coord in coords:
+            offset = coord[i] - coord[j]
+            distance_sq += offset * offset
+        near = distance_sq < radius_sq
+        firsts.append(i[near])
+        seconds.append(j[near])
+    i = np.concatenate(firsts)
+    j = np.concatenate(seconds)
+    return np.concatenate([i, j]), np.concatenate([j, i])
@@ -0,0 +1,138 @@
+"""Phase timing - wall-clock time per named phase of a tick, and the frame profiler built on it"""
+
+import json
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from .constants import PROFILER_WINDOW, PROFILER_MAX_TRACE_EVENTS
+
+class PhaseTimer:
+    """Lap timer: begin() at the start of a tick, lap(name) after each phase"""
+
+    def __init__(self):
+        self.totals: Dict[str, float] = {}  # seconds per phase, insertion order = phase order
+        self.ticks = 0
+        self._last = 0.0
+
+    def begin(self):
+        self.ticks += 1
+        self._last = time.perf_counter()
+
+    def lap(self, phase: str):
+        """Charge the time since the previous lap (or begin) to phase"""
+        now = time.perf_counter()
+        self.totals[phase] = self.totals.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """Per phase: total ms, mean ms per tick and share of the timed total"""
+        total = sum(self.totals.values()) or 1.0
+        ticks = max(1, self.ticks)
+        return {phase: {"total_ms": seconds * 1000,
+                        "ms_per_tick": seconds * 1000 / ticks,
+                        "share": seconds / total}
+                for phase, seconds in self.totals.items()}
+
+class NullTimer:
+    """PhaseTimer stand-in that records nothing"""
+
+    def begin(self):
+        pass
+
+    def lap(self, phase: str):
+        pass
+
+NULL_TIMER = NullTimer()
+
+class ProfileTrack(PhaseTimer):
+    """PhaseTimer for one thread of a Profiler, keeping a rolling window of frames and trace spans"""
+
+    def __init__(self, profiler: 'Profiler', name: str, tid: int):
+        super().__init__()
+        self.profiler = profiler
+        self.name = name
+        self.tid = tid
+        self.frames: Deque[Dict[str, float]] = deque(maxlen=profiler.window)  # ms per phase, per frame
+        self._frame: Dict[str, float] = {}
+        self._lock = threading.Lock()  # the owning thread appends frames while others read the window
+
+    def begin(self):
+        if self._frame:
+            with self._lock:
+                self.frames.append(self._frame)
+            self._frame = {}
+        super().begin()
+
+    def lap(self, phase: str):
+        start = self._last
+        super().lap(phase)
+        elapsed = self._last - start
+        self._frame[phase] = self._frame.get(phase, 0.0) + elapsed * 1000
+        trace = self.profiler.trace
+        if trace is not None and len(trace) < self.profiler.max_trace_events:
+            trace.append((phase, self.tid, start, elapsed))
+
+    def rolling(self) -> Dict[str, float]:
+        """Mean ms per frame of each phase over the window, safe to call from any thread"""
+        with self._lock:
+            frames = list(self.frames)
+        if not frames:
+            return {}
+        totals: Dict[str, float] = {}
+        for frame in frames:
+            for phase, ms in frame.items():
+                totals[phase] = totals.get(phase, 0.0) + ms
+        return {phase: ms / len(frames) for phase, ms in totals.items()}
+
+class Profiler:
+    """Named ProfileTracks (one per thread that laps), rolling breakdowns and Chrome trace export
+
+    Hand a track to anything that takes a PhaseTimer; while profiling is off,
+    hand it NULL_TIMER instead and nothing is measured.
+    """
+
+    def __init__(self, window: int = PROFILER_WINDOW, max_trace_events: int = PROFILER_MAX_TRACE_EVENTS):
+        self.window = window
+        self.max_trace_events = max_trace_events
+        self.tracks: Dict[str, ProfileTrack] = {}
+        self.trace: Optional[List[Tuple[str, int, float, float]]] = None  # (phase, tid, start s, duration s)
+        self.trace_started = 0.0
+
+    def track(self, name: str) -> ProfileTrack:
+        track = self.tracks.get(name)
+        if track is None:
+            track = self.tracks[name] = ProfileTrack(self, name, len(self.tracks) + 1)
+        return track
+
+    def breakdown(self) -> List[Tuple[str, str, float]]:
+        """(track, phase, mean ms per frame) for every phase seen in the window"""
+        return [(track.name, phase, ms) for track in list(self.tracks.values())
+                for phase, ms in track.rolling().items()]
+
+    @property
+    def recording(self) -> bool:
+        return self.trace is not None
+
+    def start_trace(self):
+        """Record every span from now on, up to max_trace_events"""
+        self.trace = []
+        self.trace_started = time.perf_counter()
+
+    def stop_trace(self) -> List[Tuple[str, int, float, float]]:
+        trace, self.trace = self.trace or [], None
+        return trace
+
+    def export_chrome_trace(self, path: str, events: Optional[List[Tuple[str, int, float, float]]] = None):
+        """Write spans as Chrome trace-event JSON, viewable in chrome://tracing or Perfetto"""
+        if events is None:
+            events = self.trace or []
+        origin = self.trace_started
+        trace_events = [{"name": "thread_name", "ph": "M", "pid": 1, "tid": track.tid,
+                         "args": {"name": track.name}} for track in self.tracks.values()]
+        names = {track.tid: track.name for track in self.tracks.values()}
+        trace_events += [{"name": phase, "cat": names.get(tid, ""), "ph": "X", "pid": 1, "tid": tid,
+                          "ts": (start - origin) * 1e6, "dur": duration * 1e6}
+                         for phase, tid, start, duration in events]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
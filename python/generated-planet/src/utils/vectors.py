@@ -3,7 +3,12 @@ from dataclasses import dataclass
 
 @dataclass
 class Vector3:
-    """3D vector class"""
+    """3D vector class
+    
+    Operators return new vectors; the i-prefixed methods and +=, -=, *= update
+    in place, and the *_sq queries allocate nothing.
+    """
+    __slots__ = ("x", "y", "z")
     x: float
     y: float
     z: float
@@ -20,17 +25,79 @@ class Vector3:
     def __truediv__(self, scalar):
         return Vector3(self.x / scalar, self.y / scalar, self.z / scalar)
     
+    def __iadd__(self, other):
+        self.x += other.x
+        self.y += other.y
+        self.z += other.z
+        return self
+    
+    def __isub__(self, other):
+        self.x -= other.x
+        self.y -= other.y
+        self.z -= other.z
+        return self
+    
+    def __imul__(self, scalar):
+        self.x *= scalar
+        self.y *= scalar
+        self.z *= scalar
+        return self
+    
+    def copy(self):
+        return Vector3(self.x, self.y, self.z)
+    
+    def set(self, x: float, y: float, z: float):
+        self.x = x
+        self.y = y
+        self.z = z
+        return self
+    
+    def iadd_scaled(self, x: float, y: float, z: float, scalar: float):
+        """self += (x, y, z) * scalar"""
+        self.x += x * scalar
+        self.y += y * scalar
+        self.z += z * scalar
+        return self
+    
     def normalize(self):
         length = self.length()
         if length == 0:
             return Vector3(0, 0, 0)
         return self / length
     
+    def inormalize(self):
+        length = self.length()
+        if length == 0:
+            return self.set(0, 0, 0)
+        return self.set(self.x / length, self.y / length, self.z / length)
+    
     def length(self):
-        return math.sqrt(self.x**2 + self.y**2 + self.z**2)
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+    
+    def length_sq(self):
+        return self.x * self.x + self.y * self.y + self.z * self.z
     
     def distance_to(self, other):
-        return (self - other).length()
+        return math.sqrt(self.distance_sq_to(other))
+    
+    def distance_sq_to(self, other):
+        dx = self.x - other.x
+        dy = self.y - other.y
+        dz = self.z - other.z
+        return dx * dx + dy * dy + dz * dz
+    
+    def step_towards(self, target, step: float):
+        """Move step units along the direction to target, in place"""
+        dx = target.x - self.x
+        dy = target.y - self.y
+        dz = target.z - self.z
+        length = math.sqrt(dx * dx + dy * dy + dz * dz)
+        if length != 0:
+            scale = step / length
+            self.x += dx * scale
+            self.y += dy * scale
+            self.z += dz * scale
+        return self
     
     def dot(self, other):
         return self.x * other.x + self.y * other.y + self.z * other.z
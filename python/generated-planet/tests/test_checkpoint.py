@@ -0,0 +1,20 @@
+"""Animal records read from PopulationStore columns match the animals themselves"""
+
+from src.core.checkpoint import _animal_records
+from src.core.ecosystem import Ecosystem
+from src.engine.behaviors import BehaviorEngine, ReproductionEngine
+
+def test_store_records_match_animal_records():
+    eco = Ecosystem(seed=3, chunk_workers=0, region_dir=None)
+    behavior_engine, reproduction_engine = BehaviorEngine(), ReproductionEngine()
+    try:
+        for _ in range(100):
+            eco.update(behavior_engine, reproduction_engine)
+        from_store = _animal_records(eco)
+        population, eco.population = eco.population, None
+        from_animals = _animal_records(eco)
+        eco.population = population
+    finally:
+        eco.planet.close()
+    assert len(from_store) == len(eco.animals) > 0
+    assert from_store.tobytes() == from_animals.tobytes()
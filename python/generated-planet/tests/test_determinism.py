@@ -0,0 +1,62 @@
+"""Runs with the same seed must give the same world, whatever else is going on"""
+
+import os
+from typing import Tuple
+from src.core import ecosystem as ecosystem_module
+from src.core import planet as planet_module
+from src.core.ecosystem import Ecosystem
+from src.core.planet import Planet
+from src.core.terrain import GENERATOR_VERSION
+from src.engine.behaviors import BehaviorEngine, ReproductionEngine
+
+TICKS = 60
+
+def run(seed: int, ticks: int = TICKS, **options) -> Tuple[list, Planet]:
+    """Animal types and positions after ticks updates, and the (closed) planet"""
+    eco = Ecosystem(seed=seed, **options)
+    behavior_engine, reproduction_engine = BehaviorEngine(), ReproductionEngine()
+    try:
+        for _ in range(ticks):
+            eco.update(behavior_engine, reproduction_engine)
+        return [(a.animal_type, round(a.position.x, 6), round(a.position.z, 6)) for a in eco.animals], eco.planet
+    finally:
+        eco.planet.close()
+
+def test_reruns_reuse_cached_terrain(tmp_path, monkeypatch):
+    monkeypatch.setattr(ecosystem_module, "MAX_LOADED_CHUNKS", 8)  # page out on every tick
+    region_dir = str(tmp_path)
+    first, first_planet = run(7, chunk_workers=0, region_dir=region_dir)
+    second, second_planet = run(7, chunk_workers=0, region_dir=region_dir)
+    assert first_planet.terrain.hits == 0
+    assert second_planet.terrain.hits >= len(first_planet.chunks) > 0  # read back what the first run generated
+    assert first == second
+    # Each run's own pages are gone, the shared terrain stays
+    assert os.listdir(tmp_path) == [f"seed7-gen{GENERATOR_VERSION}"]
+
+    monkeypatch.setattr(planet_module, "GENERATOR_VERSION", GENERATOR_VERSION + 1)
+    third, third_planet = run(7, chunk_workers=0, region_dir=region_dir)
+    assert third_planet.terrain.hits == 0
+    assert third == first
+
+def stream(workers: int, ticks: int = 30) -> list:
+    """Chunk keys in the order they joined the world, after each tick of streaming"""
+    planet = Planet(seed=3, workers=workers)
+    try:
+        history = []
+        for tick in range(ticks):
+            if tick % 5 == 0:
+                planet.request_chunk(4 + tick // 5, -3)
+                planet.request_chunk(-4, 4 + tick // 5)
+            planet.stream_chunks()
+            history.append(list(planet.chunks.chunks))
+        return history
+    finally:
+        planet.close()
+
+def test_chunk_workers_do_not_change_streaming():
+    assert stream(workers=0) == stream(workers=2)
+
+def test_chunk_workers_do_not_change_results():
+    inline, _ = run(11, ticks=300, chunk_workers=0, region_dir=None)
+    threaded, _ = run(11, ticks=300, chunk_workers=2, region_dir=None)
+    assert inline == threaded
@@ -0,0 +1,57 @@
+"""Brood mutation stays within trait bounds, and traits survive Genetics and GenePool unchanged"""
+
+import numpy as np
+from src.core import genetics as genetics_module
+from src.core.genetics import TRAIT_BOUNDS, GenePool, Genetics
+
+TRAITS = ("speed", "vision", "stamina", "intelligence")  # the scalar arguments of Genetics.assign besides color
+
+def parents_at_bounds() -> GenePool:
+    """Parents sitting on the lower and upper bound of every trait, with black and white colours"""
+    pool = GenePool(8)
+    for side, color in ((0, (0, 0, 0)), (1, (255, 255, 255))):
+        bounds = {name: TRAIT_BOUNDS[name][side] for name in TRAITS}
+        for _ in range(4):
+            pool.append(Genetics.from_traits(bounds["speed"], color, bounds["vision"], bounds["stamina"],
+                                             bounds["intelligence"]))
+    return pool
+
+def test_offspring_traits_are_clamped(monkeypatch):
+    monkeypatch.setattr(genetics_module, "TRAIT_MUTATION_CHANCE", 1.0)
+    pool = parents_at_bounds()
+    rows = np.repeat(np.arange(pool.count), 50)
+    children = pool.offspring(rows, np.random.default_rng(0))
+    assert len(children) == len(rows)
+    for speed, color, vision, stamina, intelligence in children:
+        for name, value in zip(TRAITS, (speed, vision, stamina, intelligence)):
+            low, high = TRAIT_BOUNDS[name]
+            assert low <= value <= high
+        assert len(color) == 3 and all(0 <= channel <= 255 for channel in color)
+    # Mutation pushed against every bound, so clamping is what held them
+    for index, name in zip((0, 2, 3, 4), TRAITS):
+        assert {child[index] for child in children} >= set(TRAIT_BOUNDS[name])
+    assert {channel for child in children for channel in child[1]} >= {0, 255}
+
+def test_offspring_do_not_touch_parent_rows():
+    pool = parents_at_bounds()
+    before = {name: column[:pool.count].copy() for name, column in pool.traits.items()}
+    colors = pool.color[:pool.count].copy()
+    pool.offspring(np.arange(pool.count), np.random.default_rng(1))
+    assert all((pool.traits[name][:pool.count] == before[name]).all() for name in before)
+    assert (pool.color[:pool.count] == colors).all()
+
+def test_traits_round_trip():
+    pool = GenePool(4)
+    pool.append(Genetics.from_traits(1.3, (10, 20, 30), 42.5, 0.9, 1.1))
+    children = pool.offspring(np.array([0, 0, 0]), np.random.default_rng(2))
+
+    reused = Genetics()
+    for row, traits in enumerate(children, start=1):
+        made, assigned = Genetics.from_traits(*traits), reused.assign(*traits)
+        assert assigned is reused
+        for genetics in (made, assigned):
+            assert (genetics.speed, genetics.color, genetics.vision, genetics.stamina,
+                    genetics.intelligence) == traits
+        pool.append(made)
+        assert tuple(pool.color[row].tolist()) == traits[1]
+        assert [pool.traits[name][row] for name in TRAITS] == [traits[0], traits[2], traits[3], traits[4]]
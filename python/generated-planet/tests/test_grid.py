@@ -0,0 +1,50 @@
+"""Grid bucketing and neighbour pairs against a brute-force O(n^2) search"""
+
+import numpy as np
+import pytest
+from src.utils.grid import BRUTE_FORCE_POINTS, bucket, neighbour_pairs
+
+RADIUS = 5.0
+
+def brute_pairs(points: np.ndarray, radius: float) -> set:
+    return {(i, j) for i in range(len(points)) for j in range(len(points))
+            if i != j and float(np.sum((points[i] - points[j]) ** 2)) < radius * radius}
+
+def lattice(n: int, seed: int) -> np.ndarray:
+    """Integer points, so many sit exactly on cell boundaries and exactly RADIUS apart (0-5 and 3-4-5 offsets)"""
+    rng = np.random.default_rng(seed)
+    points = rng.integers(-15, 15, (n, 3)).astype(float)
+    points[:, 1] = rng.integers(0, 2, n)
+    return np.concatenate([points, [[0, 0, 0], [5, 0, 0], [0, 0, 5], [3, 0, 4], [-5, 0, -5], [0, 5, 0]]])
+
+def scatter(n: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-30, 30, (n, 3))
+
+@pytest.mark.parametrize("points", [lattice(20, 0), lattice(300, 1), scatter(BRUTE_FORCE_POINTS, 2),
+                                    scatter(BRUTE_FORCE_POINTS + 1, 3), scatter(500, 4)],
+                         ids=["lattice-small", "lattice-large", "scatter-at-limit", "scatter-over-limit",
+                              "scatter-large"])
+def test_neighbour_pairs_match_brute_force(points):
+    i, j = neighbour_pairs(points, RADIUS)
+    found = list(zip(i.tolist(), j.tolist()))
+    assert len(found) == len(set(found))  # each ordered pair once
+    assert set(found) == brute_pairs(points, RADIUS)
+
+def test_exactly_radius_apart_is_not_a_pair():
+    points = np.array([[0, 0, 0], [5, 0, 0], [0, 0, 5], [3, 0, 4], [0, 0, 4.999]] * 20, dtype=float)
+    i, j = neighbour_pairs(points, RADIUS)
+    assert len(points) > BRUTE_FORCE_POINTS
+    assert set(zip(i.tolist(), j.tolist())) == brute_pairs(points, RADIUS)
+    assert not any({i % 5, j % 5} in ({0, 1}, {0, 2}, {0, 3}) for i, j in zip(i.tolist(), j.tolist()))
+
+def test_bucket_groups_points_by_cell():
+    points = lattice(300, 5)
+    cells = bucket(points, RADIUS)
+    rows = np.sort(np.concatenate(list(cells.values())))
+    assert rows.tolist() == list(range(len(points)))  # every point in exactly one cell
+    for (cx, cz), members in cells.items():
+        for row in members:
+            x, _, z = points[row]
+            assert (cx * RADIUS <= x < (cx + 1) * RADIUS) and (cz * RADIUS <= z < (cz + 1) * RADIUS)
+    assert bucket(np.zeros((0, 3)), RADIUS) == {}
@@ -0,0 +1,82 @@
+"""Vectorized disease spread against a brute-force neighbour search, and disease retirement"""
+
+import itertools
+import numpy as np
+from src.core import health as health_module
+from src.core.animal import Animal
+from src.core.health import Disease, HealthSystem
+from src.utils.arrays import positions
+from src.utils.constants import AnimalTypes, DISEASE_SPREAD_RADIUS
+from src.utils.grid import neighbour_counts
+from src.utils.vectors import Vector3
+
+R = DISEASE_SPREAD_RADIUS
+
+def brute_counts(points: np.ndarray, sources: np.ndarray, radius: float) -> np.ndarray:
+    return np.array([sum(float(np.sum((p - s) ** 2)) < radius * radius for s in sources) for p in points],
+                    dtype=np.int64)
+
+def population() -> list:
+    """A fixed herd: a random scatter plus animals on cell boundaries and at exactly R from the origin"""
+    rng = np.random.default_rng(0)
+    points = rng.uniform(-2 * R, 2 * R, (40, 3)).tolist()
+    points += [[0, 0, 0], [R, 0, 0], [0, 0, -R], [R, 0, R], [-R, 0, 2 * R], [2 * R - 1e-9, 0, 0], [0, R, 0]]
+    types = itertools.cycle([AnimalTypes.RABBIT, AnimalTypes.DEER, AnimalTypes.WOLF])
+    return [Animal(animal_type, Vector3(*point)) for animal_type, point in zip(types, points)]
+
+def test_neighbour_counts_match_brute_force():
+    points = positions(population())
+    sources = points[::5]
+    assert neighbour_counts(points, sources, R).tolist() == brute_counts(points, sources, R).tolist()
+
+def test_spread_infects_the_animals_a_brute_force_search_would(monkeypatch):
+    animals = population()
+    disease = Disease("test")
+    carriers = animals[::5]
+    for animal in carriers:
+        disease.infect(animal)
+    healthy = [a for a in animals if a.disease is None]
+    counts = brute_counts(positions(healthy), positions(carriers), R)
+    exposed = np.flatnonzero(counts)
+    assert 0 < len(exposed) < len(healthy)
+
+    # Certain infection: exactly the exposed animals
+    monkeypatch.setattr(health_module, "DISEASE_INFECTION_CHANCE", 1.0)
+    disease.spread(animals, np.random.default_rng(1))
+    assert [i for i, a in enumerate(healthy) if a.disease is disease] == exposed.tolist()
+
+def test_spread_chance_grows_with_nearby_carriers(monkeypatch):
+    animals = population()
+    disease = Disease("test")
+    carriers = animals[::5]
+    for animal in carriers:
+        disease.infect(animal)
+    healthy = [a for a in animals if a.disease is None]
+    counts = brute_counts(positions(healthy), positions(carriers), R)
+    exposed = np.flatnonzero(counts)
+
+    monkeypatch.setattr(health_module, "DISEASE_INFECTION_CHANCE", 0.3)
+    draws = np.random.default_rng(2).random(len(exposed))
+    expected = exposed[draws < 1 - 0.7 ** counts[exposed]]
+    disease.spread(animals, np.random.default_rng(2))
+    assert [i for i, a in enumerate(healthy) if a.disease is disease] == expected.tolist()
+
+def test_diseases_without_carriers_are_retired(monkeypatch):
+    monkeypatch.setattr(health_module, "DISEASE_DEATH_CHANCE", 0.0)
+    monkeypatch.setattr(health_module, "DISEASE_INFECTION_CHANCE", 0.0)
+    lonely = Animal(AnimalTypes.RABBIT, Vector3(0, 0, 0))
+    herd = [Animal(AnimalTypes.DEER, Vector3(100 + i, 0, 0)) for i in range(3)]
+    system = HealthSystem()
+    system.create_outbreak([lonely], lonely)
+    system.create_outbreak(herd, herd[0])
+    recovering, lasting = system.active_diseases
+    lonely.disease_timer = 1
+
+    assert system.update([lonely] + herd) == []
+    assert lonely.disease is None
+    assert system.active_diseases == [lasting]
+    assert (recovering.carriers, lasting.carriers) == (0, 1)
+
+    monkeypatch.setattr(health_module, "DISEASE_DEATH_CHANCE", 100.0)  # every carrier dies
+    assert system.update(herd) == [herd[0]]
+    assert system.active_diseases == []
@@ -0,0 +1,36 @@
+"""Grass regrowth per chunk"""
+
+import numpy as np
+from src.core import planet as planet_module
+from src.core.planet import Planet
+from src.utils.constants import BlockType, CHUNK_SIZE
+
+def bare_surfaces(planet: Planet) -> list:
+    """Turn the top block of every column of every generated chunk to dirt"""
+    chunks = [chunk for chunk in planet.chunks if chunk.generated]
+    lx, lz = np.indices((CHUNK_SIZE, CHUNK_SIZE))
+    for chunk in chunks:
+        top = chunk.top_solid
+        solid = top >= 0
+        chunk.blocks[lx[solid], top[solid], lz[solid]] = BlockType.DIRT
+    return chunks
+
+def regrown(chunk) -> int:
+    top = chunk.top_solid
+    solid = top >= 0
+    lx, lz = np.nonzero(solid)
+    return int(np.count_nonzero(chunk.blocks[lx, top[solid], lz] == BlockType.GRASS))
+
+def test_regrowth_is_per_chunk(monkeypatch):
+    monkeypatch.setattr(planet_module, "GRASS_REGROWTH_CHANCE", 1.0)
+    planet = Planet(seed=5)
+    small = bare_surfaces(planet)
+    planet.update()
+    assert [regrown(chunk) for chunk in small] == [1] * len(small)
+
+    for chunk_x in range(3, 13):
+        planet.generate_chunk(chunk_x * CHUNK_SIZE, 0)
+    large = bare_surfaces(planet)
+    planet.update()
+    assert len(large) > len(small)
+    assert [regrown(chunk) for chunk in large] == [1] * len(large)
@@ -0,0 +1,81 @@
+"""Animals reused by AnimalPool must come back exactly like newly allocated ones"""
+
+from src.core.animal import Animal
+from src.core.genetics import Genetics
+from src.core.health import Disease
+from src.core.pool import AnimalPool
+from src.core.population import PopulationStore
+from src.core.registry import EntityRegistry
+from src.utils.constants import AnimalTypes
+from src.utils.vectors import Vector3
+
+TRAITS = (0.8, (1, 2, 3), 25.0, 1.5, 0.7)
+UNSET = object()
+
+def state(animal: Animal) -> dict:
+    """Every slot by its public name, with vectors and genetics as plain values and unset slots as UNSET"""
+    values = {}
+    for slot in Animal.__slots__:
+        if slot in ("_store", "_row"):
+            continue
+        name = slot[1:] if slot.startswith("_") else slot
+        value = getattr(animal, name, UNSET)
+        if isinstance(value, Vector3):
+            value = (value.x, value.y, value.z)
+        elif isinstance(value, Genetics):
+            value = tuple(getattr(value, trait) for trait in Genetics.__slots__)
+        values[name] = value
+    return values
+
+def used_animal(store: PopulationStore, registry: EntityRegistry) -> Animal:
+    """A wolf that lived a while - target cache, disease, pack, flocking heading, nest - then died"""
+    wolf = Animal(AnimalTypes.WOLF, Vector3(40, 7, -12))
+    store.add(wolf)
+    registry.add(wolf)
+    wolf.age, wolf.energy, wolf.breeding_cooldown, wolf.is_breeding = 900, 3.0, 12, True
+    wolf.heading_x, wolf.heading_z = 0.6, -0.8
+    wolf.planned, wolf.target_id, wolf.target_pos = True, 17, Vector3(1, 2, 3)
+    Disease("plague").infect(wolf)
+    wolf.pack = object()
+    wolf.nest_position, wolf.nest_construction = Vector3(40, 7, -12), 5
+    wolf.aggression, wolf.hunger_level, wolf.health = 0.9, 0.95, 0.1
+    wolf.genetics.assign(1.9, (255, 0, 0), 90.0, 0.4, 1.8)
+    store.remove(wolf)
+    registry.remove(wolf)
+    return wolf
+
+def test_released_animal_is_reset():
+    store, registry, pool = PopulationStore(), EntityRegistry(), AnimalPool()
+    parent = Animal(AnimalTypes.RABBIT, Vector3(0, 5, 0))
+    dead = used_animal(store, registry)
+    pool.release(registry.compact())
+    assert pool.free == [dead]
+
+    reused = pool.acquire(AnimalTypes.RABBIT, 3, 5, 4, parent, TRAITS)
+    fresh = Animal(AnimalTypes.RABBIT, Vector3(3, 5, 4), parent, Genetics.from_traits(*TRAITS))
+    assert reused is dead and pool.reused == 1
+    assert state(reused) == state(fresh)
+    assert state(reused)["health"] is UNSET  # as before its first infection
+    assert reused.home_range is not reused.position
+
+    # The same store columns and gene pool row as a newly allocated animal
+    store.add(reused)
+    other = PopulationStore()
+    other.add(fresh)
+    for name, column in store.columns.items():
+        assert column[reused._row] == other.columns[name][fresh._row], name
+    assert store.species[reused._row] == other.species[fresh._row]
+    assert (store.positions[reused._row] == other.positions[fresh._row]).all()
+    for name, column in store.genes.traits.items():
+        assert column[reused._row] == other.genes.traits[name][fresh._row], name
+    assert (store.genes.color[reused._row] == other.genes.color[fresh._row]).all()
+    assert registry.add(reused) != registry.add(fresh)
+
+def test_animals_still_in_a_store_are_not_released():
+    store, pool = PopulationStore(), AnimalPool()
+    animal = Animal(AnimalTypes.DEER, Vector3(0, 5, 0))
+    store.add(animal)
+    pool.release([animal])
+    assert len(pool) == 0
+    assert pool.acquire(AnimalTypes.DEER, 0, 5, 0) is not animal
+    assert pool.allocated == 1
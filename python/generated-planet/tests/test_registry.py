@@ -0,0 +1,48 @@
+"""Kills are claimed during a tick and resolved once, ids are never reused"""
+
+from src.core.animal import Animal
+from src.core.registry import EntityRegistry
+from src.engine.behaviors import BehaviorEngine
+from src.utils.constants import AnimalTypes
+from src.utils.vectors import Vector3
+
+def populate() -> tuple:
+    registry = EntityRegistry()
+    rabbit = Animal(AnimalTypes.RABBIT, Vector3(0, 5, 0))
+    wolves = [Animal(AnimalTypes.WOLF, Vector3(0.5, 5, 0)), Animal(AnimalTypes.WOLF, Vector3(-0.5, 5, 0))]
+    for animal in [rabbit] + wolves:
+        registry.add(animal)
+    return registry, rabbit, wolves
+
+def test_two_predators_one_kill():
+    registry, rabbit, wolves = populate()
+    energy = [wolf.energy for wolf in wolves]
+    for wolf in wolves:
+        BehaviorEngine.eat(wolf, None, registry.entities, rabbit.position, registry=registry)
+    assert registry.kill_claims == {rabbit.entity_id: wolves[0]}
+
+    assert registry.resolve_kills() == [rabbit]
+    assert wolves[0].energy == energy[0] + rabbit.max_energy
+    assert wolves[1].energy == energy[1]
+    assert not registry.is_live(rabbit)
+    assert registry.live() == wolves
+    assert registry.resolve_kills() == []  # claims do not carry over to the next tick
+
+def test_tombstoned_ids_are_never_claimed_or_reused():
+    registry, rabbit, wolves = populate()
+    rabbit_id = rabbit.entity_id
+    registry.remove(rabbit)
+    assert not registry.claim_kill(wolves[0], rabbit)
+    assert not registry.remove(rabbit)
+
+    assert registry.compact() == [rabbit]
+    assert registry.get(rabbit_id) is None
+    assert not registry.claim_kill(wolves[0], rabbit)
+    assert registry.resolve_kills() == []
+
+    # The same object coming back (e.g. from the AnimalPool) gets a fresh id
+    issued = {wolf.entity_id for wolf in wolves} | {rabbit_id}
+    new_id = registry.add(rabbit)
+    assert new_id not in issued
+    assert registry.get(new_id) is rabbit
+    assert registry.get(rabbit_id) is None
@@ -0,0 +1,54 @@
+"""Sweep runs rebind constants only for their own duration"""
+
+import numpy as np
+import pytest
+from src import sweep
+from src.core import animal as animal_module
+from src.core import ecosystem as ecosystem_module
+from src.core.planet import Planet
+from src.core.population import SPECIES
+from src.utils import constants
+
+def test_run_one_restores_overrides(monkeypatch):
+    seen = []
+    update = ecosystem_module.Ecosystem.update
+
+    def recording_update(self, *engines):
+        seen.append((ecosystem_module.BREEDING_COOLDOWN, animal_module.BREEDING_COOLDOWN))
+        update(self, *engines)
+
+    monkeypatch.setattr(ecosystem_module.Ecosystem, "update", recording_update)
+    run = sweep.run_one("short cooldown", {"BREEDING_COOLDOWN": 7}, seed=1, ticks=20, sample_every=10)
+    assert set(seen) == {(7, 7)}
+    assert ecosystem_module.BREEDING_COOLDOWN == animal_module.BREEDING_COOLDOWN == constants.BREEDING_COOLDOWN
+    assert run["counts"].shape == (3, len(SPECIES))
+    assert run["counts"][0].sum() > 0
+
+def test_run_one_cleans_up_when_a_tick_fails(monkeypatch):
+    closed = []
+    close = Planet.close
+    monkeypatch.setattr(Planet, "close", lambda planet: closed.append(planet) or close(planet))
+
+    def failing_update(self, *engines):
+        raise RuntimeError("tick failed")
+
+    monkeypatch.setattr(ecosystem_module.Ecosystem, "update", failing_update)
+    with pytest.raises(RuntimeError):
+        sweep.run_one("failing", {"BREEDING_COOLDOWN": 7}, seed=1, ticks=20, sample_every=10)
+    assert len(closed) == 1
+    assert ecosystem_module.BREEDING_COOLDOWN == constants.BREEDING_COOLDOWN
+
+def test_unknown_override_is_rejected():
+    with pytest.raises(KeyError):
+        sweep.apply_overrides({"NOT_A_CONSTANT": 1})
+
+def test_percentile_bands_shape():
+    counts = np.zeros((4, 3, len(SPECIES)), dtype=np.uint32)
+    counts[:, :, 0] = [[1, 2, 3], [2, 3, 4], [3, 4, 5], [4, 5, 6]]
+    counts[:, :, 2] = 1
+    bands = sweep.percentile_bands(counts, (10, 50, 90))
+    assert set(bands) == {"total", SPECIES[0], SPECIES[2]}  # species never seen get no band
+    for band in bands.values():
+        assert band.shape == (3, 3)
+    assert bands[SPECIES[0]][1].tolist() == [2.5, 3.5, 4.5]
+    assert bands["total"][1].tolist() == [3.5, 4.5, 5.5]
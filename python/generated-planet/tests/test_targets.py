@@ -0,0 +1,82 @@
+"""Cached targets: staggered re-planning, and dropping targets that are gone"""
+
+from src.core.animal import Animal
+from src.core.planet import Planet
+from src.core.registry import EntityRegistry
+from src.engine.behaviors import BehaviorEngine
+from src.utils.constants import ANIMAL_CONFIGS, AnimalTypes, BlockType
+from src.utils.vectors import Vector3
+
+def counting_find_prey(monkeypatch) -> list:
+    """Patch BehaviorEngine.find_prey to record the entity id of every animal that searches"""
+    searched = []
+    find_prey = BehaviorEngine.find_prey
+
+    def counted(animal, animals, grid=None):
+        searched.append(animal.entity_id)
+        return find_prey(animal, animals, grid)
+
+    monkeypatch.setattr(BehaviorEngine, "find_prey", staticmethod(counted))
+    return searched
+
+def test_replans_are_staggered_by_entity_id(monkeypatch):
+    interval = ANIMAL_CONFIGS[AnimalTypes.WOLF]["replan"]
+    registry = EntityRegistry()
+    wolves = [Animal(AnimalTypes.WOLF, Vector3(i, 5, 0)) for i in range(3 * interval)]
+    for animal in wolves + [Animal(AnimalTypes.RABBIT, Vector3(0, 5, 10))]:
+        registry.add(animal)
+    searched = counting_find_prey(monkeypatch)
+
+    for wolf in wolves:
+        BehaviorEngine.current_target(wolf, None, registry.entities, None, registry, 0)
+    assert sorted(searched) == [wolf.entity_id for wolf in wolves]  # first plan for everyone
+
+    for tick in range(1, interval + 1):
+        searched.clear()
+        for wolf in wolves:
+            BehaviorEngine.current_target(wolf, None, registry.entities, None, registry, tick)
+        assert searched == [wolf.entity_id for wolf in wolves if (tick + wolf.entity_id) % interval == 0]
+        assert len(searched) == 3
+
+def test_killed_prey_is_dropped_before_the_next_replan(monkeypatch):
+    registry = EntityRegistry()
+    wolf = Animal(AnimalTypes.WOLF, Vector3(0, 5, 0))
+    near, far = Animal(AnimalTypes.RABBIT, Vector3(3, 5, 0)), Animal(AnimalTypes.RABBIT, Vector3(9, 5, 0))
+    rival = Animal(AnimalTypes.FOX, Vector3(3, 5, 1))
+    for animal in (wolf, near, far, rival):
+        registry.add(animal)
+    searched = counting_find_prey(monkeypatch)
+
+    assert BehaviorEngine.current_target(wolf, None, registry.entities, None, registry, 0) is near.position
+    assert BehaviorEngine.current_target(wolf, None, registry.entities, None, registry, 1) is near.position
+    assert searched == [wolf.entity_id]  # tick 1 used the cache
+
+    registry.claim_kill(rival, near)
+    BehaviorEngine.current_target(wolf, None, registry.entities, None, registry, 2)
+    assert searched == [wolf.entity_id] * 2  # claimed by another predator: searched again
+    registry.resolve_kills()
+    registry.compact()  # end of tick
+    assert BehaviorEngine.current_target(wolf, None, registry.entities, None, registry, 3) is far.position
+    assert wolf.target_id == far.entity_id
+
+    registry.remove(far)
+    registry.compact()
+    assert BehaviorEngine.current_target(wolf, None, registry.entities, None, registry, 5) is None
+    assert searched == [wolf.entity_id] * 4
+    assert wolf.target_id == -1
+
+def test_eaten_block_is_dropped_before_the_next_replan():
+    planet = Planet(seed=5)
+    registry = EntityRegistry()
+    rabbit = Animal(AnimalTypes.RABBIT, Vector3(0, planet.get_surface_height(0, 0) + 1, 0))
+    registry.add(rabbit)
+    assert rabbit.replan_interval > 2
+
+    target = BehaviorEngine.current_target(rabbit, planet, registry.entities, None, registry, 0)
+    assert target is not None
+    assert BehaviorEngine.current_target(rabbit, planet, registry.entities, None, registry, 1) is target
+
+    planet.set_block_at(int(target.x), int(target.y), int(target.z), BlockType.DIRT)
+    replanned = BehaviorEngine.current_target(rabbit, planet, registry.entities, None, registry, 2)
+    assert replanned is not None and replanned != target
+    assert rabbit.target_pos is replanned
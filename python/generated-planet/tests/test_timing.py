@@ -0,0 +1,24 @@
+"""Profiler windows are written by the timed thread and read by others"""
+
+import threading
+from src.utils.timing import Profiler
+
+def test_breakdown_while_another_thread_laps():
+    profiler = Profiler(window=8)
+    track = profiler.track("sim")
+    done = threading.Event()
+
+    def tick():
+        while not done.is_set():
+            track.begin()
+            track.lap("update")
+
+    thread = threading.Thread(target=tick)
+    thread.start()
+    try:
+        for _ in range(5000):
+            profiler.breakdown()
+    finally:
+        done.set()
+        thread.join()
+    assert [(name, phase) for name, phase, _ in profiler.breakdown()] == [("sim", "update")]